@@ -4,31 +4,19 @@ from sqlalchemy import pool
 from alembic import context
 import os
 import sys
-import urllib.parse
 
 # Add the app directory to the path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from app.core.database import Base
-from app.core.config import settings
+from app.core.database.base import Base
+from app.core.database import database_url
 from app.models import *  # Import all models
 
 # this is the Alembic Config object
 config = context.config
 
-# Override sqlalchemy.url with settings
-# Supabase requires SSL, ensure connection string is properly formatted
-database_url = settings.DATABASE_URL
-if "supabase" in database_url.lower() and "sslmode" not in database_url.lower():
-    parsed = urllib.parse.urlparse(database_url)
-    query_params = urllib.parse.parse_qs(parsed.query)
-    query_params['sslmode'] = ['require']
-    new_query = urllib.parse.urlencode(query_params, doseq=True)
-    database_url = urllib.parse.urlunparse(
-        (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
-    )
-
-config.set_main_option("sqlalchemy.url", database_url)
+# Override sqlalchemy.url with settings (sslmode=require is added for Supabase)
+config.set_main_option("sqlalchemy.url", database_url())
 
 # Interpret the config file for Python logging.
 if config.config_file_name is not None:
@@ -0,0 +1,140 @@
+"""Full-text search on transcripts
+
+Revision ID: 002_transcript_search
+Revises: 001_initial
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002_transcript_search'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+# Maps our ISO language codes to a Postgres text search configuration.
+# Languages without a stemmer fall back to 'simple' (lowercasing only).
+SEARCH_CONFIG_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION transcript_search_config(lang TEXT)
+RETURNS regconfig
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT CASE lower(split_part(coalesce(lang, ''), '-', 1))
+        WHEN 'en' THEN 'english'
+        WHEN 'es' THEN 'spanish'
+        WHEN 'pt' THEN 'portuguese'
+        WHEN 'fr' THEN 'french'
+        WHEN 'de' THEN 'german'
+        WHEN 'it' THEN 'italian'
+        WHEN 'ru' THEN 'russian'
+        WHEN 'ar' THEN 'arabic'
+        ELSE 'simple'
+    END::regconfig
+$$;
+"""
+
+ADD_SEARCH_COLUMNS_SQL = """
+ALTER TABLE transcripts
+    ADD COLUMN IF NOT EXISTS original_tsv tsvector GENERATED ALWAYS AS (
+        to_tsvector(transcript_search_config(source_language), coalesce(original_text, ''))
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS translated_tsv tsvector GENERATED ALWAYS AS (
+        to_tsvector(transcript_search_config(target_language), coalesce(translated_text, ''))
+    ) STORED;
+"""
+
+CREATE_SEARCH_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS ix_transcripts_original_tsv ON transcripts USING GIN (original_tsv);
+CREATE INDEX IF NOT EXISTS ix_transcripts_translated_tsv ON transcripts USING GIN (translated_tsv);
+"""
+
+# Ranks the top p_limit matches first and only then builds highlights, since
+# ts_headline re-parses the document and is by far the most expensive step.
+SEARCH_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION search_transcripts(
+    p_user_id TEXT,
+    p_query TEXT,
+    p_language TEXT,
+    p_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE (
+    id INTEGER,
+    session_id INTEGER,
+    original_text TEXT,
+    translated_text TEXT,
+    source_language VARCHAR,
+    target_language VARCHAR,
+    "timestamp" DOUBLE PRECISION,
+    confidence DOUBLE PRECISION,
+    created_at TIMESTAMPTZ,
+    rank REAL,
+    original_highlight TEXT,
+    translated_highlight TEXT
+)
+LANGUAGE sql STABLE AS $$
+    WITH query AS (
+        SELECT
+            transcript_search_config(p_language) AS config,
+            websearch_to_tsquery(transcript_search_config(p_language), p_query) AS tsq
+    ),
+    ranked AS (
+        SELECT
+            t.*,
+            greatest(
+                CASE WHEN t.source_language = p_language
+                    THEN ts_rank_cd(t.original_tsv, query.tsq) ELSE 0 END,
+                CASE WHEN t.target_language = p_language
+                    THEN ts_rank_cd(t.translated_tsv, query.tsq) ELSE 0 END
+            ) AS rank
+        FROM transcripts t
+        JOIN sessions s ON s.id = t.session_id
+        CROSS JOIN query
+        WHERE s.user_id::text = p_user_id
+          AND (
+              (t.source_language = p_language AND t.original_tsv @@ query.tsq)
+              OR (t.target_language = p_language AND t.translated_tsv @@ query.tsq)
+          )
+        ORDER BY rank DESC, t.id DESC
+        LIMIT p_limit
+    )
+    SELECT
+        r.id,
+        r.session_id,
+        r.original_text,
+        r.translated_text,
+        r.source_language,
+        r.target_language,
+        r."timestamp",
+        r.confidence,
+        r.created_at::timestamptz,
+        r.rank,
+        CASE WHEN r.source_language = p_language
+            THEN ts_headline(query.config, r.original_text, query.tsq,
+                             'StartSel=<mark>, StopSel=</mark>, MaxFragments=2')
+        END,
+        CASE WHEN r.target_language = p_language AND r.translated_text IS NOT NULL
+            THEN ts_headline(query.config, r.translated_text, query.tsq,
+                             'StartSel=<mark>, StopSel=</mark>, MaxFragments=2')
+        END
+    FROM ranked r
+    CROSS JOIN query
+    ORDER BY r.rank DESC, r.id DESC
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_CONFIG_FUNCTION_SQL)
+    op.execute(ADD_SEARCH_COLUMNS_SQL)
+    op.execute(CREATE_SEARCH_INDEXES_SQL)
+    op.execute(SEARCH_FUNCTION_SQL)
+
+
+def downgrade() -> None:
+    op.execute('DROP FUNCTION IF EXISTS search_transcripts(TEXT, TEXT, TEXT, INTEGER)')
+    op.execute('DROP INDEX IF EXISTS ix_transcripts_translated_tsv')
+    op.execute('DROP INDEX IF EXISTS ix_transcripts_original_tsv')
+    op.execute('ALTER TABLE transcripts DROP COLUMN IF EXISTS translated_tsv')
+    op.execute('ALTER TABLE transcripts DROP COLUMN IF EXISTS original_tsv')
+    op.execute('DROP FUNCTION IF EXISTS transcript_search_config(TEXT)')
@@ -0,0 +1,24 @@
+"""Store transcript segment end times
+
+Revision ID: 003_transcript_end_timestamp
+Revises: 002_transcript_search
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003_transcript_end_timestamp'
+down_revision = '002_transcript_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # timestamp already holds the segment start (seconds from session start)
+    op.add_column('transcripts', sa.Column('end_timestamp', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('transcripts', 'end_timestamp')
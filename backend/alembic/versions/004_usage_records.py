@@ -0,0 +1,56 @@
+"""Per-user monthly usage records
+
+Revision ID: 004_usage_records
+Revises: 003_transcript_end_timestamp
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004_usage_records'
+down_revision = '003_transcript_end_timestamp'
+branch_labels = None
+depends_on = None
+
+
+# Called by the usage meter's periodic flush; adds deltas atomically so
+# several workers can flush the same user concurrently.
+INCREMENT_USAGE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION increment_usage(
+    p_user_id TEXT,
+    p_period_start DATE,
+    p_audio_seconds DOUBLE PRECISION,
+    p_characters BIGINT
+)
+RETURNS VOID
+LANGUAGE sql AS $$
+    INSERT INTO usage_records (user_id, period_start, audio_seconds, characters, updated_at)
+    VALUES (p_user_id, p_period_start, p_audio_seconds, p_characters, NOW())
+    ON CONFLICT (user_id, period_start) DO UPDATE SET
+        audio_seconds = usage_records.audio_seconds + EXCLUDED.audio_seconds,
+        characters = usage_records.characters + EXCLUDED.characters,
+        updated_at = NOW();
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'usage_records',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('audio_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('characters', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'period_start', name='uq_usage_records_user_period')
+    )
+    op.execute(INCREMENT_USAGE_FUNCTION_SQL)
+
+
+def downgrade() -> None:
+    op.execute('DROP FUNCTION IF EXISTS increment_usage(TEXT, DATE, DOUBLE PRECISION, BIGINT)')
+    op.drop_table('usage_records')
@@ -0,0 +1,24 @@
+"""Store word-level timings of transcripts
+
+Revision ID: 005_transcript_word_timings
+Revises: 004_usage_records
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_transcript_word_timings'
+down_revision = '004_usage_records'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Packed typed arrays (WordTimings.to_bytes), less than half the size of the JSON form
+    op.add_column('transcripts', sa.Column('word_timings', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('transcripts', 'word_timings')
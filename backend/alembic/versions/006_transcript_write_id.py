@@ -0,0 +1,27 @@
+"""Idempotent transcript writes
+
+Revision ID: 006_transcript_write_id
+Revises: 005_transcript_word_timings
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006_transcript_write_id'
+down_revision = '005_transcript_word_timings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Assigned when a row enters the transcript log; replaying the log skips rows already stored
+    op.add_column('transcripts', sa.Column('write_id', postgresql.UUID(as_uuid=False), nullable=True))
+    op.create_index('ix_transcripts_write_id', 'transcripts', ['write_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transcripts_write_id', table_name='transcripts')
+    op.drop_column('transcripts', 'write_id')
@@ -0,0 +1,104 @@
+"""Escape transcript text in search highlights
+
+Revision ID: 007_escape_search_headlines
+Revises: 006_transcript_write_id
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007_escape_search_headlines'
+down_revision = '006_transcript_write_id'
+branch_labels = None
+depends_on = None
+
+
+# ts_headline returns its document with <mark> tags inserted, and clients
+# render highlights as HTML; the document is HTML-escaped first so only the
+# <mark> tags are markup. The default parser reads entities as single
+# tokens, so escaping does not change which words match.
+ESCAPED_SQL = "replace(replace(replace({column}, '&', '&amp;'), '<', '&lt;'), '>', '&gt;')"
+
+SEARCH_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION search_transcripts(
+    p_user_id TEXT,
+    p_query TEXT,
+    p_language TEXT,
+    p_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE (
+    id INTEGER,
+    session_id INTEGER,
+    original_text TEXT,
+    translated_text TEXT,
+    source_language VARCHAR,
+    target_language VARCHAR,
+    "timestamp" DOUBLE PRECISION,
+    confidence DOUBLE PRECISION,
+    created_at TIMESTAMPTZ,
+    rank REAL,
+    original_highlight TEXT,
+    translated_highlight TEXT
+)
+LANGUAGE sql STABLE AS $$
+    WITH query AS (
+        SELECT
+            transcript_search_config(p_language) AS config,
+            websearch_to_tsquery(transcript_search_config(p_language), p_query) AS tsq
+    ),
+    ranked AS (
+        SELECT
+            t.*,
+            greatest(
+                CASE WHEN t.source_language = p_language
+                    THEN ts_rank_cd(t.original_tsv, query.tsq) ELSE 0 END,
+                CASE WHEN t.target_language = p_language
+                    THEN ts_rank_cd(t.translated_tsv, query.tsq) ELSE 0 END
+            ) AS rank
+        FROM transcripts t
+        JOIN sessions s ON s.id = t.session_id
+        CROSS JOIN query
+        WHERE s.user_id::text = p_user_id
+          AND (
+              (t.source_language = p_language AND t.original_tsv @@ query.tsq)
+              OR (t.target_language = p_language AND t.translated_tsv @@ query.tsq)
+          )
+        ORDER BY rank DESC, t.id DESC
+        LIMIT p_limit
+    )
+    SELECT
+        r.id,
+        r.session_id,
+        r.original_text,
+        r.translated_text,
+        r.source_language,
+        r.target_language,
+        r."timestamp",
+        r.confidence,
+        r.created_at::timestamptz,
+        r.rank,
+        CASE WHEN r.source_language = p_language
+            THEN ts_headline(query.config, {original}, query.tsq,
+                             'StartSel=<mark>, StopSel=</mark>, MaxFragments=2')
+        END,
+        CASE WHEN r.target_language = p_language AND r.translated_text IS NOT NULL
+            THEN ts_headline(query.config, {translated}, query.tsq,
+                             'StartSel=<mark>, StopSel=</mark>, MaxFragments=2')
+        END
+    FROM ranked r
+    CROSS JOIN query
+    ORDER BY r.rank DESC, r.id DESC
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.execute(SEARCH_FUNCTION_SQL.format(
+        original=ESCAPED_SQL.format(column="r.original_text"),
+        translated=ESCAPED_SQL.format(column="r.translated_text"),
+    ))
+
+
+def downgrade() -> None:
+    op.execute(SEARCH_FUNCTION_SQL.format(original="r.original_text", translated="r.translated_text"))
@@ -0,0 +1,31 @@
+"""Index the keyset pagination orders of sessions and transcripts
+
+Revision ID: 008_keyset_pagination_indexes
+Revises: 007_escape_search_headlines
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008_keyset_pagination_indexes'
+down_revision = '007_escape_search_headlines'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A user's sessions by id (id < cursor) and a session's transcripts by id
+    # (id > cursor) are each one range scan of these indexes
+    op.create_index('ix_sessions_user_id_id', 'sessions', ['user_id', 'id'], unique=False)
+    op.create_index('ix_transcripts_session_id_id', 'transcripts', ['session_id', 'id'], unique=False)
+    # Databases built from scripts/create_supabase_tables.sql also have single-column
+    # indexes; the composite ones cover their lookups, and the planner would otherwise
+    # pick them and sort a whole session's rows for one page
+    op.execute("DROP INDEX IF EXISTS ix_sessions_user_id")
+    op.execute("DROP INDEX IF EXISTS ix_transcripts_session_id")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transcripts_session_id_id', table_name='transcripts')
+    op.drop_index('ix_sessions_user_id_id', table_name='sessions')
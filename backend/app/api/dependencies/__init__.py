@@ -1,4 +1,4 @@
 from .auth import get_current_user, get_current_active_user
+from .rate_limit import rate_limit_by_ip, rate_limit_by_user
 
-__all__ = ["get_current_user", "get_current_active_user"]
-
+__all__ = ["get_current_user", "get_current_active_user", "rate_limit_by_ip", "rate_limit_by_user"]
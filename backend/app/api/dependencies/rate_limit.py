@@ -0,0 +1,39 @@
+from fastapi import Depends, HTTPException, Request, status
+from app.core.config import settings
+from app.core.database import get_supabase, Client
+from app.core.ratelimit import get_rate_limiter, AUTH_RATE_LIMIT, API_RATE_LIMITS
+from app.services.usage import get_cached_user_plan
+from .auth import get_current_user
+from typing import Dict
+import math
+
+
+def _too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Rate limit exceeded",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+async def rate_limit_by_ip(request: Request) -> None:
+    """Rate limit unauthenticated endpoints per client IP"""
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = await get_rate_limiter().hit(f"auth:{client_ip}", AUTH_RATE_LIMIT)
+    if retry_after > 0:
+        raise _too_many_requests(retry_after)
+
+
+async def rate_limit_by_user(
+    current_user: Dict = Depends(get_current_user),
+    supabase: Client = Depends(get_supabase)
+) -> None:
+    """Rate limit authenticated endpoints per user, according to their plan"""
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    plan = await get_cached_user_plan(supabase, current_user["id"])
+    retry_after = await get_rate_limiter().hit(f"api:{current_user['id']}", API_RATE_LIMITS[plan])
+    if retry_after > 0:
+        raise _too_many_requests(retry_after)
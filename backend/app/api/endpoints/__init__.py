@@ -1,4 +1,3 @@
-from . import auth, users
-
-__all__ = ["auth", "users"]
+from . import auth, users, sessions, search
 
+__all__ = ["auth", "users", "sessions", "search"]
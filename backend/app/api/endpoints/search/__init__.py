@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+from app.core.database import get_supabase, Client
+from app.api.dependencies import get_current_active_user
+from app.schemas.transcript import TranscriptSearchResult
+from app.services.sessions import TranscriptSearchService
+from typing import Dict, List
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/transcripts", response_model=List[TranscriptSearchResult])
+async def search_transcripts(
+    q: str = Query(..., min_length=1, max_length=200),
+    language: str = Query(..., min_length=2, max_length=10),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """Search the current user's transcripts in the given language.
+
+    The query accepts web-search syntax ("quoted phrases", OR, -exclusions).
+    Matches in the original or translated text are ranked and highlighted.
+    Sessions moved to cold storage are not searched: their transcripts are
+    only in archive files, which are not indexed.
+    """
+    search_service = TranscriptSearchService(supabase)
+    return await search_service.search(current_user["id"], q, language, limit)
@@ -0,0 +1,316 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from app.core.database import get_supabase, Client
+from app.api.dependencies import get_current_active_user
+from app.core.config import settings
+from app.schemas.session import SessionResponse, SessionPage, BatchJobResponse
+from app.schemas.transcript import TranscriptPage, WordTimingList
+from app.services.sessions import (
+    SessionHistoryService,
+    decode_cursor,
+    iter_subtitles,
+    batched,
+    ndjson_page,
+    SUBTITLE_MEDIA_TYPES,
+)
+from app.services.batch import batch_interpreter, save_upload, UploadTooLarge
+from app.services.offload import cpu_executor, CPUExecutorBusy
+from app.services.usage import usage_meter
+from typing import Dict, Optional, Literal
+import hashlib
+import math
+
+router = APIRouter(prefix="/sessions", tags=["sessions"])
+
+
+def _session_etag(session: Dict, request: Request) -> Optional[str]:
+    """ETag for an ended session; None while the session is still live"""
+    if not session.get("ended_at"):
+        return None
+    key = f"{session['id']}:{session['ended_at']}:{request.url.path}?{request.url.query}"
+    return '"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: Optional[str]) -> bool:
+    if etag is None:
+        return False
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _parse_cursor(cursor: Optional[str], size: int):
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, size)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def _get_owned_session(history: SessionHistoryService, session_id: int, user: Dict) -> Dict:
+    session = await history.get_session(session_id, user["id"])
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    return session
+
+
+@router.get("", response_model=SessionPage)
+async def list_sessions(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """List the current user's sessions, newest first"""
+    position = _parse_cursor(cursor, 1)
+    history = SessionHistoryService(supabase)
+    items, next_cursor = await history.list_sessions(
+        current_user["id"],
+        limit,
+        before_id=position[0] if position else None
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.post("/batch", response_model=BatchJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_batch_session(
+    request: Request,
+    source_language: str = Query(..., min_length=2, max_length=10),
+    target_language: str = Query(..., min_length=2, max_length=10),
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """Interpret an uploaded recording into a new session.
+
+    The request body is the audio file itself (16-bit PCM WAV). Progress is
+    reported by GET /sessions/{session_id}/batch.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.BATCH_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Recording is too large"
+        )
+
+    # Refuse before the upload rather than after it
+    if settings.USAGE_METERING_ENABLED:
+        await usage_meter.open_account(supabase, current_user["id"])
+        exceeded = usage_meter.check(current_user["id"])
+        usage_meter.close_account(current_user["id"])
+        if exceeded:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Usage limit reached for your plan: {exceeded}"
+            )
+
+    try:
+        path = await save_upload(request.stream())
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Recording is too large"
+        )
+
+    try:
+        job = await batch_interpreter.submit(current_user["id"], path, source_language, target_language)
+    except ValueError as e:
+        path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e)
+        )
+    except Exception:
+        path.unlink(missing_ok=True)
+        raise
+    return job.to_dict()
+
+
+@router.get("/{session_id}/batch", response_model=BatchJobResponse)
+async def get_batch_job(
+    session_id: int,
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """Progress of a session created from an uploaded recording"""
+    history = SessionHistoryService(supabase)
+    session = await _get_owned_session(history, session_id, current_user)
+
+    # The worker running the job has fresher progress than the stored copy
+    job = batch_interpreter.jobs.get(session_id)
+    if job is not None:
+        return job.to_dict()
+    batch = (session.get("metadata") or {}).get("batch")
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session has no batch job"
+        )
+    return {**batch, "session_id": session_id}
+
+
+@router.get("/{session_id}", response_model=SessionResponse)
+async def get_session(
+    session_id: int,
+    request: Request,
+    response: Response,
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """Get a single session"""
+    history = SessionHistoryService(supabase)
+    session = await _get_owned_session(history, session_id, current_user)
+
+    etag = _session_etag(session, request)
+    if _not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    if etag:
+        response.headers["ETag"] = etag
+    return session
+
+
+@router.get("/{session_id}/transcripts", response_model=TranscriptPage)
+async def list_transcripts(
+    session_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=500),
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """List a page of transcripts for a session using a keyset cursor"""
+    position = _parse_cursor(cursor, 2)
+    if position and position[0] != session_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor does not belong to this session"
+        )
+
+    history = SessionHistoryService(supabase)
+    session = await _get_owned_session(history, session_id, current_user)
+
+    etag = _session_etag(session, request)
+    if _not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    items, next_cursor = await history.list_transcripts(
+        session,
+        limit,
+        after_id=position[1] if position else None
+    )
+    if etag:
+        response.headers["ETag"] = etag
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/{session_id}/transcripts/export")
+async def export_transcripts(
+    session_id: int,
+    request: Request,
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """Stream all transcripts of a session as newline-delimited JSON"""
+    history = SessionHistoryService(supabase)
+    session = await _get_owned_session(history, session_id, current_user)
+
+    etag = _session_etag(session, request)
+    if _not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    async def generate():
+        # Pages are fetched on a thread and serialized in the CPU pool
+        async for rows in iterate_in_threadpool(batched(history.iter_transcripts(session))):
+            try:
+                yield await cpu_executor.run("export", ndjson_page, rows)
+            except CPUExecutorBusy:
+                # The response has started; finish it on a thread rather than fail
+                yield await run_in_threadpool(ndjson_page, rows)
+
+    headers = {"Content-Disposition": f'attachment; filename="session-{session_id}.ndjson"'}
+    if etag:
+        headers["ETag"] = etag
+    return StreamingResponse(generate(), media_type="application/x-ndjson", headers=headers)
+
+
+@router.get("/{session_id}/words", response_model=WordTimingList)
+async def list_words(
+    session_id: int,
+    request: Request,
+    response: Response,
+    start: float = Query(0.0, ge=0),
+    end: Optional[float] = Query(None, gt=0),
+    below_confidence: Optional[float] = Query(None, gt=0, le=1),
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """Word-level timings of a session between ``start`` and ``end`` seconds.
+
+    With ``below_confidence``, only the words the recognizer was less sure
+    of, e.g. to review or re-run them.
+    """
+    history = SessionHistoryService(supabase)
+    session = await _get_owned_session(history, session_id, current_user)
+
+    etag = _session_etag(session, request)
+    if _not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    timings = await run_in_threadpool(history.get_word_timings, session)
+    window = timings.in_range(start, math.inf if end is None else end)
+    words = timings.sliced(window.start, window.stop)
+    indexes = range(len(words)) if below_confidence is None else words.below_confidence(below_confidence)
+
+    if etag:
+        response.headers["ETag"] = etag
+    return {
+        "items": [
+            {
+                "word": words.word(index),
+                "start": words.starts[index],
+                "end": words.ends[index],
+                # Stored as float32; drop the binary noise
+                "confidence": round(words.confidences[index], 4),
+            }
+            for index in indexes
+        ]
+    }
+
+
+@router.get("/{session_id}/subtitles")
+async def export_subtitles(
+    session_id: int,
+    request: Request,
+    format: Literal["srt", "vtt"] = Query("srt"),
+    track: Literal["original", "translated"] = Query("original"),
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """Stream the original or translated track of a session as SRT or WebVTT"""
+    history = SessionHistoryService(supabase)
+    session = await _get_owned_session(history, session_id, current_user)
+
+    etag = _session_etag(session, request)
+    if _not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    def generate():
+        for cue in iter_subtitles(history.iter_transcripts(session), format, track):
+            yield cue.encode()
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="session-{session_id}-{track}.{format}"'
+    }
+    if etag:
+        headers["ETag"] = etag
+    return StreamingResponse(generate(), media_type=SUBTITLE_MEDIA_TYPES[format], headers=headers)
@@ -3,6 +3,8 @@ from app.core.database import get_supabase, Client
 from app.api.dependencies import get_current_active_user
 from app.schemas.user import UserResponse, UserUpdate
 from app.services.auth.supabase_auth_service import SupabaseAuthService
+from app.services.offload import cpu_executor
+from app.services.usage import usage_meter
 from typing import Dict
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -17,6 +19,15 @@ async def get_me(current_user: Dict = Depends(get_current_active_user)):
     return user
 
 
+@router.get("/me/usage")
+async def get_my_usage(
+    current_user: Dict = Depends(get_current_active_user),
+    supabase: Client = Depends(get_supabase)
+):
+    """Get current period usage and plan limits"""
+    return await usage_meter.get_usage(supabase, current_user["id"])
+
+
 @router.put("/me", response_model=UserResponse)
 async def update_me(
     user_update: UserUpdate,
@@ -43,7 +54,7 @@ async def update_me(
         updates["full_name"] = user_update.full_name
     
     if user_update.password:
-        updates["hashed_password"] = get_password_hash(user_update.password)
+        updates["hashed_password"] = await cpu_executor.run("password_hash", get_password_hash, user_update.password)
     
     if updates:
         updated_user = await auth_service.update_user(current_user["id"], **updates)
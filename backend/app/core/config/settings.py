@@ -22,6 +22,22 @@ class Settings(BaseSettings):
     SUPABASE_KEY: str = ""  # Service role key for backend
     SUPABASE_ANON_KEY: str = ""  # Anon key (optional, for client-side)
     
+    # Direct Postgres access (asyncpg); PostgREST is used when DATABASE_URL is empty
+    DATABASE_URL: str = ""  # postgresql://... of the Supabase database
+    DB_ECHO: bool = False  # Log SQL of the SQLAlchemy engine (migrations)
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_CONNECT_TIMEOUT_SECONDS: float = 10
+    DB_COMMAND_TIMEOUT_SECONDS: float = 10
+    DB_STATEMENT_CACHE_SIZE: int = 100  # 0 when connecting through PgBouncer in transaction mode
+    TRANSCRIPT_FLUSH_INTERVAL_SECONDS: float = 0.25  # Transcript rows are written in batches
+    TRANSCRIPT_BATCH_SIZE: int = 500  # Rows per COPY / multi-row insert
+    TRANSCRIPT_BUFFER_MAX_ROWS: int = 20000  # Unwritten rows kept in memory when the transcript log is off or failing
+    TRANSCRIPT_WAL_ENABLED: bool = True  # Transcripts are durable on local disk before results are sent
+    TRANSCRIPT_WAL_PATH: str = "./wal"  # One directory per server worker is claimed below this
+    TRANSCRIPT_WAL_SEGMENT_BYTES: int = 16 * 1024 * 1024  # Log segments are rotated at this size
+    TRANSCRIPT_WAL_MAX_RETRY_SECONDS: float = 30  # Longest wait between replay attempts while the database fails
+    
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
@@ -50,9 +66,109 @@ class Settings(BaseSettings):
         """Parse CORS_ORIGINS string into list"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
     
+    @property
+    def ws_session_timeout_seconds(self) -> float:
+        """Wall-clock limit of an interpretation connection"""
+        if self.WS_SESSION_TIMEOUT_SECONDS is not None:
+            return self.WS_SESSION_TIMEOUT_SECONDS
+        # A session can stream up to the audio cap, plus pauses
+        return self.MAX_AUDIO_DURATION_SECONDS + self.WS_IDLE_TIMEOUT_SECONDS
+    
     # Audio
     MAX_AUDIO_DURATION_SECONDS: int = 3600  # 1 hour
     AUDIO_CHUNK_SIZE: int = 4096
+    AUDIO_STREAM_BYTES_PER_SECOND: int = 32000  # 16 kHz mono 16-bit PCM, as the frontend streams; for chunks without a provider duration
+    
+    # Session audio recording (raw frames, for re-transcription and auditing)
+    AUDIO_RECORDING_ENABLED: bool = False
+    AUDIO_RECORDING_PATH: str = "./recordings"
+    AUDIO_RECORDING_SEGMENT_BYTES: int = 16 * 1024 * 1024  # Preallocated size of each memory-mapped segment
+    
+    # Batch interpretation of uploaded recordings (POST /sessions/batch)
+    BATCH_UPLOAD_PATH: str = "./uploads"  # Uploads are kept here until their job finishes
+    BATCH_MAX_UPLOAD_BYTES: int = 1024 * 1024 * 1024
+    BATCH_CONCURRENCY: int = 4  # Chunks transcribed and translated at once per job
+    BATCH_CHUNK_MIN_SECONDS: float = 10  # Chunks are cut at the quietest point in this range
+    BATCH_CHUNK_MAX_SECONDS: float = 45
+    
+    # Vocabulary highlighting
+    VOCABULARY_HIGHLIGHT_ENABLED: bool = True
+    VOCABULARY_REFRESH_SECONDS: int = 60  # How often new entries are picked up mid-session
+    
+    # Translation memory (reuse of earlier translations for near-identical sentences)
+    TRANSLATION_MEMORY_ENABLED: bool = True
+    TRANSLATION_MEMORY_SIMILARITY: float = 0.8  # Minimum character n-gram (Jaccard) similarity for reuse
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = 2000  # Most recent sentences kept per session
+    TRANSLATION_MEMORY_REFRESH_SECONDS: int = 60  # How often other sessions' transcripts are picked up
+    
+    # Archival of ended sessions
+    ARCHIVE_STORAGE_PATH: str = "./archive"
+    ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 50  # Sessions archived per job run
+    
+    # Usage metering
+    USAGE_METERING_ENABLED: bool = True
+    USAGE_FLUSH_INTERVAL_SECONDS: int = 15
+    
+    # Rate limiting
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per worker) or "redis" (shared across workers)
+    
+    # Metrics
+    METRICS_ENABLED: bool = True  # Expose Prometheus metrics at /metrics
+    
+    # Logging and tracing
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True  # One JSON object per line; False for plain text
+    TRACE_SAMPLE_RATE: float = 0.1  # Share of audio chunks whose stage spans are logged
+    
+    # Provider simulation (offline capacity testing - never enable in production)
+    PROVIDER_SIMULATION: bool = False  # Replace Deepgram, DeepL, Azure and Supabase with local fakes
+    SIMULATION_PROFILE: Optional[str] = None  # JSON file overriding latency/error/throughput profiles
+    SIMULATION_SEED: Optional[int] = None  # Fixed seed for repeatable latency and error sequences
+    
+    # Startup
+    PROVIDER_WARMUP_ENABLED: bool = True  # Open provider connections before /ready reports ready
+    PROVIDER_WARMUP_TIMEOUT_SECONDS: float = 10  # Per warm-up step; slow steps are skipped
+    
+    # WebSocket heartbeat and timeouts
+    WS_PING_INTERVAL_SECONDS: float = 20  # Server pings; client WebSocket stacks answer automatically
+    WS_PING_TIMEOUT_SECONDS: float = 20  # Close connections whose pong does not arrive in time
+    WS_IDLE_TIMEOUT_SECONDS: float = 60  # Close sessions that send no audio for this long
+    WS_SESSION_TIMEOUT_SECONDS: Optional[float] = None  # Wall-clock limit; defaults to MAX_AUDIO_DURATION_SECONDS plus the idle timeout
+    WS_REAPER_INTERVAL_SECONDS: float = 5  # How often idle and expired sessions are reaped
+    
+    # Chunk duration hints (chunk_hint messages on /ws/interpret)
+    CHUNK_HINT_ENABLED: bool = True
+    CHUNK_HINT_TARGET_LATENCY_LOW_SECONDS: float = 1.5  # Band for speech-to-result latency; hints are sent outside it
+    CHUNK_HINT_TARGET_LATENCY_HIGH_SECONDS: float = 3.5
+    CHUNK_HINT_MIN_SECONDS: float = 0.5  # Range of recommended chunk durations
+    CHUNK_HINT_MAX_SECONDS: float = 5.0
+    CHUNK_HINT_INTERVAL_SECONDS: float = 5  # Minimum time between hints to one session
+    
+    # Words repeated at the start of a chunk from the end of the previous one (/ws/interpret)
+    OVERLAP_DEDUP_ENABLED: bool = True
+    OVERLAP_DEDUP_WINDOW_SECONDS: float = 3.0  # Longest client chunk overlap looked for
+    
+    # Admission control of /ws/interpret (per worker)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_SESSIONS: int = 200  # Open interpretation sessions
+    ADMISSION_MAX_EXECUTOR_SATURATION: float = 1.0  # Provider calls in flight per pool thread
+    ADMISSION_MAX_LOOP_LAG_SECONDS: float = 0.25  # Smoothed event-loop lag
+    ADMISSION_RETRY_AFTER_SECONDS: int = 5  # Retry hint sent with a rejection
+    LOOP_LAG_INTERVAL_SECONDS: float = 0.25  # How often event-loop lag is sampled
+    PROVIDER_EXECUTOR_WORKERS: int = 32  # Threads for blocking provider SDK calls
+    
+    # CPU offload (password hashing, audio decoding, large exports)
+    CPU_OFFLOAD_WORKERS: int = 2  # Processes per server worker; 0 runs the work on threads instead
+    CPU_OFFLOAD_MAX_QUEUE: int = 64  # Calls waiting for a process before requests are refused with 503
+    
+    # Serving (python -m app.serve)
+    SERVE_HOST: str = "0.0.0.0"
+    SERVE_PORT: int = 8000
+    SERVE_WORKERS: Optional[int] = None  # Defaults to the number of CPUs available to the process
+    SHUTDOWN_DRAIN_SECONDS: float = 20  # On SIGTERM, time open sessions get to finish their current frame
+    SHUTDOWN_GRACE_SECONDS: float = 5  # Then time other requests get before they are cancelled
     
     class Config:
         env_file = ".env"
@@ -1,3 +1,12 @@
 from .supabase_client import get_supabase_client, get_supabase, Client
+from .postgres import open_pg_pool, get_pg_pool, close_pg_pool, database_url
 
-__all__ = ["get_supabase_client", "get_supabase", "Client"]
+__all__ = [
+    "get_supabase_client",
+    "get_supabase",
+    "Client",
+    "open_pg_pool",
+    "get_pg_pool",
+    "close_pg_pool",
+    "database_url",
+]
@@ -2,20 +2,10 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
-import urllib.parse
+from .postgres import database_url as _database_url
 
 # Supabase requires SSL, so ensure the connection string includes sslmode=require
-# If not present, add it
-database_url = settings.DATABASE_URL
-if "supabase" in database_url.lower() and "sslmode" not in database_url.lower():
-    # Parse and add sslmode if using Supabase
-    parsed = urllib.parse.urlparse(database_url)
-    query_params = urllib.parse.parse_qs(parsed.query)
-    query_params['sslmode'] = ['require']
-    new_query = urllib.parse.urlencode(query_params, doseq=True)
-    database_url = urllib.parse.urlunparse(
-        (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
-    )
+database_url = _database_url()
 
 engine = create_engine(
     database_url,
@@ -0,0 +1,72 @@
+from app.core.config import settings
+from typing import Optional
+import json
+import logging
+import urllib.parse
+
+# asyncpg is optional - without it (or without DATABASE_URL) writes go through PostgREST
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+_pg_pool = None
+
+
+def database_url(url: Optional[str] = None) -> str:
+    """DATABASE_URL, with sslmode=require added for Supabase hosts (they require SSL)"""
+    url = settings.DATABASE_URL if url is None else url
+    if "supabase" in url.lower() and "sslmode" not in url.lower():
+        parsed = urllib.parse.urlparse(url)
+        query_params = urllib.parse.parse_qs(parsed.query)
+        query_params["sslmode"] = ["require"]
+        new_query = urllib.parse.urlencode(query_params, doseq=True)
+        url = urllib.parse.urlunparse(
+            (parsed.scheme, parsed.netloc, parsed.path, parsed.params, new_query, parsed.fragment)
+        )
+    return url
+
+
+async def _init_connection(connection) -> None:
+    # Return JSON columns as Python objects, like PostgREST does
+    for type_name in ("json", "jsonb"):
+        await connection.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+async def open_pg_pool():
+    """Create the asyncpg pool; None when direct Postgres access is not configured"""
+    global _pg_pool
+
+    if _pg_pool is None and ASYNCPG_AVAILABLE and settings.DATABASE_URL and not settings.PROVIDER_SIMULATION:
+        _pg_pool = await asyncpg.create_pool(
+            database_url(),
+            min_size=settings.DB_POOL_MIN_SIZE,
+            max_size=settings.DB_POOL_MAX_SIZE,
+            timeout=settings.DB_CONNECT_TIMEOUT_SECONDS,
+            command_timeout=settings.DB_COMMAND_TIMEOUT_SECONDS,
+            # Prepared statements are cached per connection; PgBouncer in transaction mode needs 0
+            statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+            init=_init_connection,
+        )
+        logger.info("Postgres pool open", extra={"max_size": settings.DB_POOL_MAX_SIZE})
+
+    return _pg_pool
+
+
+def get_pg_pool():
+    """The open asyncpg pool, or None (use PostgREST)"""
+    return _pg_pool
+
+
+async def close_pg_pool() -> None:
+    global _pg_pool
+
+    if _pg_pool is not None:
+        await _pg_pool.close()
+        _pg_pool = None
@@ -9,6 +9,10 @@ def get_supabase_client() -> Client:
     """Get or create Supabase client instance"""
     global _supabase_client
     
+    if _supabase_client is None and settings.PROVIDER_SIMULATION:
+        from app.services.simulation import SimulatedSupabase
+        _supabase_client = SimulatedSupabase()
+    
     if _supabase_client is None:
         if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
             raise ValueError(
@@ -0,0 +1,15 @@
+from .formatter import JsonFormatter
+from .setup import configure_logging, shutdown_logging, TraceContextFilter
+from .tracing import TraceContext, start_trace, span, current_trace_id, current_span_id
+
+__all__ = [
+    "JsonFormatter",
+    "configure_logging",
+    "shutdown_logging",
+    "TraceContextFilter",
+    "TraceContext",
+    "start_trace",
+    "span",
+    "current_trace_id",
+    "current_span_id",
+]
@@ -0,0 +1,81 @@
+from app.core.config import settings
+from .formatter import JsonFormatter
+from .tracing import current_trace_id, current_span_id
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+import copy
+import logging
+import queue
+import sys
+
+_listener: Optional[QueueListener] = None
+
+
+class TraceContextFilter(logging.Filter):
+    """Attach the current trace and span id to records.
+
+    Runs in the emitting task, before the record crosses into the writer thread
+    where the context variables are no longer visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "trace_id", None) is None:
+            record.trace_id = current_trace_id()
+        if getattr(record, "span_id", None) is None:
+            record.span_id = current_span_id()
+        return True
+
+
+class _StructuredQueueHandler(QueueHandler):
+    """Queue handler that keeps exception text as a separate field.
+
+    The stock handler merges the traceback into the message; here the message
+    is resolved and the traceback is rendered to ``exc_text`` instead.
+    """
+
+    _exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging() -> None:
+    """Route the ``app`` loggers through a queue to a background writer thread"""
+    global _listener
+
+    if _listener is not None:
+        return
+
+    if settings.LOG_JSON:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(trace_id)s] %(message)s")
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(TraceContextFilter())
+
+    logger = logging.getLogger("app")
+    logger.handlers = [queue_handler]
+    logger.setLevel(settings.LOG_LEVEL.upper())
+    logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Stop the writer thread after draining queued records"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,89 @@
+from app.core.config import settings
+from contextvars import ContextVar
+from typing import Optional
+import logging
+import random
+import time
+
+tracer_logger = logging.getLogger("app.trace")
+
+
+class TraceContext:
+    """Trace of one unit of work, e.g. one audio chunk"""
+
+    __slots__ = ("trace_id", "sampled")
+
+    def __init__(self, trace_id: str, sampled: bool):
+        self.trace_id = trace_id
+        self.sampled = sampled
+
+
+_current_trace: ContextVar[Optional[TraceContext]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits):0{bits // 4}x}"
+
+
+def start_trace(sample_rate: Optional[float] = None) -> TraceContext:
+    """Start a new trace in the current context.
+
+    Every trace gets an id so log lines can be correlated; only sampled traces
+    emit span records, which keeps the tracing overhead bounded.
+    """
+    rate = settings.TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    trace = TraceContext(_new_id(64), rate >= 1.0 or random.random() < rate)
+    _current_trace.set(trace)
+    _current_span.set(None)
+    return trace
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+def current_span_id() -> Optional[str]:
+    return _current_span.get()
+
+
+class span:
+    """Time a stage of the current trace and log it as a span record if sampled"""
+
+    __slots__ = ("name", "attributes", "_trace", "_span_id", "_parent_id", "_token", "_started")
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self._trace = None
+
+    def __enter__(self) -> "span":
+        trace = _current_trace.get()
+        if trace is None or not trace.sampled:
+            return self
+        self._trace = trace
+        self._span_id = _new_id(32)
+        self._parent_id = _current_span.get()
+        self._token = _current_span.set(self._span_id)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._trace is None:
+            return False
+        duration_ms = (time.perf_counter() - self._started) * 1000
+        _current_span.reset(self._token)
+        tracer_logger.info(
+            "span",
+            extra={
+                "trace_id": self._trace.trace_id,
+                "span_id": self._span_id,
+                "parent_span_id": self._parent_id,
+                "span": self.name,
+                "duration_ms": round(duration_ms, 3),
+                "error": exc_type.__name__ if exc_type else None,
+                **self.attributes,
+            },
+        )
+        return False
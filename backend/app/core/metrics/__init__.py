@@ -0,0 +1,65 @@
+from .registry import MetricsRegistry, Counter, Gauge, Histogram, DEFAULT_LATENCY_BUCKETS
+from .metrics import (
+    registry,
+    WS_CONNECT_SETUP_SECONDS,
+    WS_ACTIVE_CONNECTIONS,
+    WS_REAPED_CONNECTIONS,
+    ADMISSION_DECISIONS,
+    EVENT_LOOP_LAG_SECONDS,
+    PROVIDER_EXECUTOR_IN_FLIGHT,
+    CPU_OFFLOAD_IN_FLIGHT,
+    CPU_OFFLOAD_QUEUE_SECONDS,
+    CPU_OFFLOAD_RUN_SECONDS,
+    CPU_OFFLOAD_REJECTED,
+    STT_LATENCY_SECONDS,
+    TRANSLATION_LATENCY_SECONDS,
+    TRANSCRIPT_INSERT_SECONDS,
+    TRANSCRIPT_ROWS_WRITTEN,
+    TRANSCRIPT_WAL_SYNC_SECONDS,
+    AUDIO_TO_RESULT_SECONDS,
+    WS_CHUNK_HINTS,
+    OVERLAP_DEDUP_CHARACTERS,
+    TRANSLATION_MEMORY_LOOKUPS,
+    AUDIO_RECORDED_BYTES,
+    BATCH_CHUNKS,
+    PROVIDER_ERRORS,
+    SIMULATED_PROVIDER_CALLS,
+    STARTUP_IMPORT_SECONDS,
+    STARTUP_READY_SECONDS,
+    PROVIDER_WARMUP_SECONDS,
+)
+
+__all__ = [
+    "MetricsRegistry",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "DEFAULT_LATENCY_BUCKETS",
+    "registry",
+    "WS_CONNECT_SETUP_SECONDS",
+    "WS_ACTIVE_CONNECTIONS",
+    "WS_REAPED_CONNECTIONS",
+    "ADMISSION_DECISIONS",
+    "EVENT_LOOP_LAG_SECONDS",
+    "PROVIDER_EXECUTOR_IN_FLIGHT",
+    "CPU_OFFLOAD_IN_FLIGHT",
+    "CPU_OFFLOAD_QUEUE_SECONDS",
+    "CPU_OFFLOAD_RUN_SECONDS",
+    "CPU_OFFLOAD_REJECTED",
+    "STT_LATENCY_SECONDS",
+    "TRANSLATION_LATENCY_SECONDS",
+    "TRANSCRIPT_INSERT_SECONDS",
+    "TRANSCRIPT_ROWS_WRITTEN",
+    "TRANSCRIPT_WAL_SYNC_SECONDS",
+    "AUDIO_TO_RESULT_SECONDS",
+    "WS_CHUNK_HINTS",
+    "OVERLAP_DEDUP_CHARACTERS",
+    "TRANSLATION_MEMORY_LOOKUPS",
+    "AUDIO_RECORDED_BYTES",
+    "BATCH_CHUNKS",
+    "PROVIDER_ERRORS",
+    "SIMULATED_PROVIDER_CALLS",
+    "STARTUP_IMPORT_SECONDS",
+    "STARTUP_READY_SECONDS",
+    "PROVIDER_WARMUP_SECONDS",
+]
@@ -0,0 +1,123 @@
+from .registry import MetricsRegistry
+
+registry = MetricsRegistry()
+
+WS_CONNECT_SETUP_SECONDS = registry.histogram(
+    "ws_connect_setup_seconds",
+    "Time from WebSocket accept to the ready message",
+)
+WS_ACTIVE_CONNECTIONS = registry.gauge(
+    "ws_active_connections",
+    "Open interpretation WebSocket connections",
+)
+STT_LATENCY_SECONDS = registry.histogram(
+    "stt_latency_seconds",
+    "Speech-to-text request latency",
+    ["provider"],
+)
+TRANSLATION_LATENCY_SECONDS = registry.histogram(
+    "translation_latency_seconds",
+    "Translation request latency per provider and language pair",
+    ["provider", "language_pair"],
+)
+TRANSCRIPT_INSERT_SECONDS = registry.histogram(
+    "transcript_insert_seconds",
+    "Latency of writing one batch of transcript rows",
+)
+TRANSCRIPT_ROWS_WRITTEN = registry.counter(
+    "transcript_rows_written",
+    "Transcript rows written, by write path (copy or postgrest)",
+    ["backend"],
+)
+TRANSCRIPT_WAL_SYNC_SECONDS = registry.histogram(
+    "transcript_wal_sync_seconds",
+    "Duration of one fsync of the local transcript log (shared by the rows appended before it)",
+)
+TRANSLATION_MEMORY_LOOKUPS = registry.counter(
+    "translation_memory_lookups",
+    "Translation memory lookups by outcome (exact, fuzzy or miss)",
+    ["outcome"],
+)
+AUDIO_RECORDED_BYTES = registry.counter(
+    "audio_recorded_bytes",
+    "Session audio written to recordings (AUDIO_RECORDING_ENABLED)",
+)
+BATCH_CHUNKS = registry.counter(
+    "batch_chunks",
+    "Chunks of uploaded recordings interpreted, by outcome",
+    ["outcome"],
+)
+AUDIO_TO_RESULT_SECONDS = registry.histogram(
+    "audio_to_result_seconds",
+    "Time from receiving an audio frame to sending its result",
+)
+WS_CHUNK_HINTS = registry.counter(
+    "ws_chunk_hints",
+    "chunk_hint messages sent to interpretation clients, by direction",
+    ["direction"],
+)
+OVERLAP_DEDUP_CHARACTERS = registry.counter(
+    "overlap_dedup_characters",
+    "Transcript characters removed as repeats of the previous chunk, before translation",
+)
+WS_REAPED_CONNECTIONS = registry.counter(
+    "ws_reaped_connections",
+    "Interpretation WebSockets closed by the reaper, by reason",
+    ["reason"],
+)
+ADMISSION_DECISIONS = registry.counter(
+    "admission_decisions",
+    "Interpretation handshakes admitted or rejected, by reason",
+    ["decision", "reason"],
+)
+EVENT_LOOP_LAG_SECONDS = registry.histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop woke up from a timed sleep",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+PROVIDER_EXECUTOR_IN_FLIGHT = registry.gauge(
+    "provider_executor_in_flight",
+    "Provider SDK calls running or queued in the thread pool",
+)
+CPU_OFFLOAD_IN_FLIGHT = registry.gauge(
+    "cpu_offload_in_flight",
+    "CPU-bound calls running or queued in the process pool",
+)
+CPU_OFFLOAD_QUEUE_SECONDS = registry.histogram(
+    "cpu_offload_queue_seconds",
+    "Time a CPU-bound call waited for a pool process, by task",
+    ["task"],
+)
+CPU_OFFLOAD_RUN_SECONDS = registry.histogram(
+    "cpu_offload_run_seconds",
+    "Time a CPU-bound call ran in the pool, by task",
+    ["task"],
+)
+CPU_OFFLOAD_REJECTED = registry.counter(
+    "cpu_offload_rejected",
+    "CPU-bound calls refused because the pool queue was full, by task",
+    ["task"],
+)
+PROVIDER_ERRORS = registry.counter(
+    "provider_errors",
+    "Failed calls to external providers",
+    ["provider", "operation"],
+)
+SIMULATED_PROVIDER_CALLS = registry.counter(
+    "simulated_provider_calls",
+    "Calls to simulated providers by outcome (PROVIDER_SIMULATION only)",
+    ["provider", "operation", "outcome"],
+)
+STARTUP_IMPORT_SECONDS = registry.gauge(
+    "startup_import_seconds",
+    "Time spent importing the application module",
+)
+STARTUP_READY_SECONDS = registry.gauge(
+    "startup_ready_seconds",
+    "Time from the start of the import until the worker reported ready",
+)
+PROVIDER_WARMUP_SECONDS = registry.gauge(
+    "provider_warmup_seconds",
+    "Duration of each provider warm-up step",
+    ["step"],
+)
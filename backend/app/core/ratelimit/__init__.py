@@ -0,0 +1,29 @@
+from app.core.config import settings
+from .limiter import RateLimit, TokenBucketLimiter, RedisTokenBucketLimiter
+from .policies import AUTH_RATE_LIMIT, API_RATE_LIMITS, WS_FRAME_RATE_LIMITS
+from typing import Optional, Union
+
+__all__ = [
+    "RateLimit",
+    "TokenBucketLimiter",
+    "RedisTokenBucketLimiter",
+    "AUTH_RATE_LIMIT",
+    "API_RATE_LIMITS",
+    "WS_FRAME_RATE_LIMITS",
+    "get_rate_limiter",
+]
+
+_rate_limiter: Optional[Union[TokenBucketLimiter, RedisTokenBucketLimiter]] = None
+
+
+def get_rate_limiter() -> Union[TokenBucketLimiter, RedisTokenBucketLimiter]:
+    """Get or create the configured rate limiter"""
+    global _rate_limiter
+    
+    if _rate_limiter is None:
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            _rate_limiter = RedisTokenBucketLimiter(settings.REDIS_URL)
+        else:
+            _rate_limiter = TokenBucketLimiter()
+    
+    return _rate_limiter
@@ -0,0 +1,118 @@
+from collections import OrderedDict
+from typing import NamedTuple, List
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimit(NamedTuple):
+    """Token bucket parameters: sustained rate (tokens/s) and burst capacity"""
+    rate: float
+    burst: float
+
+
+class TokenBucketLimiter:
+    """In-process token buckets, one per key.
+
+    A check is a dict lookup and a few float operations, so it is cheap enough
+    for every WebSocket frame. Limits are per worker process; use
+    RedisTokenBucketLimiter to share them across workers.
+
+    Buckets are kept in least recently used order and at most ``max_keys``
+    are held: a new key evicts the least recently used bucket, so many
+    distinct keys (client IPs) cost constant time and bounded memory.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> [tokens, last refill, seconds until full again]
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+
+    def hit_nowait(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        """Take tokens from a bucket; returns 0 if allowed, else seconds to wait"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._evict(now)
+            bucket = self._buckets[key] = [limit.burst, now, 0.0]
+        else:
+            self._buckets.move_to_end(key)
+
+        tokens = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+        bucket[1] = now
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / limit.rate
+        bucket[0] = tokens
+        bucket[2] = (limit.burst - tokens) / limit.rate
+        return retry_after
+
+    async def hit(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        return self.hit_nowait(key, limit, cost)
+
+    def _evict(self, now: float) -> None:
+        # Drop the least recently used bucket, and the ones after it that are full
+        # again and carry no state; each bucket is dropped once, so this is O(1) amortized
+        self._buckets.popitem(last=False)
+        while self._buckets:
+            _, last, horizon = next(iter(self._buckets.values()))
+            if now - last < horizon:
+                break
+            self._buckets.popitem(last=False)
+
+    async def close(self) -> None:
+        pass
+
+
+# Refill and take in one atomic step on the Redis server, using server time so
+# workers with skewed clocks share the same bucket correctly.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return tostring(retry_after)
+"""
+
+
+class RedisTokenBucketLimiter:
+    """Token buckets stored in Redis, shared by every worker"""
+
+    def __init__(self, redis_url: str, prefix: str = "ratelimit:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self.redis = redis.Redis.from_url(redis_url)
+        self._script = self.redis.register_script(TOKEN_BUCKET_LUA)
+
+    async def hit(self, key: str, limit: RateLimit, cost: float = 1.0) -> float:
+        try:
+            retry_after = await self._script(
+                keys=[self.prefix + key],
+                args=[limit.rate, limit.burst, cost],
+            )
+            return float(retry_after)
+        except Exception as e:
+            # Fail open: an unavailable Redis should not take the API down with it
+            logger.warning("Rate limiter error: %s", e)
+            return 0.0
+
+    async def close(self) -> None:
+        await self.redis.close()
@@ -0,0 +1,21 @@
+from app.models.subscription import SubscriptionPlan
+from .limiter import RateLimit
+
+# /api/v1/auth/* is unauthenticated, so it is limited per client IP
+AUTH_RATE_LIMIT = RateLimit(rate=1.0, burst=10)
+
+# Authenticated REST requests, per user
+API_RATE_LIMITS = {
+    SubscriptionPlan.FREE: RateLimit(rate=5, burst=20),
+    SubscriptionPlan.BASIC: RateLimit(rate=10, burst=40),
+    SubscriptionPlan.PRO: RateLimit(rate=20, burst=80),
+    SubscriptionPlan.ENTERPRISE: RateLimit(rate=50, burst=200),
+}
+
+# Audio frames on /ws/interpret, per user
+WS_FRAME_RATE_LIMITS = {
+    SubscriptionPlan.FREE: RateLimit(rate=10, burst=30),
+    SubscriptionPlan.BASIC: RateLimit(rate=20, burst=60),
+    SubscriptionPlan.PRO: RateLimit(rate=50, burst=150),
+    SubscriptionPlan.ENTERPRISE: RateLimit(rate=100, burst=300),
+}
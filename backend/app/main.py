@@ -1,35 +1,107 @@
-from fastapi import FastAPI, WebSocket
+import time
+
+# Taken before the imports below so the startup report covers them
+_IMPORT_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, WebSocket, Query, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.core.config import settings
-from app.api.endpoints import auth, users
-from app.websocket import websocket_interpretation
-
-app = FastAPI(
-    title=settings.APP_NAME,
-    version=settings.APP_VERSION,
-    debug=settings.DEBUG,
+from typing import Optional
+from app.api.endpoints import auth, users, sessions, search
+from app.api.dependencies import rate_limit_by_ip, rate_limit_by_user
+from app.websocket import (
+    websocket_interpretation,
+    connection_reaper,
+    admission_controller,
+    AdmissionMiddleware,
 )
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins_list,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+from app.services.providers import providers, provider_executor
+from app.services.usage import usage_meter
+from app.services.sessions import session_writer
+from app.services.recording import shutdown_recorders
+from app.services.batch import batch_interpreter
+from app.services.offload import cpu_executor, CPUExecutorBusy
+from app.core.database import open_pg_pool, close_pg_pool
+from app.core.ratelimit import get_rate_limiter
+from app.core.metrics import (
+    registry as metrics_registry,
+    STARTUP_IMPORT_SECONDS,
+    STARTUP_READY_SECONDS,
+    PROVIDER_WARMUP_SECONDS,
 )
+from app.core.logging import configure_logging, shutdown_logging
+import asyncio
+import logging
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_up(app: FastAPI):
+    """Warm provider connections, then mark the worker ready"""
+    if settings.PROVIDER_WARMUP_ENABLED:
+        timings = await providers.warm_up()
+        for step, seconds in timings.items():
+            PROVIDER_WARMUP_SECONDS.labels(step).set(seconds)
+        app.state.startup["warmup_seconds"] = timings
 
-# Include routers
-app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
-app.include_router(users.router, prefix=settings.API_V1_PREFIX)
+    ready_seconds = time.perf_counter() - _IMPORT_STARTED
+    app.state.startup["ready_seconds"] = round(ready_seconds, 4)
+    STARTUP_READY_SECONDS.set(ready_seconds)
+    app.state.ready = True
+    logger.info("Worker ready", extra=app.state.startup)
 
-# WebSocket endpoint
-@app.websocket("/ws/interpret")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket_interpretation(websocket)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        await open_pg_pool()
+    except Exception as e:
+        # Writes fall back to PostgREST
+        logger.warning("Postgres pool unavailable: %s", e)
+    session_writer.start()
+    if settings.USAGE_METERING_ENABLED:
+        usage_meter.start()
+    connection_reaper.start()
+    admission_controller.lag_monitor.start()
+    # Warm-up runs in the background so /health answers while it is in progress;
+    # /ready reports 503 until it is done
+    warmup = asyncio.create_task(_warm_up(app))
+
+    yield
+
+    if not warmup.done():
+        warmup.cancel()
+    await connection_reaper.stop()
+    await admission_controller.lag_monitor.stop()
+    # Running batch jobs are recorded as interrupted
+    await batch_interpreter.stop()
+    # Write out usage that has not been flushed yet
+    await usage_meter.stop()
+    # Write out queued transcripts before the pool closes
+    await session_writer.stop()
+    await close_pg_pool()
+    await get_rate_limiter().close()
+    provider_executor.shutdown()
+    cpu_executor.shutdown()
+    # Finish writing recorded audio
+    shutdown_recorders()
+    shutdown_logging()
+
+
+async def websocket_endpoint(
+    websocket: WebSocket,
+    source_language: str = Query(...),
+    target_language: str = Query(...),
+    token: str = Query(...),
+    session_id: Optional[int] = Query(None)
+):
+    await websocket_interpretation(websocket, source_language, target_language, token, session_id)
 
 
-@app.get("/")
 async def root():
     return {
         "message": "Live Interpreter Pro API",
@@ -38,6 +110,80 @@ async def root():
     }
 
 
-@app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+async def readiness_check(request: Request):
+    """Ready once provider warm-up has finished"""
+    if not request.app.state.ready:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting", **request.app.state.startup}
+        )
+    return {"status": "ready", **request.app.state.startup}
+
+
+async def cpu_busy_handler(request: Request, exc: CPUExecutorBusy):
+    """Shed requests whose CPU-bound work cannot be queued"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    )
+
+
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+def create_app() -> FastAPI:
+    """Build the application (``uvicorn --factory app.main:create_app``)"""
+    configure_logging()
+
+    app = FastAPI(
+        title=settings.APP_NAME,
+        version=settings.APP_VERSION,
+        debug=settings.DEBUG,
+        lifespan=lifespan,
+    )
+    app.state.ready = False
+    app.state.startup = {"import_seconds": round(IMPORT_SECONDS, 4)}
+    STARTUP_IMPORT_SECONDS.set(IMPORT_SECONDS)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins_list,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Refuse interpretation sessions under overload, before routing and accept()
+    app.add_middleware(AdmissionMiddleware)
+    app.add_exception_handler(CPUExecutorBusy, cpu_busy_handler)
+    
+    # Include routers (auth is limited per client IP, the rest per user and plan)
+    app.include_router(auth.router, prefix=settings.API_V1_PREFIX, dependencies=[Depends(rate_limit_by_ip)])
+    app.include_router(users.router, prefix=settings.API_V1_PREFIX, dependencies=[Depends(rate_limit_by_user)])
+    app.include_router(sessions.router, prefix=settings.API_V1_PREFIX, dependencies=[Depends(rate_limit_by_user)])
+    app.include_router(search.router, prefix=settings.API_V1_PREFIX, dependencies=[Depends(rate_limit_by_user)])
+
+    # WebSocket endpoint
+    app.add_api_websocket_route("/ws/interpret", websocket_endpoint)
+
+    app.add_api_route("/", root, methods=["GET"])
+    app.add_api_route("/health", health_check, methods=["GET"])
+    app.add_api_route("/ready", readiness_check, methods=["GET"])
+    if settings.METRICS_ENABLED:
+        app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+
+    return app
+
+
+app = create_app()
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
-from app.core.database import Base
+from app.core.database.base import Base
 
 
 class Transcript(Base):
@@ -14,7 +15,10 @@ class Transcript(Base):
     source_language = Column(String, nullable=False)
     target_language = Column(String, nullable=False)
     timestamp = Column(Float, nullable=False)  # Audio timestamp in seconds
+    end_timestamp = Column(Float, nullable=True)  # Segment end in seconds
     confidence = Column(Float, nullable=True)  # STT confidence score
+    word_timings = Column(LargeBinary, nullable=True)  # WordTimings.to_bytes(), times from session start
+    write_id = Column(UUID(as_uuid=False), unique=True, nullable=True)  # Makes replays of the transcript log idempotent
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -1,6 +1,8 @@
 from .user import UserBase, UserCreate, UserUpdate, UserResponse, UserLogin, Token, TokenData
-from .session import SessionBase, SessionCreate, SessionUpdate, SessionResponse
-from .transcript import TranscriptBase, TranscriptCreate, TranscriptResponse
+from .session import SessionBase, SessionCreate, SessionUpdate, SessionResponse, SessionPage, BatchJobResponse
+from .transcript import (
+    TranscriptBase, TranscriptCreate, TranscriptResponse, TranscriptPage, TranscriptSearchResult, WordTiming, WordTimingList
+)
 
 __all__ = [
     "UserBase",
@@ -14,8 +16,14 @@ __all__ = [
     "SessionCreate",
     "SessionUpdate",
     "SessionResponse",
+    "SessionPage",
+    "BatchJobResponse",
     "TranscriptBase",
     "TranscriptCreate",
     "TranscriptResponse",
+    "TranscriptPage",
+    "TranscriptSearchResult",
+    "WordTiming",
+    "WordTimingList",
 ]
 
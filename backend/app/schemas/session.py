@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class SessionBase(BaseModel):
@@ -22,7 +22,7 @@ class SessionUpdate(BaseModel):
 
 class SessionResponse(SessionBase):
     id: int
-    user_id: int
+    user_id: str  # UUID from Supabase Auth
     started_at: datetime
     ended_at: Optional[datetime] = None
     created_at: datetime
@@ -30,3 +30,18 @@ class SessionResponse(SessionBase):
     class Config:
         from_attributes = True
 
+
+class BatchJobResponse(BaseModel):
+    session_id: int
+    status: str  # running, completed or failed
+    audio_seconds: float
+    chunks: int
+    completed_chunks: int
+    failed_chunks: int
+    error: Optional[str] = None
+    updated_at: datetime
+
+
+class SessionPage(BaseModel):
+    items: List[SessionResponse]
+    next_cursor: Optional[str] = None
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 
 class TranscriptBase(BaseModel):
@@ -9,6 +9,7 @@ class TranscriptBase(BaseModel):
     source_language: str
     target_language: str
     timestamp: float
+    end_timestamp: Optional[float] = None
     confidence: Optional[float] = None
 
 
@@ -24,3 +25,25 @@ class TranscriptResponse(TranscriptBase):
     class Config:
         from_attributes = True
 
+
+class TranscriptPage(BaseModel):
+    items: List[TranscriptResponse]
+    next_cursor: Optional[str] = None
+
+
+class WordTiming(BaseModel):
+    word: str
+    start: float
+    end: float
+    confidence: float
+
+
+class WordTimingList(BaseModel):
+    items: List[WordTiming]
+
+
+class TranscriptSearchResult(TranscriptResponse):
+    rank: float
+    # HTML fragments: the text is escaped, matches are wrapped in <mark>
+    original_highlight: Optional[str] = None
+    translated_highlight: Optional[str] = None
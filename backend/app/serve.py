@@ -0,0 +1,104 @@
+"""Production entry point: ``python -m app.serve``.
+
+Runs uvicorn with one worker per available CPU (SERVE_WORKERS overrides),
+uvloop and httptools when installed. On SIGTERM each worker stops listening,
+refuses new /ws/interpret handshakes, lets open sessions finish the frame
+they are processing and end, then runs the normal shutdown, which flushes
+pending usage, within SHUTDOWN_DRAIN_SECONDS plus SHUTDOWN_GRACE_SECONDS.
+"""
+from app.core.config import settings
+from app.core.logging import configure_logging
+from typing import List, Optional
+import logging
+import os
+import socket
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+# uvloop and httptools are optional - uvicorn falls back to asyncio and h11
+try:
+    import uvloop  # noqa: F401
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools  # noqa: F401
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
+# Named explicitly: under ``python -m`` __name__ is "__main__", outside the app logger
+logger = logging.getLogger("app.serve")
+
+
+def default_workers() -> int:
+    """CPUs this process may run on (respects container CPU sets)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that drains interpretation sessions before shutting down"""
+
+    async def shutdown(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        # Stop listening first so new connections go to other workers/instances
+        for server in self.servers:
+            server.close()
+        for sock in sockets or []:
+            sock.close()
+
+        # Imported here: the app is loaded by uvicorn, not when this module is
+        from app.websocket import drain_connections
+
+        logger.info("Draining WebSocket sessions", extra={"timeout_seconds": settings.SHUTDOWN_DRAIN_SECONDS})
+        forced = await drain_connections(settings.SHUTDOWN_DRAIN_SECONDS)
+        logger.info("WebSocket sessions drained", extra={"ended_by_shutdown": forced})
+
+        # Remaining HTTP requests, then the lifespan shutdown (usage flush)
+        await super().shutdown(sockets=sockets)
+
+
+def build_config(workers: Optional[int] = None) -> uvicorn.Config:
+    return uvicorn.Config(
+        "app.main:app",
+        host=settings.SERVE_HOST,
+        port=settings.SERVE_PORT,
+        workers=workers or settings.SERVE_WORKERS or default_workers(),
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        http="httptools" if HTTPTOOLS_AVAILABLE else "h11",
+        proxy_headers=True,
+        # Heartbeat: half-open connections are closed when a ping goes unanswered
+        ws_ping_interval=settings.WS_PING_INTERVAL_SECONDS,
+        ws_ping_timeout=settings.WS_PING_TIMEOUT_SECONDS,
+        timeout_graceful_shutdown=settings.SHUTDOWN_GRACE_SECONDS,
+    )
+
+
+def main() -> None:
+    configure_logging()
+    config = build_config()
+    logger.info(
+        "Starting server",
+        extra={
+            "host": config.host,
+            "port": config.port,
+            "workers": config.workers,
+            "loop": config.loop,
+            "http": config.http,
+        }
+    )
+
+    server = DrainingServer(config)
+    if config.workers > 1:
+        sock = config.bind_socket()
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+from app.core.config import settings
+from .store import ArchiveStore, LocalArchiveStore
+from .parquet import iter_archived_transcripts, read_archived_transcripts, PYARROW_AVAILABLE
+from .archiver import SessionArchiver
+from typing import Optional
+
+__all__ = [
+    "ArchiveStore",
+    "LocalArchiveStore",
+    "SessionArchiver",
+    "iter_archived_transcripts",
+    "read_archived_transcripts",
+    "get_archive_store",
+    "PYARROW_AVAILABLE",
+]
+
+_archive_store: Optional[ArchiveStore] = None
+
+
+def get_archive_store() -> ArchiveStore:
+    """Get or create the configured archive store"""
+    global _archive_store
+    
+    if _archive_store is None:
+        _archive_store = LocalArchiveStore(settings.ARCHIVE_STORAGE_PATH)
+    
+    return _archive_store
@@ -0,0 +1,106 @@
+from app.core.config import settings
+from app.core.database import Client
+from .store import ArchiveStore
+from .parquet import (
+    write_transcripts,
+    ARCHIVE_COLUMNS,
+    ARCHIVE_FORMAT,
+    ARCHIVE_COMPRESSION,
+)
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Iterator
+
+
+class SessionArchiver:
+    """Moves transcripts of long-ended sessions from the hot table to archive files.
+
+    For each session the rows are written to ``sessions/<user>/<session>.parquet``,
+    a manifest is stored under ``sessions.metadata["archive"]`` and only then are
+    the rows deleted. Reads follow the manifest, so a run interrupted before the
+    delete leaves stale hot rows behind but never loses transcripts.
+    """
+
+    def __init__(self, supabase: Client, store: ArchiveStore, batch_size: int = 1000):
+        self.supabase = supabase
+        self.store = store
+        self.batch_size = batch_size
+
+    async def archive_ended_sessions(
+        self,
+        older_than_days: Optional[int] = None,
+        limit: Optional[int] = None,
+        dry_run: bool = False
+    ) -> List[Dict]:
+        """Archive up to ``limit`` sessions that ended more than N days ago"""
+        days = settings.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+        cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+
+        result = (
+            self.supabase.table("sessions")
+            .select("id, user_id, ended_at, metadata")
+            .lt("ended_at", cutoff)
+            .is_("metadata->archive", "null")
+            .order("id")
+            .limit(limit or settings.ARCHIVE_BATCH_SIZE)
+            .execute()
+        )
+
+        archived = []
+        for session in result.data or []:
+            if dry_run:
+                archived.append({"session_id": session["id"], "dry_run": True})
+                continue
+            manifest = await self.archive_session(session)
+            archived.append({"session_id": session["id"], **manifest})
+        return archived
+
+    async def archive_session(self, session: Dict) -> Dict:
+        """Archive one session's transcripts and return the manifest written"""
+        data, rows, first_id, last_id, last_end = write_transcripts(self._iter_hot_batches(session["id"]))
+
+        # Sessions without transcripts still get a manifest so they are not picked again
+        key = None
+        if rows:
+            key = f"sessions/{session['user_id']}/{session['id']}.{ARCHIVE_FORMAT}"
+            self.store.put_object(key, data)
+
+        manifest = {
+            "key": key,
+            "format": ARCHIVE_FORMAT,
+            "compression": ARCHIVE_COMPRESSION,
+            "rows": rows,
+            "bytes": len(data) if rows else 0,
+            "first_id": first_id,
+            "last_id": last_id,
+            # Where a resumed session's audio clock continues
+            "last_end": last_end,
+            "archived_at": datetime.utcnow().isoformat(),
+        }
+        metadata = dict(session.get("metadata") or {})
+        metadata["archive"] = manifest
+        self.supabase.table("sessions").update({"metadata": metadata}).eq("id", session["id"]).execute()
+
+        self._delete_hot_rows(session["id"], last_id)
+        return manifest
+
+    def _iter_hot_batches(self, session_id: int) -> Iterator[List[Dict]]:
+        after_id = None
+        while True:
+            query = (
+                self.supabase.table("transcripts")
+                .select(", ".join(ARCHIVE_COLUMNS))
+                .eq("session_id", session_id)
+            )
+            if after_id is not None:
+                query = query.gt("id", after_id)
+            rows = query.order("id").limit(self.batch_size).execute().data or []
+            if rows:
+                yield rows
+            if len(rows) < self.batch_size:
+                return
+            after_id = rows[-1]["id"]
+
+    def _delete_hot_rows(self, session_id: int, last_id: Optional[int]) -> None:
+        if last_id is None:
+            return
+        self.supabase.table("transcripts").delete().eq("session_id", session_id).lte("id", last_id).execute()
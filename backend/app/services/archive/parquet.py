@@ -0,0 +1,150 @@
+from .store import ArchiveStore
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+
+# pyarrow is optional - only needed where archival or archived reads happen
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    pa = None
+    pq = None
+
+ARCHIVE_FORMAT = "parquet"
+ARCHIVE_COMPRESSION = "zstd"
+
+# Columns kept in the archive, in the same shape the hot table returns them.
+# created_at stays a string so archived rows serialize exactly like live ones.
+# word_timings holds WordTimings.to_bytes output and is only read on request.
+TRANSCRIPT_FIELDS = [
+    ("id", "int64"),
+    ("session_id", "int64"),
+    ("original_text", "string"),
+    ("translated_text", "string"),
+    ("source_language", "string"),
+    ("target_language", "string"),
+    ("timestamp", "float64"),
+    ("end_timestamp", "float64"),
+    ("confidence", "float64"),
+    ("created_at", "string"),
+    ("word_timings", "binary"),
+]
+
+ARCHIVE_COLUMNS = [name for name, _ in TRANSCRIPT_FIELDS]
+# The columns of archived rows as listed and exported
+TRANSCRIPT_COLUMNS = [name for name in ARCHIVE_COLUMNS if name != "word_timings"]
+BINARY_COLUMNS = [name for name, type_name in TRANSCRIPT_FIELDS if type_name == "binary"]
+
+
+def _require_pyarrow() -> None:
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required to read or write archived sessions")
+
+
+def transcript_schema():
+    _require_pyarrow()
+    return pa.schema([(name, pa.type_for_alias(type_name)) for name, type_name in TRANSCRIPT_FIELDS])
+
+
+def _to_binary(value) -> Optional[bytes]:
+    # PostgREST returns bytea columns in their "\\x"-hex text form
+    if isinstance(value, str):
+        return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
+    return value
+
+
+def write_transcripts(
+    batches: Iterable[List[Dict]]
+) -> Tuple[bytes, int, Optional[int], Optional[int], Optional[float]]:
+    """Encode batches of transcript rows as one compressed Parquet file.
+
+    Each batch becomes a row group, so only one batch of Python dicts is alive
+    at a time. Returns (data, row_count, first_id, last_id, last_end), where
+    last_end is the latest segment end in seconds of session audio.
+    """
+    schema = transcript_schema()
+    sink = pa.BufferOutputStream()
+    rows = 0
+    first_id = last_id = last_end = None
+
+    with pq.ParquetWriter(sink, schema, compression=ARCHIVE_COMPRESSION) as writer:
+        for batch in batches:
+            if not batch:
+                continue
+            columns = {name: [row.get(name) for row in batch] for name in ARCHIVE_COLUMNS}
+            for name in BINARY_COLUMNS:
+                columns[name] = [_to_binary(value) for value in columns[name]]
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+            rows += len(batch)
+            if first_id is None:
+                first_id = batch[0]["id"]
+            last_id = batch[-1]["id"]
+            ends = [row.get("end_timestamp") or row.get("timestamp") or 0.0 for row in batch]
+            last_end = max([*ends, last_end or 0.0])
+
+    return sink.getvalue().to_pybytes(), rows, first_id, last_id, last_end
+
+
+def _row_groups_after(parquet_file, after_id: int) -> List[int]:
+    # Rows are written in id order, so the groups whose max id is past the cursor
+    # are a suffix; groups without statistics are kept and filtered row by row
+    id_column = parquet_file.schema_arrow.get_field_index("id")
+    metadata = parquet_file.metadata
+    for index in range(metadata.num_row_groups):
+        statistics = metadata.row_group(index).column(id_column).statistics
+        if statistics is None or not statistics.has_min_max or statistics.max > after_id:
+            return list(range(index, metadata.num_row_groups))
+    return []
+
+
+def iter_archived_transcripts(
+    store: ArchiveStore,
+    manifest: Dict,
+    after_id: Optional[int] = None,
+    batch_size: int = 500,
+    columns: Optional[List[str]] = None
+) -> Iterator[Dict]:
+    """Yield archived rows in id order, reading one row group batch at a time.
+
+    Row groups entirely before ``after_id`` are skipped using their id
+    statistics, so a page costs the same wherever it is in the session.
+    ``columns`` defaults to TRANSCRIPT_COLUMNS; columns an older archive
+    file lacks are left out of its rows.
+    """
+    if not manifest.get("key"):
+        return
+    _require_pyarrow()
+    with store.open_object(manifest["key"]) as source:
+        parquet_file = pq.ParquetFile(source)
+        names = parquet_file.schema_arrow.names
+        columns = [name for name in columns or TRANSCRIPT_COLUMNS if name in names]
+        row_groups = None
+        if after_id is not None:
+            row_groups = _row_groups_after(parquet_file, after_id)
+            if not row_groups:
+                return
+        for record_batch in parquet_file.iter_batches(
+            batch_size=batch_size, row_groups=row_groups, columns=columns
+        ):
+            for row in record_batch.to_pylist():
+                if after_id is None or row["id"] > after_id:
+                    yield row
+
+
+def read_archived_transcripts(
+    store: ArchiveStore,
+    manifest: Dict,
+    limit: int,
+    after_id: Optional[int] = None
+) -> List[Dict]:
+    """Read one keyset page of archived rows"""
+    if after_id is not None and manifest.get("last_id") is not None and after_id >= manifest["last_id"]:
+        return []
+
+    rows = []
+    for row in iter_archived_transcripts(store, manifest, after_id, batch_size=max(limit, 100)):
+        rows.append(row)
+        if len(rows) >= limit:
+            break
+    return rows
@@ -0,0 +1,63 @@
+from typing import BinaryIO
+from pathlib import Path
+import os
+import tempfile
+
+
+class ArchiveStore:
+    """Minimal object-store interface (S3/GCS style keys) used by the archiver"""
+
+    def put_object(self, key: str, data: bytes) -> None:
+        raise NotImplementedError
+
+    def open_object(self, key: str) -> BinaryIO:
+        """Open an object for reading; callers must close the returned file"""
+        raise NotImplementedError
+
+    def delete_object(self, key: str) -> None:
+        raise NotImplementedError
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+
+class LocalArchiveStore(ArchiveStore):
+    """Archive store backed by a local directory"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Invalid archive key: {key}")
+        return path
+
+    def put_object(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file and rename so readers never see a partial object
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def open_object(self, key: str) -> BinaryIO:
+        return open(self._path(key), "rb")
+
+    def delete_object(self, key: str) -> None:
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
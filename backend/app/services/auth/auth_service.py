@@ -1,5 +1,6 @@
 from app.core.security import verify_password, get_password_hash
 from app.core.database import Client
+from app.services.offload import cpu_executor
 from typing import Optional, Dict
 from datetime import datetime
 
@@ -10,7 +11,7 @@ class AuthService:
     
     async def create_user(self, email: str, password: str, full_name: Optional[str] = None) -> Dict:
         """Create a new user"""
-        hashed_password = get_password_hash(password)
+        hashed_password = await cpu_executor.run("password_hash", get_password_hash, password)
         
         # Check if user already exists
         existing = self.supabase.table("users").select("id").eq("email", email).execute()
@@ -48,7 +49,7 @@ class AuthService:
         if not user:
             return None
         
-        if not verify_password(password, user["hashed_password"]):
+        if not await cpu_executor.run("password_verify", verify_password, password, user["hashed_password"]):
             return None
         
         if not user.get("is_active", True):
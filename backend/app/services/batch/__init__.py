@@ -0,0 +1,27 @@
+from .audio import WavInfo, AudioChunk, read_wav_info, plan_chunks, chunk_wav
+from .interpreter import (
+    BatchInterpreter,
+    BatchJob,
+    UploadTooLarge,
+    batch_interpreter,
+    save_upload,
+    STATUS_RUNNING,
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+)
+
+__all__ = [
+    "WavInfo",
+    "AudioChunk",
+    "read_wav_info",
+    "plan_chunks",
+    "chunk_wav",
+    "BatchInterpreter",
+    "BatchJob",
+    "UploadTooLarge",
+    "batch_interpreter",
+    "save_upload",
+    "STATUS_RUNNING",
+    "STATUS_COMPLETED",
+    "STATUS_FAILED",
+]
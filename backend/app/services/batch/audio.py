@@ -0,0 +1,101 @@
+from pathlib import Path
+from typing import List, NamedTuple, Tuple
+import io
+import operator
+import wave
+
+# Energy of a window is estimated from every Nth sample; plenty to tell speech from silence
+ENERGY_STRIDE = 4
+WINDOW_SECONDS = 0.05
+
+
+class WavInfo(NamedTuple):
+    channels: int
+    sample_width: int
+    frame_rate: int
+    frames: int
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.frame_rate
+
+
+class AudioChunk(NamedTuple):
+    index: int
+    start_frame: int
+    frames: int
+    start: float  # Seconds from the start of the recording
+    end: float
+
+
+def read_wav_info(path: Path) -> WavInfo:
+    """Format of a WAV file; ValueError unless it is 16-bit PCM"""
+    try:
+        with wave.open(str(path), "rb") as source:
+            info = WavInfo(source.getnchannels(), source.getsampwidth(), source.getframerate(), source.getnframes())
+    except (wave.Error, EOFError) as e:
+        raise ValueError(f"Not a PCM WAV file: {e}")
+    if info.sample_width != 2:
+        raise ValueError("Only 16-bit PCM WAV is supported")
+    if info.frames == 0:
+        raise ValueError("The recording is empty")
+    return info
+
+
+def window_energies(path: Path, window_seconds: float = WINDOW_SECONDS) -> List[float]:
+    """Mean squared amplitude of each window, reading the file a window at a time"""
+    energies = []
+    with wave.open(str(path), "rb") as source:
+        frames_per_window = max(1, int(source.getframerate() * window_seconds))
+        while True:
+            data = source.readframes(frames_per_window)
+            if not data:
+                break
+            # WAV samples are little-endian, like every platform this runs on
+            samples = memoryview(data)[:len(data) - len(data) % 2].cast("h")[::ENERGY_STRIDE]
+            energies.append(sum(map(operator.mul, samples, samples)) / max(1, len(samples)))
+    return energies
+
+
+def silence_cuts(energies: List[float], min_windows: int, max_windows: int) -> List[int]:
+    """Window indexes to cut at: the quietest window between the minimum and maximum chunk length"""
+    cuts = []
+    start = 0
+    while len(energies) - start > max_windows:
+        cut = min(range(start + min_windows, start + max_windows), key=energies.__getitem__)
+        cuts.append(cut)
+        start = cut
+    return cuts
+
+
+def plan_chunks(path: Path, min_seconds: float, max_seconds: float) -> Tuple[WavInfo, List[AudioChunk]]:
+    """Split a recording into chunks of min_seconds..max_seconds, cut at silence"""
+    info = read_wav_info(path)
+    frames_per_window = max(1, int(info.frame_rate * WINDOW_SECONDS))
+    window = frames_per_window / info.frame_rate
+    cuts = silence_cuts(
+        window_energies(path),
+        max(1, int(min_seconds / window)),
+        max(2, int(max_seconds / window)),
+    )
+
+    boundaries = [0] + [cut * frames_per_window for cut in cuts] + [info.frames]
+    return info, [
+        AudioChunk(index, first, last - first, first / info.frame_rate, last / info.frame_rate)
+        for index, (first, last) in enumerate(zip(boundaries, boundaries[1:]))
+    ]
+
+
+def chunk_wav(path: Path, info: WavInfo, chunk: AudioChunk) -> bytes:
+    """One chunk of the recording as a standalone WAV file"""
+    with wave.open(str(path), "rb") as source:
+        source.setpos(chunk.start_frame)
+        data = source.readframes(chunk.frames)
+
+    output = io.BytesIO()
+    with wave.open(output, "wb") as target:
+        target.setnchannels(info.channels)
+        target.setsampwidth(info.sample_width)
+        target.setframerate(info.frame_rate)
+        target.writeframes(data)
+    return output.getvalue()
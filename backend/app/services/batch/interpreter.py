@@ -0,0 +1,244 @@
+from app.core.config import settings
+from app.core.database import get_supabase_client
+from app.core.metrics import BATCH_CHUNKS
+from app.services.offload import cpu_executor
+from app.services.providers import providers
+from app.services.sessions.writer import session_writer
+from app.services.usage import usage_meter
+from .audio import AudioChunk, WavInfo, chunk_wav, plan_chunks, read_wav_info
+from datetime import datetime
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+# Progress is written to the session at most this often
+PROGRESS_SAVE_INTERVAL = 1.0
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+async def save_upload(stream: AsyncIterator[bytes], directory: Optional[str] = None,
+                      max_bytes: Optional[int] = None) -> Path:
+    """Write an uploaded body to disk as it arrives; UploadTooLarge past ``max_bytes``
+
+    File operations run in a thread, so a slow disk does not stall the event loop.
+    """
+    directory = Path(directory or settings.BATCH_UPLOAD_PATH)
+    max_bytes = max_bytes or settings.BATCH_MAX_UPLOAD_BYTES
+    await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+    path = directory / f"{uuid.uuid4().hex}.wav"
+
+    size = 0
+    try:
+        upload = await asyncio.to_thread(open, path, "wb")
+        try:
+            async for data in stream:
+                size += len(data)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+                await asyncio.to_thread(upload.write, data)
+        finally:
+            await asyncio.to_thread(upload.close)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+class BatchJob:
+    """Progress of one uploaded recording; stored in its session's metadata"""
+
+    def __init__(self, session_id: Optional[int], user_id: str, path: Path, info: WavInfo,
+                 source_language: str, target_language: str):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.path = path
+        self.info = info
+        self.source_language = source_language
+        self.target_language = target_language
+        self.status = STATUS_RUNNING
+        self.chunks = 0
+        self.completed_chunks = 0
+        self.failed_chunks = 0
+        self.error: Optional[str] = None
+        self.updated_at = datetime.utcnow()
+
+    def to_dict(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "status": self.status,
+            "audio_seconds": round(self.info.duration, 3),
+            "chunks": self.chunks,
+            "completed_chunks": self.completed_chunks,
+            "failed_chunks": self.failed_chunks,
+            "error": self.error,
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class BatchInterpreter:
+    """Interprets uploaded recordings into sessions.
+
+    A recording is split at silence into chunks that are transcribed and
+    translated concurrently, at most ``concurrency`` at a time per job.
+    Results are stored in chunk order as soon as every earlier chunk is
+    done, so a running job's session already shows the start of the
+    recording. Progress lives in the session's metadata, so any worker can
+    report it.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None):
+        self.concurrency = concurrency or settings.BATCH_CONCURRENCY
+        self.jobs: Dict[int, BatchJob] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    async def submit(self, user_id: str, path: Path, source_language: str, target_language: str) -> BatchJob:
+        """Create the session for an uploaded WAV file and start interpreting it.
+
+        Raises ValueError when the file is not a supported WAV recording.
+        """
+        info = await asyncio.to_thread(read_wav_info, path)
+        job = BatchJob(None, user_id, path, info, source_language, target_language)
+        session = await session_writer.create_session(
+            user_id, source_language, target_language, metadata={"batch": job.to_dict()}
+        )
+        if not session:
+            raise RuntimeError("Failed to create session")
+
+        job.session_id = session["id"]
+        self.jobs[job.session_id] = job
+        self._tasks[job.session_id] = asyncio.create_task(self._run(job))
+        logger.info("Batch job started", extra={"session_id": job.session_id, "audio_seconds": info.duration})
+        return job
+
+    async def _save(self, job: BatchJob) -> None:
+        job.updated_at = datetime.utcnow()
+        await session_writer.set_metadata(job.session_id, {"batch": job.to_dict()})
+
+    async def _interpret_chunk(self, job: BatchJob, chunk: AudioChunk, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            audio = await cpu_executor.run("audio_chunk", chunk_wav, job.path, job.info, chunk, wait=True)
+            transcription = await providers.stt.transcribe_audio(audio, job.source_language)
+            translated = None
+            if transcription and transcription.get("text"):
+                translated = await providers.translation.translate(
+                    transcription["text"], job.source_language, job.target_language
+                )
+        return chunk, transcription, translated
+
+    def _transcript_row(self, job: BatchJob, chunk: AudioChunk, transcription: dict, translated: Optional[str]) -> Dict:
+        words = transcription.get("words")
+        return {
+            "session_id": job.session_id,
+            "original_text": transcription["text"],
+            "translated_text": translated,
+            "source_language": job.source_language,
+            "target_language": job.target_language,
+            "timestamp": chunk.start + words.start if words else chunk.start,
+            "end_timestamp": chunk.start + words.end if words else chunk.end,
+            "confidence": transcription.get("confidence", 0.0),
+            "word_timings": words.shifted(chunk.start).to_bytes() if words else None,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+
+    async def _run(self, job: BatchJob) -> None:
+        metered = False
+        tasks: List[asyncio.Task] = []
+        try:
+            if settings.USAGE_METERING_ENABLED:
+                await usage_meter.open_account(get_supabase_client(), job.user_id)
+                metered = True
+
+            _, chunks = await cpu_executor.run(
+                "audio_plan", plan_chunks, job.path,
+                settings.BATCH_CHUNK_MIN_SECONDS, settings.BATCH_CHUNK_MAX_SECONDS, wait=True,
+            )
+            job.chunks = len(chunks)
+            await self._save(job)
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            tasks = [asyncio.create_task(self._interpret_chunk(job, chunk, semaphore)) for chunk in chunks]
+            # Rows per chunk, None until the chunk is done; written out in order
+            results: List[Optional[List[Dict]]] = [None] * len(chunks)
+            written = 0
+            saved = time.monotonic()
+            exceeded = None
+
+            for next_done in asyncio.as_completed(tasks):
+                chunk, transcription, translated = await next_done
+                job.completed_chunks += 1
+                if transcription is None:
+                    job.failed_chunks += 1
+                    BATCH_CHUNKS.labels("failed").inc()
+                    results[chunk.index] = []
+                elif not transcription.get("text"):
+                    BATCH_CHUNKS.labels("empty").inc()
+                    results[chunk.index] = []
+                else:
+                    BATCH_CHUNKS.labels("transcribed").inc()
+                    results[chunk.index] = [self._transcript_row(job, chunk, transcription, translated)]
+
+                if metered:
+                    exceeded = usage_meter.record_audio(job.user_id, chunk.end - chunk.start) or exceeded
+                    if transcription and transcription.get("text"):
+                        exceeded = usage_meter.record_characters(job.user_id, len(transcription["text"])) or exceeded
+
+                while written < len(results) and results[written] is not None:
+                    for row in results[written]:
+                        await session_writer.add_transcript(row)
+                    written += 1
+
+                if exceeded:
+                    job.status = STATUS_FAILED
+                    job.error = f"Quota exceeded: {exceeded}"
+                    break
+                if time.monotonic() - saved >= PROGRESS_SAVE_INTERVAL:
+                    await self._save(job)
+                    saved = time.monotonic()
+
+            if job.status == STATUS_RUNNING:
+                job.status = STATUS_COMPLETED
+        except asyncio.CancelledError:
+            job.status = STATUS_FAILED
+            job.error = "Interrupted by server shutdown"
+            raise
+        except Exception as e:
+            logger.exception("Batch job failed", extra={"session_id": job.session_id})
+            job.status = STATUS_FAILED
+            job.error = str(e)
+        finally:
+            for task in tasks:
+                task.cancel()
+            try:
+                await session_writer.flush()
+                await session_writer.end_sessions([job.session_id])
+                await self._save(job)
+            except Exception:
+                logger.exception("Error finishing batch job", extra={"session_id": job.session_id})
+            if metered:
+                usage_meter.close_account(job.user_id)
+            job.path.unlink(missing_ok=True)
+            self.jobs.pop(job.session_id, None)
+            self._tasks.pop(job.session_id, None)
+            logger.info("Batch job finished", extra={"session_id": job.session_id, "status": job.status})
+
+    async def stop(self) -> None:
+        """Cancel running jobs; they are recorded as failed"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+batch_interpreter = BatchInterpreter()
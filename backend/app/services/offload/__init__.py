@@ -0,0 +1,3 @@
+from .executor import CPUExecutor, CPUExecutorBusy, cpu_executor
+
+__all__ = ["CPUExecutor", "CPUExecutorBusy", "cpu_executor"]
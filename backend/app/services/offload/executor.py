@@ -0,0 +1,116 @@
+from app.core.config import settings
+from app.core.metrics import (
+    CPU_OFFLOAD_IN_FLIGHT,
+    CPU_OFFLOAD_QUEUE_SECONDS,
+    CPU_OFFLOAD_REJECTED,
+    CPU_OFFLOAD_RUN_SECONDS,
+)
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional
+import asyncio
+import logging
+import multiprocessing
+import signal
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CPUExecutorBusy(Exception):
+    """The CPU pool queue is full; the caller should shed the request"""
+
+
+def _init_worker() -> None:
+    # Ctrl+C reaches the whole process group; the server shuts the pool down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _timed(function: Callable, args: tuple, submitted: float) -> tuple:
+    # Runs in the pool; wall-clock time is comparable across processes
+    started = time.time()
+    result = function(*args)
+    return result, started - submitted, time.time() - started
+
+
+def _warm_worker() -> None:
+    # Load bcrypt in the pool process so the first login does not pay for it
+    from app.core.security import get_password_hash
+    get_password_hash("warm-up")
+
+
+class CPUExecutor:
+    """Process pool for CPU-bound work: bcrypt, audio decoding, export serialization.
+
+    These hold the GIL for tens to hundreds of milliseconds, which a thread
+    pool cannot hide from the event loop. Functions and arguments must be
+    picklable (module-level functions). At most ``max_workers`` calls run
+    and ``max_queue`` wait; beyond that ``run`` raises CPUExecutorBusy, or
+    waits for a slot when ``wait=True`` (background work). With
+    ``max_workers=0`` calls run on threads, for environments without
+    process support.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        self.max_workers = settings.CPU_OFFLOAD_WORKERS if max_workers is None else max_workers
+        self.max_queue = settings.CPU_OFFLOAD_MAX_QUEUE if max_queue is None else max_queue
+        self.in_flight = 0
+        self._slots = asyncio.Semaphore(max(1, self.max_workers) + self.max_queue)
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.max_workers > 0:
+                # spawn: forking a process that runs an event loop and thread pools is unsafe
+                self._executor = ProcessPoolExecutor(
+                    self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+            else:
+                self._executor = ThreadPoolExecutor(4, thread_name_prefix="cpu-offload")
+        return self._executor
+
+    async def run(self, task: str, function: Callable, *args, wait: bool = False):
+        """Run ``function(*args)`` in the pool; ``task`` labels the metrics"""
+        if not wait and self._slots.locked():
+            CPU_OFFLOAD_REJECTED.labels(task).inc()
+            raise CPUExecutorBusy(f"CPU pool queue is full ({task})")
+
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            self.in_flight += 1
+            executor = self._get_executor()
+            try:
+                result, queued, ran = await loop.run_in_executor(
+                    executor, _timed, function, args, time.time()
+                )
+            except BrokenProcessPool:
+                # A pool process died (OOM kill); start a fresh pool for the next call.
+                # Other calls on the broken pool fail too, after it may have been replaced.
+                if self._executor is executor:
+                    logger.error("CPU pool broken, restarting it", extra={"task": task})
+                    self.shutdown()
+                raise
+            finally:
+                self.in_flight -= 1
+
+        CPU_OFFLOAD_QUEUE_SECONDS.labels(task).observe(max(0.0, queued))
+        CPU_OFFLOAD_RUN_SECONDS.labels(task).observe(ran)
+        return result
+
+    def warm_up(self) -> None:
+        """Start the pool processes and load bcrypt in each (blocking)"""
+        executor = self._get_executor()
+        for future in [executor.submit(_warm_worker) for _ in range(max(1, self.max_workers))]:
+            future.result()
+
+    def shutdown(self) -> None:
+        """Stop the pool; calls still running finish in the background"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+cpu_executor = CPUExecutor()
+CPU_OFFLOAD_IN_FLIGHT.set_function(lambda: cpu_executor.in_flight)
@@ -0,0 +1,4 @@
+from .registry import ProviderRegistry, providers
+from .executor import ProviderExecutor, provider_executor
+
+__all__ = ["ProviderRegistry", "providers", "ProviderExecutor", "provider_executor"]
@@ -0,0 +1,47 @@
+from app.core.config import settings
+from app.core.metrics import PROVIDER_EXECUTOR_IN_FLIGHT
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+import asyncio
+import functools
+
+
+class ProviderExecutor:
+    """Thread pool for the blocking provider SDK calls.
+
+    The Deepgram, DeepL and Azure SDKs are synchronous; called on the event
+    loop, each request stalls every other session of the worker for its
+    duration. ``in_flight`` counts calls submitted and not yet finished, so
+    ``saturation`` above 1 means calls are queueing for a thread.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.PROVIDER_EXECUTOR_WORKERS
+        self.in_flight = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def saturation(self) -> float:
+        return self.in_flight / self.max_workers
+
+    async def run(self, function: Callable, *args, **kwargs):
+        """Run ``function`` in the pool and wait for its result"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="provider")
+        loop = asyncio.get_running_loop()
+        # Only the event loop thread touches the counter
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+
+    def shutdown(self) -> None:
+        """Stop the threads; calls still running finish in the background"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+provider_executor = ProviderExecutor()
+PROVIDER_EXECUTOR_IN_FLIGHT.set_function(lambda: provider_executor.in_flight)
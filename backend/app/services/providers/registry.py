@@ -0,0 +1,85 @@
+from app.core.config import settings
+from app.core.database import get_supabase_client
+from app.services.offload import cpu_executor
+from typing import Dict, Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderRegistry:
+    """Provider services of the worker, created on first use.
+
+    The Deepgram, DeepL and Azure SDKs are only imported when a service is
+    first needed (or during warm-up), so importing the app and answering
+    /health does not pay for them.
+    """
+
+    def __init__(self):
+        self._stt = None
+        self._translation = None
+        self.warmed_up = False
+        self.warmup_timings: Dict[str, float] = {}
+
+    @property
+    def stt(self):
+        if self._stt is None:
+            from app.services.stt import DeepgramSTTService
+            self._stt = DeepgramSTTService()
+        return self._stt
+
+    @property
+    def translation(self):
+        if self._translation is None:
+            from app.services.translation import TranslationService
+            self._translation = TranslationService()
+        return self._translation
+
+    def override(self, stt=None, translation=None) -> None:
+        """Install replacement services (benchmarks, tests)"""
+        if stt is not None:
+            self._stt = stt
+        if translation is not None:
+            self._translation = translation
+
+    async def warm_up(self, timeout: Optional[float] = None) -> Dict[str, float]:
+        """Build the services and open provider connections ahead of traffic.
+
+        Each step runs in a thread because the SDK calls are synchronous. A step
+        that fails or times out is logged and skipped; the worker still becomes
+        ready and the connection is opened on first use instead.
+        """
+        timeout = settings.PROVIDER_WARMUP_TIMEOUT_SECONDS if timeout is None else timeout
+        steps = [
+            ("stt", lambda: self.stt),
+            ("translation", lambda: self.translation),
+            ("supabase", self._warm_supabase),
+            ("deepl", self._warm_deepl),
+            # Pool processes start on first use otherwise, delaying that login by their import time
+            ("cpu_pool", cpu_executor.warm_up),
+        ]
+        for name, step in steps:
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(asyncio.to_thread(step), timeout)
+            except Exception as e:
+                logger.warning("Warm-up step %s failed: %s", name, e or type(e).__name__)
+            self.warmup_timings[name] = round(time.perf_counter() - started, 4)
+        self.warmed_up = True
+        return self.warmup_timings
+
+    def _warm_supabase(self) -> None:
+        # One cheap query opens the HTTP connection pool and its TLS session
+        get_supabase_client().table("users").select("id").limit(1).execute()
+
+    def _warm_deepl(self) -> None:
+        # The usage endpoint is free to call and opens the DeepL session
+        deepl = getattr(self.translation, "deepl", None)
+        translator = getattr(deepl, "translator", None)
+        if hasattr(translator, "get_usage"):
+            translator.get_usage()
+
+
+providers = ProviderRegistry()
@@ -0,0 +1,15 @@
+from .recorder import (
+    SessionAudioRecorder,
+    AudioRecording,
+    RecordedFrame,
+    recording_directory,
+    shutdown_recorders,
+)
+
+__all__ = [
+    "SessionAudioRecorder",
+    "AudioRecording",
+    "RecordedFrame",
+    "recording_directory",
+    "shutdown_recorders",
+]
@@ -0,0 +1,214 @@
+from app.core.config import settings
+from app.core.metrics import AUDIO_RECORDED_BYTES
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional
+import bisect
+import logging
+import mmap
+import os
+import struct
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "index.bin"
+# One record per frame: segment number, byte offset in the segment, length, session audio timestamp
+INDEX_RECORD = struct.Struct("<IIId")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    # A single thread keeps each session's frames in arrival order
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(1, thread_name_prefix="audio-recorder")
+    return _executor
+
+
+def shutdown_recorders() -> None:
+    """Wait for queued frames to be written, then stop the writer thread"""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def recording_directory(session_id: int, root: Optional[str] = None) -> Path:
+    return Path(root or settings.AUDIO_RECORDING_PATH) / str(session_id)
+
+
+def _segment_path(directory: Path, number: int) -> Path:
+    return directory / f"{number:06d}.seg"
+
+
+def _read_index(directory: Path) -> List[tuple]:
+    path = directory / INDEX_NAME
+    if not path.exists():
+        return []
+    data = path.read_bytes()
+    # A crash can leave a partial last record; it has no frame behind it
+    usable = len(data) - len(data) % INDEX_RECORD.size
+    return list(INDEX_RECORD.iter_unpack(memoryview(data)[:usable]))
+
+
+class RecordedFrame(NamedTuple):
+    timestamp: float
+    data: memoryview
+
+
+class SessionAudioRecorder:
+    """Appends a session's audio frames to preallocated, memory-mapped segment files.
+
+    Frames are copied into the mapping on a background thread, so the event
+    loop only queues them. Each frame gets an index record pointing at its
+    bytes; a frame never spans two segments. Resuming a session continues
+    its existing recording.
+    """
+
+    def __init__(self, session_id: int, root: Optional[str] = None, segment_bytes: Optional[int] = None):
+        self.session_id = session_id
+        self.directory = recording_directory(session_id, root)
+        self.segment_bytes = segment_bytes or settings.AUDIO_RECORDING_SEGMENT_BYTES
+        self.failed = False
+        self._segment_number = 0
+        self._position = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._index_fd: Optional[int] = None
+
+    def append(self, data: bytes, timestamp: float) -> None:
+        """Queue a frame that starts at ``timestamp`` seconds of session audio"""
+        if not self.failed:
+            _get_executor().submit(self._write, data, timestamp).add_done_callback(self._check)
+
+    def close(self) -> Future:
+        """Finish the recording once queued frames are written"""
+        future = _get_executor().submit(self._close)
+        future.add_done_callback(self._check)
+        return future
+
+    def _check(self, future: Future) -> None:
+        error = future.exception()
+        if error is not None and not self.failed:
+            # Stop recording this session rather than fail on every frame
+            self.failed = True
+            logger.error("Audio recording failed: %s", error, extra={"session_id": self.session_id})
+
+    # The methods below run on the writer thread
+
+    def _open(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index = _read_index(self.directory)
+        if index:
+            segment, offset, length, _ = index[-1]
+            self._segment_number, self._position = segment, offset + length
+        self._map_segment(self.segment_bytes)
+        # Unbuffered: an index record reaches the file as soon as its frame is in the mapping
+        self._index_fd = os.open(self.directory / INDEX_NAME, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _map_segment(self, min_size: int) -> None:
+        fd = os.open(_segment_path(self.directory, self._segment_number), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            size = max(min_size, self.segment_bytes, os.fstat(fd).st_size)
+            if os.fstat(fd).st_size < size:
+                # Reserve the blocks up front so appends do not extend the file
+                if hasattr(os, "posix_fallocate"):
+                    os.posix_fallocate(fd, 0, size)
+                else:
+                    os.ftruncate(fd, size)
+            self._mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def _finish_segment(self) -> None:
+        self._mmap.flush()
+        self._mmap.close()
+        self._mmap = None
+        # Give back the unused preallocated tail
+        os.truncate(_segment_path(self.directory, self._segment_number), self._position)
+
+    def _write(self, data: bytes, timestamp: float) -> None:
+        if self.failed:
+            return
+        if self._mmap is None:
+            self._open()
+        if self._position + len(data) > len(self._mmap):
+            self._finish_segment()
+            self._segment_number += 1
+            self._position = 0
+            self._map_segment(len(data))
+
+        self._mmap[self._position:self._position + len(data)] = data
+        os.write(self._index_fd, INDEX_RECORD.pack(self._segment_number, self._position, len(data), timestamp))
+        self._position += len(data)
+        AUDIO_RECORDED_BYTES.inc(len(data))
+
+    def _close(self) -> None:
+        if self._mmap is not None:
+            self._finish_segment()
+        if self._index_fd is not None:
+            os.close(self._index_fd)
+            self._index_fd = None
+
+
+class AudioRecording:
+    """Read access to a session's recorded audio.
+
+    Segments are mapped read-only and frames are returned as ``memoryview``
+    slices of the mapping, so replay copies nothing. Views must be released
+    before ``close()``. Works on recordings still being written; frames
+    appended after opening are not visible.
+    """
+
+    def __init__(self, session_id: int, root: Optional[str] = None):
+        self.session_id = session_id
+        self.directory = recording_directory(session_id, root)
+        self.index = _read_index(self.directory)
+        self.timestamps = [timestamp for _, _, _, timestamp in self.index]
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._views: Dict[int, memoryview] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __enter__(self) -> "AudioRecording":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def size(self) -> int:
+        """Recorded bytes"""
+        return sum(length for _, _, length, _ in self.index)
+
+    def _segment(self, number: int) -> memoryview:
+        view = self._views.get(number)
+        if view is None:
+            with open(_segment_path(self.directory, number), "rb") as segment:
+                self._maps[number] = mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ)
+            view = self._views[number] = memoryview(self._maps[number])
+        return view
+
+    def frames(self, start: float = 0.0, end: Optional[float] = None) -> Iterator[RecordedFrame]:
+        """Frames covering ``start``..``end`` seconds of session audio, in order"""
+        first = bisect.bisect_left(self.timestamps, start)
+        if first > 0 and (first == len(self.timestamps) or self.timestamps[first] > start):
+            # Include the frame already playing at ``start``
+            _, _, length, timestamp = self.index[first - 1]
+            if timestamp + length / settings.AUDIO_STREAM_BYTES_PER_SECOND > start:
+                first -= 1
+        for segment, offset, length, timestamp in self.index[first:]:
+            if end is not None and timestamp >= end:
+                break
+            yield RecordedFrame(timestamp, self._segment(segment)[offset:offset + length])
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        for segment in self._maps.values():
+            segment.close()
+        self._views.clear()
+        self._maps.clear()
@@ -0,0 +1,22 @@
+from .session_service import SessionHistoryService, encode_cursor, decode_cursor
+from .search_service import TranscriptSearchService
+from .subtitles import iter_subtitles, SUBTITLE_MEDIA_TYPES
+from .export import batched, ndjson_page, EXPORT_PAGE_ROWS
+from .writer import SessionWriter, session_writer
+from .word_timings import WordTimings, NUMPY_AVAILABLE
+
+__all__ = [
+    "SessionHistoryService",
+    "TranscriptSearchService",
+    "encode_cursor",
+    "decode_cursor",
+    "iter_subtitles",
+    "SUBTITLE_MEDIA_TYPES",
+    "batched",
+    "ndjson_page",
+    "EXPORT_PAGE_ROWS",
+    "SessionWriter",
+    "session_writer",
+    "WordTimings",
+    "NUMPY_AVAILABLE",
+]
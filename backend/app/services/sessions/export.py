@@ -0,0 +1,21 @@
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+import json
+
+# Rows serialized per call to the CPU pool
+EXPORT_PAGE_ROWS = 500
+
+
+def batched(rows: Iterable[Dict], size: int = EXPORT_PAGE_ROWS) -> Iterator[List[Dict]]:
+    """Group rows into lists of ``size``"""
+    rows = iter(rows)
+    while True:
+        page = list(islice(rows, size))
+        if not page:
+            return
+        yield page
+
+
+def ndjson_page(rows: List[Dict]) -> bytes:
+    """Rows as newline-delimited JSON"""
+    return b"".join(json.dumps(row, ensure_ascii=False, default=str).encode() + b"\n" for row in rows)
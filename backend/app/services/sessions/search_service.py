@@ -0,0 +1,25 @@
+from app.core.database import Client
+from typing import List, Dict
+
+
+class TranscriptSearchService:
+    """Full-text search over a user's transcripts.
+
+    Matching, ranking and highlighting run inside Postgres through the
+    ``search_transcripts`` function (alembic revision 002), which uses the
+    GIN-indexed tsvector columns instead of scanning transcript text.
+    Only the hot table is searched; archived sessions are excluded.
+    """
+
+    def __init__(self, supabase: Client):
+        self.supabase = supabase
+
+    async def search(self, user_id: str, query: str, language: str, limit: int = 20) -> List[Dict]:
+        """Return the best matching transcripts, highest rank first"""
+        result = self.supabase.rpc("search_transcripts", {
+            "p_user_id": str(user_id),
+            "p_query": query,
+            "p_language": language,
+            "p_limit": limit,
+        }).execute()
+        return result.data or []
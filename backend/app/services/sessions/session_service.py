@@ -0,0 +1,171 @@
+from app.core.database import Client
+from app.services.archive import (
+    ArchiveStore,
+    get_archive_store,
+    iter_archived_transcripts,
+    read_archived_transcripts,
+)
+from .word_timings import WordTimings
+from typing import Optional, List, Dict, Iterator, Tuple
+import base64
+import binascii
+
+
+def encode_cursor(*parts: int) -> str:
+    """Encode keyset position into an opaque cursor string"""
+    raw = ":".join(str(part) for part in parts).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> Tuple[int, ...]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = tuple(int(part) for part in base64.urlsafe_b64decode(padded).decode().split(":"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if len(parts) != size:
+        raise ValueError("Invalid cursor")
+    return parts
+
+
+class SessionHistoryService:
+    """Read path for past sessions and their transcripts.
+
+    All listings use keyset pagination (``id < cursor`` / ``id > cursor``) so
+    every page is a single index range scan regardless of how deep the client
+    has paged. Sessions moved to cold storage (``metadata["archive"]``) are read
+    from their archive file through the same methods.
+    """
+
+    TRANSCRIPT_COLUMNS = (
+        "id, session_id, original_text, translated_text, source_language, "
+        "target_language, timestamp, end_timestamp, confidence, created_at"
+    )
+
+    def __init__(self, supabase: Client, archive_store: Optional[ArchiveStore] = None):
+        self.supabase = supabase
+        self._archive_store = archive_store
+
+    @property
+    def archive_store(self) -> ArchiveStore:
+        if self._archive_store is None:
+            self._archive_store = get_archive_store()
+        return self._archive_store
+
+    @staticmethod
+    def archive_manifest(session: Dict) -> Optional[Dict]:
+        """Archive manifest of a session, or None while its rows are in the hot table"""
+        return (session.get("metadata") or {}).get("archive")
+
+    async def get_session(self, session_id: int, user_id: str) -> Optional[Dict]:
+        """Get a session owned by the given user"""
+        result = (
+            self.supabase.table("sessions")
+            .select("*")
+            .eq("id", session_id)
+            .eq("user_id", str(user_id))
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def list_sessions(
+        self,
+        user_id: str,
+        limit: int,
+        before_id: Optional[int] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """List a user's sessions, newest first"""
+        query = self.supabase.table("sessions").select("*").eq("user_id", str(user_id))
+        if before_id is not None:
+            query = query.lt("id", before_id)
+
+        # Fetch one extra row to know whether another page exists
+        result = query.order("id", desc=True).limit(limit + 1).execute()
+        rows = result.data or []
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["id"])
+        return rows, next_cursor
+
+    async def list_transcripts(
+        self,
+        session: Dict,
+        limit: int,
+        after_id: Optional[int] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """List one page of a session's transcripts in chronological order"""
+        session_id = session["id"]
+        manifest = self.archive_manifest(session)
+        rows = []
+        if manifest:
+            rows = read_archived_transcripts(self.archive_store, manifest, limit + 1, after_id)
+            # Rows written after archival (a resumed session) are still in the hot table
+            after_id = max(after_id or 0, manifest.get("last_id") or 0)
+        if len(rows) <= limit:
+            rows += self._fetch_transcripts(session_id, limit + 1 - len(rows), after_id)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(session_id, rows[-1]["id"])
+        return rows, next_cursor
+
+    def iter_transcripts(self, session: Dict, batch_size: int = 500) -> Iterator[Dict]:
+        """Yield every transcript of a session, fetching one batch at a time.
+
+        This is a plain generator so it can back a StreamingResponse: only one
+        batch is held in memory no matter how long the session is.
+        """
+        session_id = session["id"]
+        manifest = self.archive_manifest(session)
+        after_id = None
+        if manifest:
+            yield from iter_archived_transcripts(self.archive_store, manifest, batch_size=batch_size)
+            after_id = manifest.get("last_id")
+
+        while True:
+            rows = self._fetch_transcripts(session_id, batch_size, after_id)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1]["id"]
+
+    def get_word_timings(self, session: Dict, batch_size: int = 500) -> WordTimings:
+        """Word timings of all of a session's transcripts, as one container"""
+        parts = []
+        after_id = None
+        manifest = self.archive_manifest(session)
+        if manifest:
+            rows = iter_archived_transcripts(
+                self.archive_store, manifest, batch_size=batch_size, columns=["id", "word_timings"]
+            )
+            parts.extend(WordTimings.from_bytes(row["word_timings"]) for row in rows if row.get("word_timings"))
+            after_id = manifest.get("last_id")
+
+        while True:
+            query = (
+                self.supabase.table("transcripts")
+                .select("id, word_timings")
+                .eq("session_id", session["id"])
+            )
+            if after_id is not None:
+                query = query.gt("id", after_id)
+            rows = query.order("id").limit(batch_size).execute().data or []
+            parts.extend(WordTimings.from_bytes(row["word_timings"]) for row in rows if row.get("word_timings"))
+            if len(rows) < batch_size:
+                return WordTimings.concat(parts)
+            after_id = rows[-1]["id"]
+
+    def _fetch_transcripts(self, session_id: int, limit: int, after_id: Optional[int]) -> List[Dict]:
+        query = (
+            self.supabase.table("transcripts")
+            .select(self.TRANSCRIPT_COLUMNS)
+            .eq("session_id", session_id)
+        )
+        if after_id is not None:
+            query = query.gt("id", after_id)
+        result = query.order("id").limit(limit).execute()
+        return result.data or []
@@ -0,0 +1,71 @@
+from typing import Iterable, Iterator, Dict, Optional
+
+SUBTITLE_MEDIA_TYPES = {
+    "srt": "application/x-subrip",
+    "vtt": "text/vtt",
+}
+
+TRACK_FIELDS = {
+    "original": "original_text",
+    "translated": "translated_text",
+}
+
+# Reading speed used to size cues for rows stored before end times were recorded
+SECONDS_PER_WORD = 0.4
+MIN_CUE_SECONDS = 1.0
+
+
+def format_timestamp(seconds: float, separator: str) -> str:
+    """Format seconds as HH:MM:SS<sep>mmm"""
+    millis = max(0, int(round(seconds * 1000)))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _cues(rows: Iterable[Dict], track: str) -> Iterator[tuple]:
+    """Yield (start, end, text) per transcript row, in order"""
+    field = TRACK_FIELDS[track]
+    previous_end = 0.0
+    for row in rows:
+        text = " ".join((row.get(field) or "").split())
+        if not text:
+            continue
+
+        start = row.get("timestamp") or 0.0
+        end: Optional[float] = row.get("end_timestamp")
+        if end is None or end <= start:
+            # Legacy rows have no timing: lay them out back to back
+            start = max(start, previous_end)
+            end = start + max(MIN_CUE_SECONDS, len(text.split()) * SECONDS_PER_WORD)
+
+        previous_end = end
+        yield start, end, text
+
+
+def iter_srt(rows: Iterable[Dict], track: str = "original") -> Iterator[str]:
+    """Yield SubRip cues one at a time"""
+    for index, (start, end, text) in enumerate(_cues(rows, track), start=1):
+        yield (
+            f"{index}\n"
+            f"{format_timestamp(start, ',')} --> {format_timestamp(end, ',')}\n"
+            f"{text}\n\n"
+        )
+
+
+def iter_vtt(rows: Iterable[Dict], track: str = "original") -> Iterator[str]:
+    """Yield a WebVTT header followed by one cue at a time"""
+    yield "WEBVTT\n\n"
+    for start, end, text in _cues(rows, track):
+        yield (
+            f"{format_timestamp(start, '.')} --> {format_timestamp(end, '.')}\n"
+            f"{text.replace('-->', '->')}\n\n"
+        )
+
+
+def iter_subtitles(rows: Iterable[Dict], subtitle_format: str, track: str) -> Iterator[str]:
+    """Dispatch to the SRT or WebVTT writer"""
+    if subtitle_format == "vtt":
+        return iter_vtt(rows, track)
+    return iter_srt(rows, track)
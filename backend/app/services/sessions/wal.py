@@ -0,0 +1,289 @@
+from app.core.config import settings
+from app.core.metrics import TRANSCRIPT_WAL_SYNC_SECONDS
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import base64
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Each record: payload length, crc32 of the payload, then the JSON payload
+RECORD_HEADER = struct.Struct("<II")
+# Replay position: segment number, byte offset in the segment
+CHECKPOINT = struct.Struct("<QQ")
+CHECKPOINT_NAME = "checkpoint"
+LOCK_NAME = "lock"
+
+Position = Tuple[int, int]
+
+
+def _default(value):
+    if isinstance(value, bytes):
+        return {"$bytes": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Cannot log {type(value).__name__}")
+
+
+def _object_hook(value: Dict):
+    if len(value) == 1 and "$bytes" in value:
+        return base64.b64decode(value["$bytes"])
+    return value
+
+
+def encode_record(row: Dict) -> bytes:
+    payload = json.dumps(row, default=_default, separators=(",", ":")).encode()
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _segment_path(directory: Path, number: int) -> Path:
+    return directory / f"{number:08d}.wal"
+
+
+def _lock(directory: Path) -> Optional[int]:
+    # The lock is held for the life of the process and released by the OS if it dies
+    directory.mkdir(parents=True, exist_ok=True)
+    fd = os.open(directory / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+    if FCNTL_AVAILABLE:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+    return fd
+
+
+class TranscriptLog:
+    """Append-only log of transcript rows in one directory, owned by one process.
+
+    Rows are appended to numbered segment files, rotated at
+    ``segment_bytes``. ``append`` returns once the row is on disk: appends
+    made while an fsync is running share the next one (group commit), so a
+    busy server issues one fsync per round trip to the disk, not one per
+    row. Each run appends to a new segment, never after a tail a crash may
+    have torn.
+
+    The checkpoint file holds the position up to which rows are stored in
+    the database; segments before it are deleted. It is advanced without
+    fsync, since replaying a row twice is harmless (rows carry a write_id).
+    """
+
+    def __init__(self, directory: Path, lock_fd: int, segment_bytes: Optional[int] = None):
+        self.directory = directory
+        self.segment_bytes = segment_bytes or settings.TRANSCRIPT_WAL_SEGMENT_BYTES
+        self.cursor = self._read_checkpoint()
+        self.failed = False
+        # End of the rows known to be on disk; None for logs adopted from a stopped process
+        self.synced: Optional[Position] = None
+        self._lock_fd = lock_fd
+        self._fd: Optional[int] = None
+        self._segment = 0
+        self._position = 0
+        self._new_segment = False
+        self._retired: List[int] = []
+        self._waiters: List[asyncio.Future] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def _read_checkpoint(self) -> Position:
+        try:
+            return CHECKPOINT.unpack((self.directory / CHECKPOINT_NAME).read_bytes())
+        except (FileNotFoundError, struct.error):
+            return (0, 0)
+
+    def segments(self) -> List[int]:
+        return sorted(int(path.stem) for path in self.directory.glob("*.wal") if path.stem.isdigit())
+
+    # Appending (event loop)
+
+    def open_for_append(self) -> None:
+        self._segment = max(self.segments() + [self.cursor[0]]) + 1
+        self._open_segment()
+        self.synced = (self._segment, 0)
+
+    def _open_segment(self) -> None:
+        self._fd = os.open(_segment_path(self.directory, self._segment), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._position = 0
+        self._new_segment = True
+
+    async def append(self, row: Dict) -> None:
+        """Append a row and wait until it is on disk"""
+        if self.failed or self._fd is None:
+            raise OSError("Transcript log is not writable")
+        record = encode_record(row)
+        if self._position and self._position + len(record) > self.segment_bytes:
+            self._retired.append(self._fd)
+            self._segment += 1
+            self._open_segment()
+
+        # A page cache write; the fsync happens on a thread
+        written = os.write(self._fd, record)
+        if written != len(record):
+            self.failed = True
+            raise OSError(f"Short write to transcript log ({written} of {len(record)} bytes)")
+        self._position += written
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._wake.set()
+        await waiter
+
+    def _fsync(self, fds: List[int], new_segment: bool) -> None:
+        for fd in fds:
+            os.fsync(fd)
+        if new_segment:
+            # Make the new segment's directory entry durable too
+            directory_fd = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(directory_fd)
+            finally:
+                os.close(directory_fd)
+
+    async def _sync(self) -> None:
+        waiters, self._waiters = self._waiters, []
+        retired, self._retired = self._retired, []
+        new_segment, self._new_segment = self._new_segment, False
+        position = (self._segment, self._position)
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self._fsync, [*retired, self._fd], new_segment)
+        except Exception as e:
+            # Whether the rows reached the disk is unknown after a failed fsync; stop using the log
+            self.failed = True
+            logger.exception("Transcript log fsync failed", extra={"directory": str(self.directory)})
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            return
+        finally:
+            for fd in retired:
+                os.close(fd)
+
+        TRANSCRIPT_WAL_SYNC_SECONDS.observe(time.perf_counter() - started)
+        self.synced = position
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            await self._sync()
+
+    def start(self) -> None:
+        if self._fd is not None and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._sync_loop())
+
+    async def close(self) -> None:
+        """Sync pending appends, close the files and release the directory"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._fd is not None:
+            if self._waiters and not self.failed:
+                await self._sync()
+            for fd in [*self._retired, self._fd]:
+                os.close(fd)
+            self._retired, self._fd = [], None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    # Replay (called on a thread)
+
+    def read(self, limit: int) -> Tuple[List[Dict], Position]:
+        """Up to ``limit`` rows after the checkpoint, and the position after them"""
+        rows: List[Dict] = []
+        segment, offset = self.cursor
+        end = self.synced
+        segments = self.segments()
+        while len(rows) < limit:
+            path = _segment_path(self.directory, segment)
+            stop = end[1] if end is not None and segment == end[0] else None
+            size = 0
+            if path.exists():
+                with open(path, "rb") as file:
+                    size = os.fstat(file.fileno()).st_size
+                    file.seek(offset)
+                    while len(rows) < limit and (stop is None or offset < stop):
+                        header = file.read(RECORD_HEADER.size)
+                        if len(header) < RECORD_HEADER.size:
+                            break
+                        length, checksum = RECORD_HEADER.unpack(header)
+                        payload = file.read(length)
+                        if len(payload) < length or zlib.crc32(payload) != checksum:
+                            break
+                        rows.append(json.loads(payload, object_hook=_object_hook))
+                        offset += RECORD_HEADER.size + length
+
+            if len(rows) >= limit or stop is not None:
+                break
+            later = [number for number in segments if number > segment]
+            if not later:
+                break
+            if offset < size:
+                # Torn by a crash mid-append; nothing after it was acknowledged
+                logger.warning(
+                    "Skipping damaged transcript log tail",
+                    extra={"segment": str(path), "bytes": size - offset},
+                )
+            segment, offset = later[0], 0
+        return rows, (segment, offset)
+
+    def commit(self, position: Position) -> None:
+        """Record that rows up to ``position`` are stored and delete replayed segments"""
+        temporary = self.directory / (CHECKPOINT_NAME + ".tmp")
+        temporary.write_bytes(CHECKPOINT.pack(*position))
+        os.replace(temporary, self.directory / CHECKPOINT_NAME)
+        self.cursor = position
+        for number in self.segments():
+            if number < position[0]:
+                _segment_path(self.directory, number).unlink(missing_ok=True)
+
+
+def open_transcript_logs(root: Optional[str] = None) -> Tuple[TranscriptLog, List[TranscriptLog]]:
+    """Claim a log directory for this process, and adopt those of stopped processes.
+
+    Each server worker appends to its own numbered directory under ``root``,
+    held with a file lock. Directories whose lock is free belong to workers
+    that are gone; their rows are replayed by whichever worker takes them.
+    Without fcntl (Windows) there is no locking, so run a single worker.
+    """
+    root_path = Path(root or settings.TRANSCRIPT_WAL_PATH)
+    root_path.mkdir(parents=True, exist_ok=True)
+    numbers = sorted(int(path.name) for path in root_path.iterdir() if path.is_dir() and path.name.isdigit())
+
+    logs: List[TranscriptLog] = []
+    for number in numbers:
+        lock_fd = _lock(root_path / str(number))
+        if lock_fd is not None:
+            logs.append(TranscriptLog(root_path / str(number), lock_fd))
+            if not FCNTL_AVAILABLE:
+                break
+
+    number = max(numbers, default=-1) + 1
+    while not logs:
+        # Another worker starting at the same time may take the number first
+        lock_fd = _lock(root_path / str(number))
+        if lock_fd is not None:
+            logs.append(TranscriptLog(root_path / str(number), lock_fd))
+        number += 1
+
+    own, adopted = logs[0], logs[1:]
+    own.open_for_append()
+    return own, adopted
@@ -0,0 +1,171 @@
+from array import array
+from typing import Iterable, List, Optional, Union
+import bisect
+import itertools
+import struct
+import sys
+
+# NumPy is optional - queries fall back to plain loops over the arrays
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+# Below this many words NumPy's call overhead outweighs the loop it replaces
+NUMPY_MIN_WORDS = 256
+
+FORMAT_VERSION = 1
+# Version and word count, followed by starts, ends, confidences, text offsets (in characters)
+# and the UTF-8 text
+HEADER = struct.Struct("<BI")
+# Text offsets and word indexes are 4-byte unsigned integers; the C type behind each
+# array type code varies by platform, so pick the one that is 4 bytes here
+UINT32 = next(typecode for typecode in ("I", "L") if array(typecode).itemsize == 4)
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(typecode: str, data: memoryview, position: int, count: int):
+    values = array(typecode)
+    end = position + values.itemsize * count
+    values.frombytes(data[position:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, end
+
+
+class WordTimings:
+    """Word-level timings of one transcript as parallel typed arrays.
+
+    Takes a fraction of the memory of one dict per word and serializes to a
+    compact binary form for the ``transcripts.word_timings`` column. Words
+    are in time order, as providers return them.
+    """
+
+    __slots__ = ("starts", "ends", "confidences", "_text", "_offsets")
+
+    def __init__(self, starts: array, ends: array, confidences: array, text: str, offsets: array):
+        self.starts = starts  # Seconds, array("d")
+        self.ends = ends  # Seconds, array("d")
+        self.confidences = confidences  # array("f")
+        self._text = text  # All words back to back
+        self._offsets = offsets  # Offset of each word in _text, plus the end, array(UINT32)
+
+    @classmethod
+    def from_words(cls, words: Iterable) -> "WordTimings":
+        """Build from provider word objects (``word``, ``start``, ``end``, ``confidence`` attributes)"""
+        words = list(words)
+        tokens = [word.word for word in words]
+        return cls(
+            array("d", [word.start for word in words]),
+            array("d", [word.end for word in words]),
+            array("f", [word.confidence or 0.0 for word in words]),
+            "".join(tokens),
+            array(UINT32, itertools.accumulate(map(len, tokens), initial=0)),
+        )
+
+    @classmethod
+    def concat(cls, parts: Iterable["WordTimings"]) -> "WordTimings":
+        """One container for several transcripts, e.g. a whole session"""
+        starts, ends, confidences = array("d"), array("d"), array("f")
+        offsets = array(UINT32, [0])
+        texts = []
+        for part in parts:
+            starts.extend(part.starts)
+            ends.extend(part.ends)
+            confidences.extend(part.confidences)
+            base = offsets[-1]
+            offsets.extend(base + offset for offset in part._offsets[1:])
+            texts.append(part._text)
+        return cls(starts, ends, confidences, "".join(texts), offsets)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __repr__(self) -> str:
+        return f"WordTimings({len(self)} words)"
+
+    @property
+    def start(self) -> float:
+        """Start of the first word"""
+        return self.starts[0]
+
+    @property
+    def end(self) -> float:
+        """End of the last word"""
+        return self.ends[-1]
+
+    def word(self, index: int) -> str:
+        return self._text[self._offsets[index]:self._offsets[index + 1]]
+
+    def words(self, indexes: Optional[Iterable[int]] = None) -> List[str]:
+        """The words at ``indexes`` (all words by default)"""
+        return [self.word(index) for index in (range(len(self)) if indexes is None else indexes)]
+
+    def sliced(self, start: int, end: Optional[int] = None) -> "WordTimings":
+        """Copy of the words ``start``..``end``, like a list slice"""
+        start, end, _ = slice(start, end).indices(len(self))
+        end = max(start, end)
+        base = self._offsets[start]
+        return WordTimings(
+            self.starts[start:end],
+            self.ends[start:end],
+            self.confidences[start:end],
+            self._text[base:self._offsets[end]],
+            array(UINT32, [offset - base for offset in self._offsets[start:end + 1]]),
+        )
+
+    def shifted(self, offset: float) -> "WordTimings":
+        """Copy with every time moved by ``offset`` seconds (chunk-relative to session-relative)"""
+        if NUMPY_AVAILABLE and len(self) >= NUMPY_MIN_WORDS:
+            starts = array("d", (np.frombuffer(self.starts, dtype=np.float64) + offset).tobytes())
+            ends = array("d", (np.frombuffer(self.ends, dtype=np.float64) + offset).tobytes())
+        else:
+            starts = array("d", [start + offset for start in self.starts])
+            ends = array("d", [end + offset for end in self.ends])
+        return WordTimings(starts, ends, self.confidences, self._text, self._offsets)
+
+    def below_confidence(self, threshold: float) -> array:
+        """Indexes of words with confidence below ``threshold``"""
+        if NUMPY_AVAILABLE and len(self) >= NUMPY_MIN_WORDS:
+            confidences = np.frombuffer(self.confidences, dtype=np.float32)
+            return array(UINT32, np.flatnonzero(confidences < threshold).astype(np.uint32).tobytes())
+        return array(UINT32, [index for index, value in enumerate(self.confidences) if value < threshold])
+
+    def in_range(self, start: float, end: float) -> range:
+        """Indexes of words overlapping ``start``..``end`` seconds"""
+        # Word ends are sorted like starts, so both bounds are binary searches
+        return range(bisect.bisect_right(self.ends, start), bisect.bisect_left(self.starts, end))
+
+    def to_bytes(self) -> bytes:
+        return b"".join((
+            HEADER.pack(FORMAT_VERSION, len(self)),
+            _little_endian(self.starts),
+            _little_endian(self.ends),
+            _little_endian(self.confidences),
+            _little_endian(self._offsets),
+            self._text.encode(),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, memoryview, str]) -> "WordTimings":
+        """Decode ``to_bytes`` output; also accepts PostgREST's ``\\x``-hex form of a bytea"""
+        if isinstance(data, str):
+            data = bytes.fromhex(data[2:] if data.startswith("\\x") else data)
+        data = memoryview(data)
+        version, count = HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported word timings format {version}")
+        position = HEADER.size
+        starts, position = _read_array("d", data, position, count)
+        ends, position = _read_array("d", data, position, count)
+        confidences, position = _read_array("f", data, position, count)
+        offsets, position = _read_array(UINT32, data, position, count + 1)
+        return cls(starts, ends, confidences, str(data[position:], "utf-8"), offsets)
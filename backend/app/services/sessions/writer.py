@@ -0,0 +1,344 @@
+from app.core.config import settings
+from app.core.database import get_supabase_client, get_pg_pool
+from app.core.metrics import TRANSCRIPT_INSERT_SECONDS, TRANSCRIPT_ROWS_WRITTEN, PROVIDER_ERRORS
+from .wal import TranscriptLog, open_transcript_logs
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+import asyncio
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPT_COLUMNS = (
+    "session_id",
+    "original_text",
+    "translated_text",
+    "source_language",
+    "target_language",
+    "timestamp",
+    "end_timestamp",
+    "confidence",
+    "word_timings",
+    "write_id",
+    "created_at",
+)
+
+_COLUMN_LIST = ", ".join(TRANSCRIPT_COLUMNS)
+
+# COPY cannot skip duplicates, so rows are copied into a session-local table
+# and moved over with ON CONFLICT; replaying the transcript log is then idempotent
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS transcripts_incoming ON COMMIT DELETE ROWS
+AS SELECT {_COLUMN_LIST} FROM transcripts WITH NO DATA
+"""
+
+INSERT_STAGED_SQL = f"""
+INSERT INTO transcripts ({_COLUMN_LIST})
+SELECT {_COLUMN_LIST} FROM transcripts_incoming
+ON CONFLICT (write_id) DO NOTHING
+"""
+
+INSERT_SESSION_SQL = """
+INSERT INTO sessions (user_id, source_language, target_language, started_at, created_at, metadata)
+VALUES ($1, $2, $3, $4, $4, $5)
+RETURNING *
+"""
+
+END_SESSIONS_SQL = "UPDATE sessions SET ended_at = $2 WHERE id = ANY($1::int[])"
+
+SET_METADATA_SQL = "UPDATE sessions SET metadata = $2 WHERE id = $1"
+
+# Sessions whose last segment end is remembered for a resume
+SESSION_ENDS_MAX = 10_000
+
+
+def _timestamp(value) -> datetime:
+    # Naive UTC, like the ISO strings sent to PostgREST; asyncpg rejects aware
+    # datetimes for "timestamp" columns and reads naive ones as UTC for "timestamptz"
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _record_to_dict(record) -> Dict:
+    # Same value types as PostgREST returns: strings for UUIDs and timestamps
+    row = {}
+    for key, value in record.items():
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        row[key] = value
+    return row
+
+
+def _postgrest_row(row: Dict) -> Dict:
+    # bytea goes over JSON in Postgres' hex format
+    if isinstance(row.get("word_timings"), bytes):
+        row = {**row, "word_timings": "\\x" + row["word_timings"].hex()}
+    return row
+
+
+async def copy_transcripts(connection, rows: List[Dict]) -> None:
+    """Write transcript rows with one COPY, skipping write_ids already stored"""
+    records = [
+        tuple(_timestamp(row["created_at"]) if column == "created_at" else row.get(column) for column in TRANSCRIPT_COLUMNS)
+        for row in rows
+    ]
+    async with connection.transaction():
+        await connection.execute(CREATE_STAGING_SQL)
+        await connection.copy_records_to_table("transcripts_incoming", records=records, columns=TRANSCRIPT_COLUMNS)
+        await connection.execute(INSERT_STAGED_SQL)
+
+
+class SessionWriter:
+    """Write path for sessions and transcripts.
+
+    Uses the asyncpg pool when DATABASE_URL is configured (statements are
+    prepared once per connection) and PostgREST otherwise, or when a direct
+    write fails. Transcript rows are buffered and a background task writes
+    them in batches - with COPY over asyncpg, as one multi-row insert over
+    PostgREST - so the audio path never waits on the database.
+
+    With TRANSCRIPT_WAL_ENABLED the buffer is a local transcript log:
+    ``add_transcript`` returns once the row is on disk, and the background
+    task replays the log to the database, retrying with backoff while it
+    fails. Rows survive a database outage and a restart of the server.
+    Each row gets a write_id, so rows written twice (a crash between the
+    write and the checkpoint) are stored once.
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None, batch_size: Optional[int] = None):
+        self.flush_interval = flush_interval or settings.TRANSCRIPT_FLUSH_INTERVAL_SECONDS
+        self.batch_size = batch_size or settings.TRANSCRIPT_BATCH_SIZE
+        self.pending: List[Dict] = []
+        self.log: Optional[TranscriptLog] = None
+        self._adopted: List[TranscriptLog] = []
+        self._logged = 0
+        self._retry_delay = 0.0
+        self._task: Optional[asyncio.Task] = None
+        # Early flushes of full batches; the loop only keeps weak references to tasks
+        self._flushes: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        # End of the last segment added per session, most recently written last
+        self._session_ends: "OrderedDict[int, float]" = OrderedDict()
+
+    async def create_session(self, user_id: str, source_language: str, target_language: str,
+                             metadata: Optional[Dict] = None) -> Optional[Dict]:
+        """Insert a session and return its row"""
+        started_at = datetime.utcnow()
+        pool = get_pg_pool()
+        if pool is not None:
+            try:
+                record = await pool.fetchrow(
+                    INSERT_SESSION_SQL, user_id, source_language, target_language, started_at, metadata
+                )
+                return _record_to_dict(record)
+            except Exception as e:
+                PROVIDER_ERRORS.labels("postgres", "create_session").inc()
+                logger.warning("Postgres session insert failed, using PostgREST: %s", e)
+
+        session_data = {
+            "user_id": user_id,
+            "source_language": source_language,
+            "target_language": target_language,
+            "started_at": started_at.isoformat(),
+            "created_at": started_at.isoformat(),
+        }
+        if metadata is not None:
+            session_data["metadata"] = metadata
+        result = get_supabase_client().table("sessions").insert(session_data).execute()
+        return result.data[0] if result.data else None
+
+    async def set_metadata(self, session_id: int, metadata: Dict) -> None:
+        """Replace a session's metadata"""
+        pool = get_pg_pool()
+        if pool is not None:
+            try:
+                await pool.execute(SET_METADATA_SQL, session_id, metadata)
+                return
+            except Exception as e:
+                PROVIDER_ERRORS.labels("postgres", "set_metadata").inc()
+                logger.warning("Postgres session update failed, using PostgREST: %s", e)
+
+        get_supabase_client().table("sessions").update({"metadata": metadata}).eq("id", session_id).execute()
+
+    async def end_sessions(self, session_ids: List[int]) -> None:
+        """Set ended_at on sessions with one statement"""
+        if not session_ids:
+            return
+        ended_at = datetime.utcnow()
+        pool = get_pg_pool()
+        if pool is not None:
+            try:
+                await pool.execute(END_SESSIONS_SQL, list(session_ids), ended_at)
+                return
+            except Exception as e:
+                PROVIDER_ERRORS.labels("postgres", "end_sessions").inc()
+                logger.warning("Postgres session update failed, using PostgREST: %s", e)
+
+        get_supabase_client().table("sessions").update({
+            "ended_at": ended_at.isoformat()
+        }).in_("id", list(session_ids)).execute()
+
+    def latest_end(self, session_id: int) -> Optional[float]:
+        """End of the last segment this worker queued for a session, written or not"""
+        return self._session_ends.get(session_id)
+
+    def _remember_end(self, row: Dict) -> None:
+        end = row.get("end_timestamp") or row.get("timestamp")
+        if end is None:
+            return
+        session_id = row["session_id"]
+        self._session_ends[session_id] = max(end, self._session_ends.get(session_id, end))
+        self._session_ends.move_to_end(session_id)
+        if len(self._session_ends) > SESSION_ENDS_MAX:
+            self._session_ends.popitem(last=False)
+
+    async def add_transcript(self, row: Dict) -> None:
+        """Queue a transcript row for the next batch; returns once it is in the transcript log"""
+        row = {"write_id": str(uuid.uuid4()), **row}
+        self._remember_end(row)
+        if self.log is not None and not self.log.failed:
+            try:
+                await self.log.append(row)
+                self._logged += 1
+                if self._logged >= self.batch_size and self._task is not None:
+                    self._logged = 0
+                    self._flush_soon()
+                return
+            except Exception:
+                # Possibly written to the log as well; the write_id keeps it from being stored twice
+                logger.exception("Transcript log append failed, buffering in memory")
+
+        self.pending.append(row)
+        if len(self.pending) >= self.batch_size and self._task is not None:
+            # Full batch: write it now rather than at the next tick
+            self._flush_soon()
+
+    def _flush_soon(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> int:
+        """Write all logged and queued rows; returns how many were written"""
+        async with self._lock:
+            written = 0
+            try:
+                for log in [*self._adopted, *([self.log] if self.log is not None else [])]:
+                    written += await self._replay(log)
+            except Exception:
+                logger.exception("Transcript log replay failed")
+                self._back_off()
+                return written
+
+            while self.pending:
+                batch = self.pending[:self.batch_size]
+                del self.pending[:len(batch)]
+                try:
+                    await self._write_batch(batch)
+                except Exception:
+                    logger.exception("Transcript batch write failed", extra={"rows": len(batch)})
+                    self._requeue(batch)
+                    self._back_off()
+                    break
+                written += len(batch)
+            else:
+                self._retry_delay = 0.0
+            return written
+
+    async def _replay(self, log: TranscriptLog) -> int:
+        # Write the log's rows after its checkpoint in batches, advancing the checkpoint after each
+        written = 0
+        while True:
+            batch, position = await asyncio.to_thread(log.read, self.batch_size)
+            if batch:
+                await self._write_batch(batch)
+                written += len(batch)
+            if position != log.cursor:
+                await asyncio.to_thread(log.commit, position)
+            if len(batch) < self.batch_size:
+                break
+
+        if log is not self.log:
+            # Adopted from a stopped worker and now empty
+            self._adopted.remove(log)
+            await log.close()
+            logger.info("Replayed adopted transcript log", extra={"directory": str(log.directory)})
+        return written
+
+    def _back_off(self) -> None:
+        # The database is down or failing: retry less often, up to the maximum delay
+        self._retry_delay = min(
+            max(1.0, self._retry_delay * 2),
+            settings.TRANSCRIPT_WAL_MAX_RETRY_SECONDS,
+        )
+
+    def _requeue(self, batch: List[Dict]) -> None:
+        # Keep the rows for the next flush, dropping the oldest past the buffer limit
+        self.pending[:0] = batch
+        overflow = len(self.pending) - settings.TRANSCRIPT_BUFFER_MAX_ROWS
+        if overflow > 0:
+            del self.pending[:overflow]
+            logger.error("Dropped transcript rows, write buffer full", extra={"rows": overflow})
+
+    async def _write_batch(self, batch: List[Dict]) -> None:
+        started = time.perf_counter()
+        pool = get_pg_pool()
+        if pool is not None:
+            try:
+                async with pool.acquire() as connection:
+                    await copy_transcripts(connection, batch)
+                TRANSCRIPT_INSERT_SECONDS.observe(time.perf_counter() - started)
+                TRANSCRIPT_ROWS_WRITTEN.labels("copy").inc(len(batch))
+                return
+            except Exception as e:
+                PROVIDER_ERRORS.labels("postgres", "copy_transcripts").inc()
+                logger.warning("Transcript COPY failed, using PostgREST: %s", e)
+
+        get_supabase_client().table("transcripts").upsert(
+            [_postgrest_row(row) for row in batch], on_conflict="write_id", ignore_duplicates=True
+        ).execute()
+        TRANSCRIPT_INSERT_SECONDS.observe(time.perf_counter() - started)
+        TRANSCRIPT_ROWS_WRITTEN.labels("postgrest").inc(len(batch))
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(max(self.flush_interval, self._retry_delay))
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Transcript flush loop error")
+
+    def start(self) -> None:
+        """Open the transcript log and start the periodic flush task"""
+        if settings.TRANSCRIPT_WAL_ENABLED and self.log is None:
+            try:
+                self.log, self._adopted = open_transcript_logs()
+                self.log.start()
+            except Exception:
+                logger.exception("Transcript log unavailable, buffering transcripts in memory")
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write out what is still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
+        # Rows still in the logs are replayed by the next start
+        for log in [*self._adopted, *([self.log] if self.log is not None else [])]:
+            await log.close()
+        self.log, self._adopted = None, []
+
+
+session_writer = SessionWriter()
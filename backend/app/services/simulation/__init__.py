@@ -0,0 +1,18 @@
+from .profiles import ProviderProfile, DEFAULT_PROFILES, load_profiles
+from .simulator import ProviderSimulator, SimulatedProviderError, get_simulator, simulation_stats
+from .clients import SimulatedDeepgramClient, SimulatedDeepLTranslator, SimulatedAzureTranslator
+from .supabase import SimulatedSupabase
+
+__all__ = [
+    "ProviderProfile",
+    "DEFAULT_PROFILES",
+    "load_profiles",
+    "ProviderSimulator",
+    "SimulatedProviderError",
+    "get_simulator",
+    "simulation_stats",
+    "SimulatedDeepgramClient",
+    "SimulatedDeepLTranslator",
+    "SimulatedAzureTranslator",
+    "SimulatedSupabase",
+]
@@ -0,0 +1,80 @@
+from .simulator import get_simulator
+from deepgram import PrerecordedResponse
+from types import SimpleNamespace
+from typing import List
+
+# 16 kHz mono 16-bit PCM, the format the frontend streams
+AUDIO_BYTES_PER_SECOND = 32000
+
+PHRASES = {
+    "en": ["please confirm the meeting tomorrow morning", "the invoice was paid last week"],
+    "es": ["por favor confirme la reunión de mañana", "la factura se pagó la semana pasada"],
+}
+
+
+class _DeepgramRest:
+    def __init__(self):
+        self.simulator = get_simulator("deepgram")
+        self._counter = 0
+
+    def transcribe_file(self, payload, options):
+        self.simulator.call("transcribe")
+        duration = len(payload.get("buffer") or b"") / AUDIO_BYTES_PER_SECOND
+        language = getattr(options, "language", None) or "en"
+        phrases = PHRASES.get(language, PHRASES["en"])
+        self._counter += 1
+        text = phrases[self._counter % len(phrases)]
+        tokens = text.split()
+        step = duration / len(tokens) if duration else 0.0
+        words = [
+            {
+                "word": token,
+                "start": round(index * step, 3),
+                "end": round((index + 1) * step, 3),
+                "confidence": 0.95,
+                "punctuated_word": token,
+            }
+            for index, token in enumerate(tokens)
+        ]
+        return PrerecordedResponse.from_dict({
+            "metadata": {
+                "transaction_key": "", "request_id": "simulated", "sha256": "", "created": "",
+                "duration": duration, "channels": 1, "models": [], "model_info": {},
+            },
+            "results": {
+                "channels": [{"alternatives": [{"transcript": text, "confidence": 0.95, "words": words}]}]
+            },
+        })
+
+
+class SimulatedDeepgramClient:
+    """Stands in for ``DeepgramClient``; only the prerecorded REST API is used"""
+
+    def __init__(self):
+        rest = _DeepgramRest()
+        self.listen = SimpleNamespace(rest=SimpleNamespace(v=lambda version: rest))
+
+
+class SimulatedDeepLTranslator:
+    """Stands in for ``deepl.Translator``"""
+
+    def __init__(self):
+        self.simulator = get_simulator("deepl")
+
+    def translate_text(self, text: str, source_lang: str = None, target_lang: str = None, **kwargs):
+        self.simulator.call("translate")
+        return SimpleNamespace(text=f"[{target_lang}] {text}", detected_source_lang=source_lang)
+
+
+class SimulatedAzureTranslator:
+    """Stands in for the Azure ``TranslatorClient``"""
+
+    def __init__(self):
+        self.simulator = get_simulator("azure")
+
+    def translate(self, content: List[str], to: List[str], from_parameter: str = None, **kwargs):
+        self.simulator.call("translate")
+        return [
+            SimpleNamespace(translations=[SimpleNamespace(text=f"[{to[0]}] {text}", to=to[0])])
+            for text in content
+        ]
@@ -0,0 +1,40 @@
+from typing import Dict, NamedTuple, Optional
+import json
+
+
+class ProviderProfile(NamedTuple):
+    """Behaviour of one simulated provider"""
+    latency_ms: float = 0.0  # Median latency
+    latency_p95_ms: Optional[float] = None  # Log-normal tail; None for a fixed latency
+    error_rate: float = 0.0  # Share of calls that fail
+    max_concurrency: Optional[int] = None  # Calls beyond this are rejected
+    rate_per_second: Optional[float] = None  # Sustained request rate before throttling
+
+
+# Rough figures for hosted providers; override them with SIMULATION_PROFILE
+DEFAULT_PROFILES: Dict[str, ProviderProfile] = {
+    "deepgram": ProviderProfile(latency_ms=250, latency_p95_ms=600, error_rate=0.002, max_concurrency=100),
+    "deepl": ProviderProfile(latency_ms=120, latency_p95_ms=350, error_rate=0.002, rate_per_second=50),
+    "azure": ProviderProfile(latency_ms=150, latency_p95_ms=400, error_rate=0.002),
+    "supabase": ProviderProfile(latency_ms=8, latency_p95_ms=30),
+}
+
+
+def load_profiles(path: Optional[str] = None) -> Dict[str, ProviderProfile]:
+    """Default profiles, with fields overridden from a JSON file if given.
+
+    The file maps provider names to partial profiles, e.g.
+    ``{"deepgram": {"latency_ms": 400, "error_rate": 0.05}}``.
+    """
+    profiles = dict(DEFAULT_PROFILES)
+    if not path:
+        return profiles
+
+    with open(path) as source:
+        overrides = json.load(source)
+    for name, fields in overrides.items():
+        unknown = set(fields) - set(ProviderProfile._fields)
+        if unknown:
+            raise ValueError(f"Unknown simulation profile fields for {name}: {', '.join(sorted(unknown))}")
+        profiles[name] = profiles.get(name, ProviderProfile())._replace(**fields)
+    return profiles
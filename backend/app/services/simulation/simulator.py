@@ -0,0 +1,121 @@
+from app.core.config import settings
+from app.core.metrics import SIMULATED_PROVIDER_CALLS
+from app.core.ratelimit import RateLimit, TokenBucketLimiter
+from .profiles import ProviderProfile, load_profiles
+from typing import Dict, Optional, Tuple
+import math
+import random
+import threading
+import time
+import zlib
+
+# z-score of the 95th percentile of a standard normal distribution
+_Z95 = 1.6448536269514722
+
+
+class SimulatedProviderError(Exception):
+    """A simulated provider failure (error, throttling or saturation)"""
+
+    def __init__(self, provider: str, reason: str):
+        super().__init__(f"Simulated {provider} {reason}")
+        self.provider = provider
+        self.reason = reason
+
+
+class ProviderSimulator:
+    """Latency, throughput limits and failures of one provider.
+
+    ``call`` blocks the calling thread like the synchronous provider SDKs do,
+    so the simulation loads the event loop the same way real calls would.
+    """
+
+    def __init__(self, name: str, profile: ProviderProfile, seed: Optional[int] = None):
+        self.name = name
+        self.profile = profile
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._limiter = TokenBucketLimiter() if profile.rate_per_second else None
+        self._rate_limit = (
+            RateLimit(profile.rate_per_second, profile.rate_per_second) if profile.rate_per_second else None
+        )
+        self._counters: Dict[Tuple[str, str], object] = {}
+
+        self._mu = math.log(profile.latency_ms) if profile.latency_ms > 0 else None
+        self._sigma = 0.0
+        if self._mu is not None and profile.latency_p95_ms and profile.latency_p95_ms > profile.latency_ms:
+            self._sigma = (math.log(profile.latency_p95_ms) - self._mu) / _Z95
+
+    def sample_latency(self) -> float:
+        """Seconds for one call"""
+        if self._mu is None:
+            return 0.0
+        if not self._sigma:
+            return self.profile.latency_ms / 1000
+        return self._random.lognormvariate(self._mu, self._sigma) / 1000
+
+    def _record(self, operation: str, outcome: str) -> None:
+        key = (operation, outcome)
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = SIMULATED_PROVIDER_CALLS.labels(self.name, operation, outcome)
+        counter.inc()
+
+    @property
+    def calls(self) -> Dict[str, int]:
+        """Call counts keyed by ``operation:outcome``"""
+        return {
+            f"{operation}:{outcome}": int(counter.value())
+            for (operation, outcome), counter in list(self._counters.items())
+        }
+
+    def call(self, operation: str) -> None:
+        """Simulate one request; raises SimulatedProviderError when it fails"""
+        profile = self.profile
+        with self._lock:
+            if self._limiter is not None and self._limiter.hit_nowait(self.name, self._rate_limit) > 0:
+                throttled = "throttled"
+            elif profile.max_concurrency is not None and self._in_flight >= profile.max_concurrency:
+                throttled = "saturated"
+            else:
+                throttled = None
+                self._in_flight += 1
+        if throttled:
+            self._record(operation, throttled)
+            raise SimulatedProviderError(self.name, throttled)
+
+        try:
+            latency = self.sample_latency()
+            if latency > 0:
+                time.sleep(latency)
+            failed = profile.error_rate > 0 and self._random.random() < profile.error_rate
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        if failed:
+            self._record(operation, "error")
+            raise SimulatedProviderError(self.name, "error")
+        self._record(operation, "ok")
+
+
+_simulators: Dict[str, ProviderSimulator] = {}
+_simulators_lock = threading.Lock()
+
+
+def get_simulator(name: str) -> ProviderSimulator:
+    """Get or create the simulator of a provider from the configured profiles"""
+    simulator = _simulators.get(name)
+    if simulator is None:
+        with _simulators_lock:
+            simulator = _simulators.get(name)
+            if simulator is None:
+                profiles = load_profiles(settings.SIMULATION_PROFILE)
+                seed = None if settings.SIMULATION_SEED is None else settings.SIMULATION_SEED + zlib.crc32(name.encode())
+                simulator = _simulators[name] = ProviderSimulator(name, profiles.get(name, ProviderProfile()), seed)
+    return simulator
+
+
+def simulation_stats() -> Dict[str, Dict[str, int]]:
+    """Call counts per provider, keyed by ``operation:outcome``"""
+    return {name: simulator.calls for name, simulator in _simulators.items()}
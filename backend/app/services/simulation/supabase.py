@@ -0,0 +1,260 @@
+from .simulator import get_simulator, ProviderSimulator
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+import itertools
+import threading
+import uuid
+
+ACCESS_TOKEN_PREFIX = "sim-access:"
+REFRESH_TOKEN_PREFIX = "sim-refresh:"
+
+
+class _Result:
+    def __init__(self, data: List[Dict]):
+        self.data = data
+
+
+def _lookup(row: Dict, column: str):
+    # Supports JSON paths such as ``metadata->archive``
+    value = row
+    for part in column.split("->"):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class _Query:
+    """The subset of the PostgREST query builder the app uses"""
+
+    def __init__(self, client: "SimulatedSupabase", table: str):
+        self.client = client
+        self.table = table
+        self.filters = []
+        self.operation = "select"
+        self.payload = None
+        self._order = None
+        self._limit = None
+
+    def select(self, *args, **kwargs):
+        self.operation = "select"
+        return self
+
+    def insert(self, payload):
+        self.operation, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, **kwargs):
+        self.operation, self.payload = "insert", payload
+        return self
+
+    def update(self, payload):
+        self.operation, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: str(_lookup(row, column)) == str(value))
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: _lookup(row, column) is not None and _lookup(row, column) > value)
+        return self
+
+    def lt(self, column, value):
+        self.filters.append(lambda row: _lookup(row, column) is not None and _lookup(row, column) < value)
+        return self
+
+    def lte(self, column, value):
+        self.filters.append(lambda row: _lookup(row, column) is not None and _lookup(row, column) <= value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: _lookup(row, column) in values)
+        return self
+
+    def is_(self, column, value):
+        if value == "null":
+            self.filters.append(lambda row: _lookup(row, column) is None)
+        return self
+
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def execute(self) -> _Result:
+        self.client.simulator.call(f"{self.operation}:{self.table}")
+        with self.client.lock:
+            return self._apply()
+
+    def _apply(self) -> _Result:
+        rows = self.client.tables.setdefault(self.table, [])
+        if self.operation == "insert":
+            items = self.payload if isinstance(self.payload, list) else [self.payload]
+            inserted = []
+            for item in items:
+                item = dict(item)
+                item.setdefault("id", next(self.client.ids))
+                # Column default of every table in the schema
+                item.setdefault("created_at", datetime.utcnow().isoformat())
+                if self.table not in self.client.discard_tables:
+                    rows.append(item)
+                inserted.append(item)
+            return _Result(inserted)
+
+        matched = [row for row in rows if all(check(row) for check in self.filters)]
+        if self.operation == "update":
+            for row in matched:
+                row.update(self.payload)
+            return _Result([dict(row) for row in matched])
+        if self.operation == "delete":
+            for row in matched:
+                rows.remove(row)
+            return _Result(matched)
+        if self._order:
+            column, desc = self._order
+            matched.sort(key=lambda row: (_lookup(row, column) is None, _lookup(row, column)), reverse=desc)
+        if self._limit is not None:
+            matched = matched[:self._limit]
+        return _Result([dict(row) for row in matched])
+
+
+class _SimulatedAuth:
+    """Supabase Auth stand-in.
+
+    Tokens it issues map back to their user; any other non-empty token is
+    accepted as a distinct user, so load generators need no sign-up step.
+    """
+
+    def __init__(self, client: "SimulatedSupabase"):
+        self.client = client
+        self._accounts: Dict[str, Dict] = {}  # email -> {"id", "password", "full_name"}
+
+    def _user(self, user_id: str, email: str = "", full_name: Optional[str] = None):
+        return SimpleNamespace(
+            id=user_id,
+            email=email or f"{user_id}@simulated.local",
+            user_metadata={"full_name": full_name} if full_name else {},
+            email_confirmed_at=None,
+        )
+
+    def _session(self, user_id: str):
+        return SimpleNamespace(
+            access_token=f"{ACCESS_TOKEN_PREFIX}{user_id}",
+            refresh_token=f"{REFRESH_TOKEN_PREFIX}{user_id}",
+            token_type="bearer",
+        )
+
+    def sign_up(self, credentials: Dict):
+        self.client.simulator.call("auth:sign_up")
+        email = credentials["email"]
+        if email in self._accounts:
+            raise ValueError("User already registered")
+        full_name = (credentials.get("options") or {}).get("data", {}).get("full_name")
+        account = {"id": str(uuid.uuid4()), "password": credentials["password"], "full_name": full_name}
+        self._accounts[email] = account
+        return SimpleNamespace(user=self._user(account["id"], email, full_name), session=self._session(account["id"]))
+
+    def sign_in_with_password(self, credentials: Dict):
+        self.client.simulator.call("auth:sign_in")
+        account = self._accounts.get(credentials["email"])
+        if account is None or account["password"] != credentials["password"]:
+            raise ValueError("Invalid login credentials")
+        return SimpleNamespace(
+            user=self._user(account["id"], credentials["email"], account["full_name"]),
+            session=self._session(account["id"]),
+        )
+
+    def get_user(self, token: str):
+        self.client.simulator.call("auth:get_user")
+        if not token:
+            raise ValueError("Token is required")
+        if token.startswith(ACCESS_TOKEN_PREFIX):
+            user_id = token[len(ACCESS_TOKEN_PREFIX):]
+        else:
+            user_id = f"sim-{token}"
+        return SimpleNamespace(user=self._user(user_id))
+
+    def refresh_session(self, refresh_token: str):
+        self.client.simulator.call("auth:refresh")
+        if not refresh_token.startswith(REFRESH_TOKEN_PREFIX):
+            raise ValueError("Invalid refresh token")
+        user_id = refresh_token[len(REFRESH_TOKEN_PREFIX):]
+        return SimpleNamespace(user=self._user(user_id), session=self._session(user_id))
+
+    def sign_out(self):
+        return None
+
+
+class SimulatedSupabase:
+    """In-memory Supabase client with simulated request latency.
+
+    Rows of ``discard_tables`` are acknowledged but not kept, so long load
+    runs do not grow without bound.
+    """
+
+    def __init__(self, simulator: Optional[ProviderSimulator] = None, discard_tables=()):
+        self.simulator = simulator or get_simulator("supabase")
+        self.tables: Dict[str, List[Dict]] = {}
+        self.discard_tables = set(discard_tables)
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.auth = _SimulatedAuth(self)
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def rpc(self, name: str, params: Dict):
+        return SimpleNamespace(execute=lambda: self._rpc(name, params))
+
+    def _rpc(self, name: str, params: Dict) -> _Result:
+        self.simulator.call(f"rpc:{name}")
+        with self.lock:
+            if name == "increment_usage":
+                return _Result([self._increment_usage(params)])
+            if name == "search_transcripts":
+                return _Result(self._search_transcripts(params))
+        return _Result([])
+
+    def _increment_usage(self, params: Dict) -> Dict:
+        records = self.tables.setdefault("usage_records", [])
+        for record in records:
+            if record["user_id"] == params["p_user_id"] and record["period_start"] == params["p_period_start"]:
+                break
+        else:
+            record = {
+                "id": next(self.ids),
+                "user_id": params["p_user_id"],
+                "period_start": params["p_period_start"],
+                "audio_seconds": 0.0,
+                "characters": 0,
+            }
+            records.append(record)
+        record["audio_seconds"] += params["p_audio_seconds"]
+        record["characters"] += params["p_characters"]
+        return dict(record)
+
+    def _search_transcripts(self, params: Dict) -> List[Dict]:
+        # Plain substring match; ranking is out of scope for the simulation
+        sessions = {
+            session["id"] for session in self.tables.get("sessions", [])
+            if str(session.get("user_id")) == str(params["p_user_id"])
+        }
+        query = params["p_query"].lower()
+        results = []
+        for row in self.tables.get("transcripts", []):
+            if row.get("session_id") not in sessions:
+                continue
+            if query in (row.get("original_text") or "").lower() or query in (row.get("translated_text") or "").lower():
+                results.append({**row, "rank": 1.0})
+                if len(results) >= params.get("p_limit", 20):
+                    break
+        return results
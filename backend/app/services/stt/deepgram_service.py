@@ -1,11 +1,22 @@
 from deepgram import DeepgramClient, PrerecordedOptions, FileSource
 from app.core.config import settings
+from app.core.metrics import STT_LATENCY_SECONDS, PROVIDER_ERRORS
+from app.services.providers.executor import provider_executor
+from app.services.sessions.word_timings import WordTimings
 from typing import Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 
 class DeepgramSTTService:
     def __init__(self):
-        self.client = DeepgramClient(settings.DEEPGRAM_API_KEY)
+        if settings.PROVIDER_SIMULATION:
+            from app.services.simulation import SimulatedDeepgramClient
+            self.client = SimulatedDeepgramClient()
+        else:
+            self.client = DeepgramClient(settings.DEEPGRAM_API_KEY)
         self.model = settings.DEEPGRAM_MODEL
     
     async def transcribe_audio(self, audio_data: bytes, language: str = "en") -> Optional[dict]:
@@ -23,29 +34,32 @@ class DeepgramSTTService:
                 smart_format=True,
             )
             
-            response = self.client.listen.rest.v("1").transcribe_file(payload, options)
+            started = time.perf_counter()
+            response = await provider_executor.run(
+                self.client.listen.rest.v("1").transcribe_file, payload, options
+            )
+            STT_LATENCY_SECONDS.labels("deepgram").observe(time.perf_counter() - started)
             
-            if response.results and response.results.channels:
-                channel = response.results.channels[0]
-                if channel.alternatives:
-                    alternative = channel.alternatives[0]
-                    return {
-                        "text": alternative.transcript,
-                        "confidence": alternative.confidence,
-                        "words": [
-                            {
-                                "word": word.word,
-                                "start": word.start,
-                                "end": word.end,
-                                "confidence": word.confidence,
-                            }
-                            for word in alternative.words
-                        ] if alternative.words else [],
-                    }
+            return self.parse_response(response)
         except Exception as e:
-            print(f"Deepgram transcription error: {e}")
+            PROVIDER_ERRORS.labels("deepgram", "transcribe").inc()
+            logger.warning("Deepgram transcription error: %s", e)
             return None
-        
+    
+    @staticmethod
+    def parse_response(response) -> Optional[dict]:
+        """Text, confidence, duration and WordTimings of the first alternative"""
+        if response.results and response.results.channels:
+            channel = response.results.channels[0]
+            if channel.alternatives:
+                alternative = channel.alternatives[0]
+                metadata = getattr(response, "metadata", None)
+                return {
+                    "text": alternative.transcript,
+                    "confidence": alternative.confidence,
+                    "duration": getattr(metadata, "duration", None),  # Audio length in seconds
+                    "words": WordTimings.from_words(alternative.words or ()),
+                }
         return None
     
     async def transcribe_stream(self, audio_stream, language: str = "en"):
@@ -1,5 +1,11 @@
 from app.core.config import settings
+from app.core.metrics import TRANSLATION_LATENCY_SECONDS, PROVIDER_ERRORS
+from app.services.providers.executor import provider_executor
 from typing import Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 # Azure Translator is optional - make import optional
 try:
@@ -16,6 +22,11 @@ class AzureTranslationService:
     def __init__(self):
         self.client = None
         
+        if settings.PROVIDER_SIMULATION:
+            from app.services.simulation import SimulatedAzureTranslator
+            self.client = SimulatedAzureTranslator()
+            return
+        
         if not AZURE_AVAILABLE:
             return
             
@@ -29,7 +40,7 @@ class AzureTranslationService:
                 credential=credential
             )
         except Exception as e:
-            print(f"Failed to initialize Azure Translator: {e}")
+            logger.warning("Failed to initialize Azure Translator: %s", e)
             self.client = None
     
     async def translate(
@@ -43,18 +54,24 @@ class AzureTranslationService:
             return None
         
         try:
-            response = self.client.translate(
+            started = time.perf_counter()
+            response = await provider_executor.run(
+                self.client.translate,
                 content=[text],
                 to=[target_language],
                 from_parameter=source_language
             )
+            TRANSLATION_LATENCY_SECONDS.labels(
+                "azure", f"{source_language}-{target_language}"
+            ).observe(time.perf_counter() - started)
             
             if response and len(response) > 0:
                 translation = response[0]
                 if translation.translations and len(translation.translations) > 0:
                     return translation.translations[0].text
         except Exception as e:
-            print(f"Azure translation error: {e}")
+            PROVIDER_ERRORS.labels("azure", "translate").inc()
+            logger.warning("Azure translation error: %s", e)
             return None
         
         return None
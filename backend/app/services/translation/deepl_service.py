@@ -1,11 +1,21 @@
 import deepl
 from app.core.config import settings
+from app.core.metrics import TRANSLATION_LATENCY_SECONDS, PROVIDER_ERRORS
+from app.services.providers.executor import provider_executor
 from typing import Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 
 class DeepLTranslationService:
     def __init__(self):
-        self.translator = deepl.Translator(settings.DEEPL_API_KEY)
+        if settings.PROVIDER_SIMULATION:
+            from app.services.simulation import SimulatedDeepLTranslator
+            self.translator = SimulatedDeepLTranslator()
+        else:
+            self.translator = deepl.Translator(settings.DEEPL_API_KEY)
     
     async def translate(
         self,
@@ -22,15 +32,21 @@ class DeepLTranslationService:
             if source_lang == target_lang:
                 return text
             
-            result = self.translator.translate_text(
+            started = time.perf_counter()
+            result = await provider_executor.run(
+                self.translator.translate_text,
                 text,
                 source_lang=source_lang,
                 target_lang=target_lang
             )
+            TRANSLATION_LATENCY_SECONDS.labels(
+                "deepl", f"{source_language}-{target_language}"
+            ).observe(time.perf_counter() - started)
             
             return result.text
         except Exception as e:
-            print(f"DeepL translation error: {e}")
+            PROVIDER_ERRORS.labels("deepl", "translate").inc()
+            logger.warning("DeepL translation error: %s", e)
             return None
     
     def _map_language_code(self, lang_code: str) -> str:
@@ -0,0 +1,4 @@
+from .minhash import MinHashIndex, shingles, jaccard
+from .memory import TranslationMemory, source_key
+
+__all__ = ["MinHashIndex", "shingles", "jaccard", "TranslationMemory", "source_key"]
@@ -0,0 +1,176 @@
+from app.core.config import settings
+from app.core.database import Client
+from app.core.metrics import TRANSLATION_MEMORY_LOOKUPS
+from .minhash import MinHashIndex, shingles
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+import re
+import time
+
+_NUMBER_RE = re.compile(r"\d+(?:[.,:]\d+)*")
+# "?" is kept: a question and the same words as a statement translate differently
+_TOKEN_RE = re.compile(r"#|\?|\w+(?:['’-]\w+)*")
+# Hesitations transcribed as words; they do not change the translation
+FILLER_WORDS = frozenset({"um", "umm", "uh", "uhm", "er", "erm", "ah", "eh", "ehm", "em", "hmm", "mm", "mhm"})
+NUMBER_PLACEHOLDER = "#"
+# Longest phrase a speaker repeats back to back ("every morning, every morning")
+MAX_REPEAT_WORDS = 3
+
+
+def source_key(text: str) -> Tuple[str, List[str]]:
+    """Matching key of a source sentence and the numbers taken out of it.
+
+    Numbers become placeholders, and case, punctuation other than question
+    marks and filler words are dropped, so "Uh, room 12, please." and
+    "room 14 please" share a key.
+    """
+    numbers = _NUMBER_RE.findall(text)
+    tokens = _TOKEN_RE.findall(_NUMBER_RE.sub(NUMBER_PLACEHOLDER, text.lower()))
+    return " ".join(token for token in tokens if token not in FILLER_WORDS), numbers
+
+
+def _without_repeats(key: str) -> List[str]:
+    """Words of a key in order, with immediately repeated words and phrases said once"""
+    words: List[str] = []
+    for token in key.split():
+        words.append(token)
+        for size in range(1, MAX_REPEAT_WORDS + 1):
+            if len(words) >= 2 * size and words[-size:] == words[-2 * size:-size]:
+                del words[-size:]
+                break
+    return words
+
+
+def translation_template(translation: str, numbers: List[str]) -> Optional[List[Union[str, int]]]:
+    """Split a translation into text and the index of each source number it repeats.
+
+    None when the translation does not contain exactly the source numbers
+    (reformatted or spelled out); such entries are only reused for the same numbers.
+    """
+    if sorted(_NUMBER_RE.findall(translation)) != sorted(numbers):
+        return None
+    positions: Dict[str, List[int]] = {}
+    for index, number in enumerate(numbers):
+        positions.setdefault(number, []).append(index)
+
+    template: List[Union[str, int]] = []
+    last = 0
+    for match in _NUMBER_RE.finditer(translation):
+        template.append(translation[last:match.start()])
+        template.append(positions[match.group()].pop(0))
+        last = match.end()
+    template.append(translation[last:])
+    return template
+
+
+class MemoryEntry(NamedTuple):
+    numbers: List[str]
+    translation: str
+    template: Optional[List[Union[str, int]]]
+
+    def render(self, numbers: List[str]) -> Optional[str]:
+        """The translation with the numbers of a new sentence, if they can be substituted"""
+        if numbers == self.numbers:
+            return self.translation
+        if self.template is None or len(numbers) != len(self.numbers):
+            return None
+        return "".join(part if isinstance(part, str) else numbers[part] for part in self.template)
+
+
+class TranslationMemory:
+    """Earlier translations of one user and language pair, reused for near-repeats.
+
+    Interpreters say the same sentences again with different numbers, names
+    or hesitations. Sentences are keyed by ``source_key`` and looked up
+    exactly, then by MinHash over character n-grams. A match at or above
+    ``similarity`` (Jaccard) reuses the stored translation, with the new
+    sentence's numbers substituted, only if both sentences have the same
+    words in the same order once repeats are collapsed: an added word
+    ("not", a name) or a swapped pair ("from savings to checking") changes
+    the translation, so fuzzy matches only absorb stammered repetitions.
+
+    The memory is loaded from the user's stored transcripts when the
+    session starts and then grows incrementally: the session adds its own
+    translations, and a refresh fetches rows with an id above the last one
+    seen. At most ``max_entries`` recent sentences are kept. Sessions moved
+    to cold storage are not loaded.
+    """
+
+    def __init__(self, supabase: Client, user_id: str, source_language: str, target_language: str,
+                 similarity: Optional[float] = None, max_entries: Optional[int] = None):
+        self.supabase = supabase
+        self.user_id = str(user_id)
+        self.source_language = source_language
+        self.target_language = target_language
+        self.similarity = similarity or settings.TRANSLATION_MEMORY_SIMILARITY
+        self.max_entries = max_entries or settings.TRANSLATION_MEMORY_MAX_ENTRIES
+        self.index = MinHashIndex()
+        self._entries: "OrderedDict[str, MemoryEntry]" = OrderedDict()
+        self._last_transcript_id = 0
+        self._last_refresh = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def load(self) -> int:
+        """Fetch transcripts stored since the last load and add them"""
+        self._last_refresh = time.monotonic()
+        query = (
+            self.supabase.table("transcripts")
+            .select("id, original_text, translated_text, sessions!inner(user_id)")
+            .eq("sessions.user_id", self.user_id)
+            .eq("source_language", self.source_language)
+            .eq("target_language", self.target_language)
+            .gt("id", self._last_transcript_id)
+        )
+        if self._last_transcript_id:
+            rows = query.order("id").limit(self.max_entries).execute().data or []
+        else:
+            # First load: the most recent rows, added oldest first
+            rows = list(reversed(query.order("id", desc=True).limit(self.max_entries).execute().data or []))
+
+        for row in rows:
+            if row.get("translated_text"):
+                self.add(row["original_text"], row["translated_text"], row["id"])
+        return len(rows)
+
+    async def refresh_if_stale(self) -> int:
+        """Pick up transcripts of the user's other sessions if the refresh interval has elapsed"""
+        if time.monotonic() - self._last_refresh < settings.TRANSLATION_MEMORY_REFRESH_SECONDS:
+            return 0
+        return await self.load()
+
+    def add(self, text: str, translation: str, transcript_id: Optional[int] = None) -> None:
+        """Remember a translation; a later one of the same sentence replaces it"""
+        key, numbers = source_key(text)
+        if not key or not translation:
+            return
+        if transcript_id and transcript_id > self._last_transcript_id:
+            self._last_transcript_id = transcript_id
+
+        self._entries[key] = MemoryEntry(numbers, translation, translation_template(translation, numbers))
+        self._entries.move_to_end(key)
+        self.index.add(key, shingles(key))
+        while len(self._entries) > self.max_entries:
+            oldest, _ = self._entries.popitem(last=False)
+            self.index.remove(oldest)
+
+    @staticmethod
+    def _carries_difference(stored_key: str, key: str) -> bool:
+        # Keys hold no fillers and numbers are substituted, so only repeats may differ
+        return _without_repeats(stored_key) != _without_repeats(key)
+
+    def lookup(self, text: str) -> Optional[str]:
+        """A stored translation adapted to ``text``, or None to call a provider"""
+        key, numbers = source_key(text)
+        entry = self._entries.get(key) if key else None
+        outcome = "exact"
+        if entry is None and key:
+            match = self.index.best_match(shingles(key), self.similarity)
+            if match is not None and not self._carries_difference(match[0], key):
+                entry = self._entries[match[0]]
+                outcome = "fuzzy"
+
+        translation = entry.render(numbers) if entry is not None else None
+        TRANSLATION_MEMORY_LOOKUPS.labels(outcome if translation is not None else "miss").inc()
+        return translation
@@ -0,0 +1,119 @@
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+import re
+import zlib
+
+# One-permutation MinHash: each shingle is hashed once and lands in one of
+# SIGNATURE_SIZE bins; the signature holds the minimum per bin
+SIGNATURE_SIZE = 32
+# 8 bands of 4 rows: pairs above ~0.6 Jaccard similarity share a bucket with high probability
+BANDS = 8
+ROWS_PER_BAND = SIGNATURE_SIZE // BANDS
+SHINGLE_SIZE = 4
+
+_BIN_BITS = SIGNATURE_SIZE.bit_length() - 1
+_VALUE_RANGE = 1 << (32 - _BIN_BITS)
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[str]:
+    """Character n-grams of the text; short texts are one shingle"""
+    text = _SPACE_RE.sub(" ", text.strip())
+    if len(text) <= size:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[index:index + size] for index in range(len(text) - size + 1))
+
+
+def jaccard(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+
+def signature(items: FrozenSet[str]) -> Tuple[int, ...]:
+    """MinHash signature with one hash per item (one-permutation hashing).
+
+    Empty bins borrow the value of the next non-empty bin, offset by the
+    distance, so that two sets with the same items still agree bin by bin
+    (densification, Shrivastava and Li 2014).
+    """
+    bins: List[Optional[int]] = [None] * SIGNATURE_SIZE
+    for item in items:
+        # crc32 is fast; multiplying spreads it into the high bits, which pick the bin
+        value = (zlib.crc32(item.encode()) * 0x9E3779B1) & 0xFFFFFFFF
+        index, value = value >> (32 - _BIN_BITS), value & (_VALUE_RANGE - 1)
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+
+    filled = [index for index, value in enumerate(bins) if value is not None]
+    if not filled:
+        return (0,) * SIGNATURE_SIZE
+    result = []
+    for index, value in enumerate(bins):
+        if value is None:
+            # Next filled bin to the right, wrapping around
+            donor = next((other for other in filled if other > index), filled[0])
+            value = bins[donor] + ((donor - index) % SIGNATURE_SIZE) * _VALUE_RANGE
+        result.append(value)
+    return tuple(result)
+
+
+def _band_keys(minhash: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+    return [
+        (band, minhash[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+        for band in range(BANDS)
+    ]
+
+
+class MinHashIndex:
+    """Locality-sensitive hashing index over shingle sets.
+
+    Each key's MinHash signature is cut into bands; keys sharing any band
+    are candidates, which are then ranked by their exact Jaccard
+    similarity. Lookup cost depends on the number of candidates, not on
+    the size of the index.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[Hashable]] = {}
+        self._items: Dict[Hashable, Tuple[FrozenSet[str], List]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def add(self, key: Hashable, items: FrozenSet[str]) -> None:
+        if key in self._items:
+            self.remove(key)
+        bands = _band_keys(signature(items))
+        for band in bands:
+            self._buckets.setdefault(band, set()).add(key)
+        self._items[key] = (items, bands)
+
+    def remove(self, key: Hashable) -> bool:
+        stored = self._items.pop(key, None)
+        if stored is None:
+            return False
+        for band in stored[1]:
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+        return True
+
+    def best_match(self, items: FrozenSet[str], threshold: float = 0.0) -> Optional[Tuple[Hashable, float]]:
+        """The most similar key at or above ``threshold``, with its similarity"""
+        candidates = set()
+        for band in _band_keys(signature(items)):
+            candidates.update(self._buckets.get(band, ()))
+
+        best = None
+        for key in candidates:
+            similarity = jaccard(items, self._items[key][0])
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
@@ -0,0 +1,14 @@
+from .plans import PlanLimits, PLAN_LIMITS, get_user_plan, get_cached_user_plan
+from .meter import UsageMeter, UsageAccount, usage_meter, QUOTA_AUDIO, QUOTA_CHARACTERS
+
+__all__ = [
+    "PlanLimits",
+    "PLAN_LIMITS",
+    "get_user_plan",
+    "get_cached_user_plan",
+    "UsageMeter",
+    "UsageAccount",
+    "usage_meter",
+    "QUOTA_AUDIO",
+    "QUOTA_CHARACTERS",
+]
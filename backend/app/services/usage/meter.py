@@ -0,0 +1,251 @@
+from app.core.config import settings
+from app.core.database import Client, get_supabase_client
+from app.models.subscription import SubscriptionPlan
+from .plans import PLAN_LIMITS, PlanLimits, get_user_plan
+from datetime import datetime, date, timezone
+from typing import Optional, Dict, List, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+QUOTA_AUDIO = "audio_seconds"
+QUOTA_CHARACTERS = "characters"
+
+
+def current_period() -> date:
+    """Usage is metered per calendar month (UTC)"""
+    today = datetime.utcnow().date()
+    return today.replace(day=1)
+
+
+def period_end(period_start: date) -> float:
+    """Unix time at which the period starting on ``period_start`` ends"""
+    if period_start.month == 12:
+        following = period_start.replace(year=period_start.year + 1, month=1)
+    else:
+        following = period_start.replace(month=period_start.month + 1)
+    return datetime(following.year, following.month, 1, tzinfo=timezone.utc).timestamp()
+
+
+class UsageAccount:
+    """In-memory usage counters of one user for the current period"""
+
+    __slots__ = (
+        "user_id", "plan", "limits", "period_start", "period_end",
+        "audio_seconds", "characters",
+        "pending_audio_seconds", "pending_characters",
+        "connections",
+    )
+
+    def __init__(self, user_id: str, plan: SubscriptionPlan, period_start: date,
+                 audio_seconds: float = 0.0, characters: int = 0):
+        self.user_id = user_id
+        self.plan = plan
+        self.limits: PlanLimits = PLAN_LIMITS[plan]
+        self.period_start = period_start
+        self.period_end = period_end(period_start)
+        # Totals include pending amounts, so quota checks never need the database
+        self.audio_seconds = audio_seconds
+        self.characters = characters
+        self.pending_audio_seconds = 0.0
+        self.pending_characters = 0
+        self.connections = 0
+
+    def exceeded(self) -> Optional[str]:
+        """Name of the first exhausted quota, or None"""
+        limits = self.limits
+        if limits.audio_seconds is not None and self.audio_seconds >= limits.audio_seconds:
+            return QUOTA_AUDIO
+        if limits.characters is not None and self.characters >= limits.characters:
+            return QUOTA_CHARACTERS
+        return None
+
+    def to_dict(self) -> Dict:
+        return {
+            "plan": self.plan.value,
+            "period_start": self.period_start.isoformat(),
+            "audio_seconds": round(self.audio_seconds, 3),
+            "characters": self.characters,
+            "audio_seconds_limit": self.limits.audio_seconds,
+            "characters_limit": self.limits.characters,
+        }
+
+
+class UsageMeter:
+    """Counts streamed audio and translated characters per user.
+
+    Counters live in memory and are updated as frames are processed; a
+    background task periodically adds the pending deltas to ``usage_records``
+    with an atomic increment, so the hot path never touches the database.
+    An account whose period ends while it is open starts the new period
+    from zero; its pending deltas are still written to the old period.
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None):
+        self.flush_interval = flush_interval or settings.USAGE_FLUSH_INTERVAL_SECONDS
+        self.accounts: Dict[str, UsageAccount] = {}
+        # Pending deltas of ended periods: (user_id, period_start, audio_seconds, characters)
+        self._closed: List[Tuple[str, date, float, int]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def open_account(self, supabase: Client, user_id: str) -> UsageAccount:
+        """Load (or reuse) the user's account for a new connection"""
+        user_id = str(user_id)
+        account = self.accounts.get(user_id)
+        if account is None or account.period_start != current_period():
+            if account is not None:
+                await self.flush()
+            account = await self._load_account(supabase, user_id)
+            self.accounts[user_id] = account
+        account.connections += 1
+        return account
+
+    def close_account(self, user_id: str) -> None:
+        """Release a connection; the account is dropped after its next flush"""
+        account = self.accounts.get(str(user_id))
+        if account is not None:
+            account.connections = max(0, account.connections - 1)
+
+    async def _load_account(self, supabase: Client, user_id: str) -> UsageAccount:
+        plan = await get_user_plan(supabase, user_id)
+        period_start = current_period()
+        result = (
+            supabase.table("usage_records")
+            .select("audio_seconds, characters")
+            .eq("user_id", user_id)
+            .eq("period_start", period_start.isoformat())
+            .execute()
+        )
+        record = result.data[0] if result.data else {}
+        return UsageAccount(
+            user_id,
+            plan,
+            period_start,
+            audio_seconds=float(record.get("audio_seconds") or 0.0),
+            characters=int(record.get("characters") or 0),
+        )
+
+    def _account(self, user_id: str) -> Optional[UsageAccount]:
+        account = self.accounts.get(user_id)
+        if account is not None and time.time() >= account.period_end:
+            self._roll_over(account)
+        return account
+
+    def _roll_over(self, account: UsageAccount) -> None:
+        # Set the old period's pending deltas aside for the next flush, then start the new period
+        if account.pending_audio_seconds or account.pending_characters:
+            self._closed.append((
+                account.user_id, account.period_start,
+                account.pending_audio_seconds, account.pending_characters,
+            ))
+        account.period_start = current_period()
+        account.period_end = period_end(account.period_start)
+        account.audio_seconds = account.pending_audio_seconds = 0.0
+        account.characters = account.pending_characters = 0
+
+    def check(self, user_id: str) -> Optional[str]:
+        """O(1) quota check for the hot path"""
+        account = self._account(user_id)
+        return account.exceeded() if account is not None else None
+
+    def record_audio(self, user_id: str, seconds: float) -> Optional[str]:
+        """Add streamed audio and return the exhausted quota, if any"""
+        account = self._account(user_id)
+        if account is None or seconds <= 0:
+            return None
+        account.audio_seconds += seconds
+        account.pending_audio_seconds += seconds
+        return account.exceeded()
+
+    def record_characters(self, user_id: str, count: int) -> Optional[str]:
+        """Add translated characters and return the exhausted quota, if any"""
+        account = self._account(user_id)
+        if account is None or count <= 0:
+            return None
+        account.characters += count
+        account.pending_characters += count
+        return account.exceeded()
+
+    async def flush(self) -> int:
+        """Write pending deltas to usage_records; returns accounts flushed"""
+        async with self._lock:
+            flushed = 0
+            supabase = None
+            closed, self._closed = self._closed, []
+            for user_id, period_start, audio, characters in closed:
+                supabase = supabase or get_supabase_client()
+                try:
+                    self._increment(supabase, user_id, period_start, audio, characters)
+                except Exception as e:
+                    logger.warning("Usage flush error for %s: %s", user_id, e)
+                    self._closed.append((user_id, period_start, audio, characters))
+                    continue
+                flushed += 1
+
+            for user_id, account in list(self.accounts.items()):
+                if time.time() >= account.period_end:
+                    self._roll_over(account)
+                audio = account.pending_audio_seconds
+                characters = account.pending_characters
+                if audio or characters:
+                    supabase = supabase or get_supabase_client()
+                    try:
+                        self._increment(supabase, user_id, account.period_start, audio, characters)
+                    except Exception as e:
+                        # Keep the deltas; they are retried on the next flush
+                        logger.warning("Usage flush error for %s: %s", user_id, e)
+                        continue
+                    account.pending_audio_seconds -= audio
+                    account.pending_characters -= characters
+                    flushed += 1
+                if account.connections == 0 and not (
+                    account.pending_audio_seconds or account.pending_characters
+                ):
+                    del self.accounts[user_id]
+            return flushed
+
+    @staticmethod
+    def _increment(supabase: Client, user_id: str, period_start: date, audio: float, characters: int) -> None:
+        supabase.rpc("increment_usage", {
+            "p_user_id": user_id,
+            "p_period_start": period_start.isoformat(),
+            "p_audio_seconds": audio,
+            "p_characters": characters,
+        }).execute()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Usage flush loop error")
+
+    def start(self) -> None:
+        """Start the periodic flush task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write out what is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def get_usage(self, supabase: Client, user_id: str) -> Dict:
+        """Current period usage, including amounts not flushed yet"""
+        account = self.accounts.get(str(user_id))
+        if account is None or account.period_start != current_period():
+            account = await self._load_account(supabase, str(user_id))
+        return account.to_dict()
+
+
+usage_meter = UsageMeter()
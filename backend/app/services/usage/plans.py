@@ -0,0 +1,65 @@
+from app.core.database import Client
+from app.models.subscription import SubscriptionPlan, SubscriptionStatus
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+import time
+
+
+class PlanLimits(NamedTuple):
+    """Monthly allowance of a subscription plan (None means unlimited)"""
+    audio_seconds: Optional[float]
+    characters: Optional[int]
+
+
+PLAN_LIMITS = {
+    SubscriptionPlan.FREE: PlanLimits(audio_seconds=30 * 60, characters=50_000),
+    SubscriptionPlan.BASIC: PlanLimits(audio_seconds=10 * 3600, characters=500_000),
+    SubscriptionPlan.PRO: PlanLimits(audio_seconds=50 * 3600, characters=3_000_000),
+    SubscriptionPlan.ENTERPRISE: PlanLimits(audio_seconds=None, characters=None),
+}
+
+BILLABLE_STATUSES = (SubscriptionStatus.ACTIVE.value, SubscriptionStatus.TRIAL.value)
+
+PLAN_CACHE_TTL_SECONDS = 300
+PLAN_CACHE_MAX_USERS = 10_000
+
+# user_id -> (plan, expiry), least recently used first
+_plan_cache: "OrderedDict[str, Tuple[SubscriptionPlan, float]]" = OrderedDict()
+
+
+async def get_user_plan(supabase: Client, user_id: str) -> SubscriptionPlan:
+    """Get the user's current plan, falling back to the free plan"""
+    result = (
+        supabase.table("subscriptions")
+        .select("plan, status")
+        .eq("user_id", str(user_id))
+        .execute()
+    )
+    for subscription in result.data or []:
+        if subscription.get("status") in BILLABLE_STATUSES:
+            try:
+                return SubscriptionPlan(subscription.get("plan"))
+            except ValueError:
+                break
+    return SubscriptionPlan.FREE
+
+
+async def get_cached_user_plan(supabase: Client, user_id: str) -> SubscriptionPlan:
+    """get_user_plan with a short per-process cache, for per-request checks.
+
+    At most PLAN_CACHE_MAX_USERS plans are kept; the least recently used is
+    evicted first, so many distinct users cost bounded memory.
+    """
+    user_id = str(user_id)
+    cached = _plan_cache.get(user_id)
+    now = time.monotonic()
+    if cached is not None and cached[1] > now:
+        _plan_cache.move_to_end(user_id)
+        return cached[0]
+    
+    plan = await get_user_plan(supabase, user_id)
+    _plan_cache[user_id] = (plan, now + PLAN_CACHE_TTL_SECONDS)
+    _plan_cache.move_to_end(user_id)
+    while len(_plan_cache) > PLAN_CACHE_MAX_USERS:
+        _plan_cache.popitem(last=False)
+    return plan
@@ -0,0 +1,4 @@
+from .trie import VocabularyTrie
+from .vocabulary_service import VocabularyIndex
+
+__all__ = ["VocabularyTrie", "VocabularyIndex"]
@@ -0,0 +1,120 @@
+from typing import Optional, List, Dict
+
+
+class _TrieNode:
+    __slots__ = ("children", "entry")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entry: Optional[Dict] = None  # Set when a vocabulary word ends here
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char in "'-"
+
+
+class VocabularyTrie:
+    """Character trie of vocabulary words for a single language.
+
+    Keys are the per-character lowercase form of each word, so offsets returned
+    by ``find_matches`` always index into the original text. Lookup cost depends
+    on the text length and the longest word, not on the number of words.
+    """
+
+    def __init__(self):
+        self._root = _TrieNode()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _keys(word: str) -> List[str]:
+        normalized = " ".join(word.split())
+        return [char.lower() for char in normalized]
+
+    def add(self, word: str, entry_id: Optional[int] = None) -> None:
+        """Insert a word (or multi-word phrase) into the trie"""
+        keys = self._keys(word)
+        if not keys:
+            return
+
+        node = self._root
+        for key in keys:
+            child = node.children.get(key)
+            if child is None:
+                child = node.children[key] = _TrieNode()
+            node = child
+
+        if node.entry is None:
+            self._size += 1
+        node.entry = {"word": " ".join(word.split()), "entry_id": entry_id}
+
+    def remove(self, word: str) -> bool:
+        """Remove a word from the trie, pruning branches that become empty"""
+        keys = self._keys(word)
+        path = [self._root]
+        for key in keys:
+            child = path[-1].children.get(key)
+            if child is None:
+                return False
+            path.append(child)
+
+        if path[-1].entry is None:
+            return False
+
+        path[-1].entry = None
+        self._size -= 1
+
+        for index in range(len(keys), 0, -1):
+            node = path[index]
+            if node.children or node.entry is not None:
+                break
+            del path[index - 1].children[keys[index - 1]]
+        return True
+
+    def find_matches(self, text: str) -> List[Dict]:
+        """Find leftmost-longest, non-overlapping whole-word matches in text"""
+        matches = []
+        if not text or not self._size:
+            return matches
+
+        root = self._root
+        length = len(text)
+        position = 0
+
+        while position < length:
+            # Only start matching at the beginning of a word
+            if not _is_word_char(text[position]) or (
+                position > 0 and _is_word_char(text[position - 1])
+            ):
+                position += 1
+                continue
+
+            node = root
+            best_end = -1
+            best_entry = None
+            cursor = position
+            while cursor < length:
+                node = node.children.get(text[cursor].lower())
+                if node is None:
+                    break
+                cursor += 1
+                if node.entry is not None and (
+                    cursor == length or not _is_word_char(text[cursor])
+                ):
+                    best_end = cursor
+                    best_entry = node.entry
+
+            if best_entry is not None:
+                matches.append({
+                    "start": position,
+                    "end": best_end,
+                    "word": best_entry["word"],
+                    "entry_id": best_entry["entry_id"],
+                })
+                position = best_end
+            else:
+                position += 1
+
+        return matches
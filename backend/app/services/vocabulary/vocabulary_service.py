@@ -0,0 +1,105 @@
+from app.core.config import settings
+from app.core.database import Client
+from .trie import VocabularyTrie
+from typing import Optional, List, Dict, Iterable, Tuple
+import time
+
+
+class VocabularyIndex:
+    """Per-user vocabulary tries, one per language, kept for a session.
+
+    The index is loaded once when the session starts and then refreshed
+    incrementally: only entries with an id above the last one seen are fetched.
+    Deletions are noticed by counting the user's entries; only when the count
+    differs from the indexed entries are their ids fetched to find which ones
+    to drop.
+    """
+
+    def __init__(self, supabase: Client, user_id: str, languages: Iterable[str]):
+        self.supabase = supabase
+        self.user_id = str(user_id)
+        self.languages = sorted({language.lower() for language in languages if language})
+        self.tries: Dict[str, VocabularyTrie] = {
+            language: VocabularyTrie() for language in self.languages
+        }
+        self._entries: Dict[int, Tuple[str, str]] = {}  # Indexed entry id -> (word, language)
+        self._last_entry_id = 0
+        self._last_refresh = 0.0
+
+    async def load(self) -> int:
+        """Fetch vocabulary entries added since the last load and index them"""
+        self._last_refresh = time.monotonic()
+        if not self.languages:
+            return 0
+
+        result = (
+            self.supabase.table("vocabulary_entries")
+            .select("id, word, language")
+            .eq("user_id", self.user_id)
+            .in_("language", self.languages)
+            .gt("id", self._last_entry_id)
+            .order("id")
+            .execute()
+        )
+
+        for entry in result.data or []:
+            self.add_entry(entry)
+        return len(result.data or [])
+
+    async def refresh_if_stale(self) -> int:
+        """Reload new entries and drop deleted ones if the refresh interval has elapsed"""
+        if time.monotonic() - self._last_refresh < settings.VOCABULARY_REFRESH_SECONDS:
+            return 0
+        added = await self.load()
+        if self._entries and self._count_entries() != len(self._entries):
+            self._drop_deleted()
+        return added
+
+    def _count_entries(self) -> Optional[int]:
+        result = (
+            self.supabase.table("vocabulary_entries")
+            .select("id", count="exact", head=True)
+            .eq("user_id", self.user_id)
+            .in_("language", self.languages)
+            .execute()
+        )
+        return result.count
+
+    def _drop_deleted(self) -> None:
+        result = (
+            self.supabase.table("vocabulary_entries")
+            .select("id")
+            .eq("user_id", self.user_id)
+            .in_("language", self.languages)
+            .execute()
+        )
+        current = {row["id"] for row in result.data or []}
+        for entry_id in set(self._entries) - current:
+            word, language = self._entries.pop(entry_id)
+            # The same word may also be saved under another id that still exists
+            key = (" ".join(word.lower().split()), language)
+            if not any((" ".join(other.lower().split()), other_language) == key
+                       for other, other_language in self._entries.values()):
+                self.remove_entry(word, language)
+
+    def add_entry(self, entry: Dict) -> None:
+        """Index a single vocabulary_entries row"""
+        trie = self.tries.get((entry.get("language") or "").lower())
+        if trie is not None and entry.get("word"):
+            trie.add(entry["word"], entry.get("id"))
+            if entry.get("id"):
+                self._entries[entry["id"]] = (entry["word"], entry["language"].lower())
+        if entry.get("id") and entry["id"] > self._last_entry_id:
+            self._last_entry_id = entry["id"]
+
+    def remove_entry(self, word: str, language: str) -> bool:
+        """Drop a word from the index (e.g. after the user deletes it)"""
+        trie = self.tries.get(language.lower())
+        return trie.remove(word) if trie is not None else False
+
+    def find_matches(self, text: Optional[str], language: str) -> List[Dict]:
+        """Return span offsets of vocabulary words found in text"""
+        trie = self.tries.get(language.lower())
+        if trie is None or not text:
+            return []
+        return trie.find_matches(text)
@@ -1,4 +1,13 @@
 from .interpretation import websocket_interpretation
+from .connections import manager, drain_connections
+from .reaper import connection_reaper
+from .admission import AdmissionMiddleware, admission_controller
 
-__all__ = ["websocket_interpretation"]
-
+__all__ = [
+    "websocket_interpretation",
+    "manager",
+    "drain_connections",
+    "connection_reaper",
+    "AdmissionMiddleware",
+    "admission_controller",
+]
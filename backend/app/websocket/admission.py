@@ -0,0 +1,192 @@
+from app.core.config import settings
+from app.core.metrics import ADMISSION_DECISIONS, EVENT_LOOP_LAG_SECONDS
+from app.services.providers.executor import provider_executor, ProviderExecutor
+from .connections import manager, ConnectionManager
+from typing import NamedTuple, Optional
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Standard close code for "try again later", used when the server cannot send an HTTP denial
+CLOSE_TRY_AGAIN_LATER = 1013
+
+REASON_DRAINING = "draining"
+REASON_SESSIONS = "sessions"
+REASON_EXECUTOR = "executor_saturation"
+REASON_LOOP_LAG = "loop_lag"
+
+RESERVATION_STATE_KEY = "admission_reservation"
+
+
+class Rejection(NamedTuple):
+    reason: str
+    retry_after: int
+
+
+class AdmissionReservation:
+    """A session slot held from the handshake until the socket registers"""
+
+    __slots__ = ("controller", "released")
+
+    def __init__(self, controller: "AdmissionController"):
+        self.controller = controller
+        self.released = False
+
+    def release(self) -> None:
+        """Give the slot back; registration or the end of the handler does this"""
+        if not self.released:
+            self.released = True
+            self.controller.reserved -= 1
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up from a timed sleep.
+
+    The smoothed ``lag`` rises immediately and decays gradually, so
+    admission reacts to a stall at once but does not flap while it clears.
+    """
+
+    def __init__(self, interval: Optional[float] = None, decay: float = 0.8):
+        self.interval = interval or settings.LOOP_LAG_INTERVAL_SECONDS
+        self.decay = decay
+        self.lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, lag: float) -> None:
+        EVENT_LOOP_LAG_SECONDS.observe(lag)
+        self.lag = max(lag, self.lag * self.decay)
+
+    async def _monitor_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - started - self.interval))
+
+    def start(self) -> None:
+        """Start the sampling task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._monitor_loop())
+
+    async def stop(self) -> None:
+        """Stop the sampling task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class AdmissionController:
+    """Decides whether the worker takes another interpretation session.
+
+    Past saturation every session degrades together, so new sessions are
+    refused instead; the client retries, ideally against another worker.
+    """
+
+    def __init__(self, connection_manager: ConnectionManager = manager,
+                 executor: ProviderExecutor = provider_executor,
+                 lag_monitor: Optional[LoopLagMonitor] = None):
+        self.manager = connection_manager
+        self.executor = executor
+        self.lag_monitor = lag_monitor or LoopLagMonitor()
+        # Admitted sessions still authenticating, not yet in manager.connections
+        self.reserved = 0
+
+    def check(self) -> Optional[Rejection]:
+        """None to admit, otherwise why the session is refused"""
+        rejection = self._evaluate()
+        if rejection is None:
+            ADMISSION_DECISIONS.labels("admitted", "none").inc()
+        else:
+            ADMISSION_DECISIONS.labels("rejected", rejection.reason).inc()
+        return rejection
+
+    def reserve(self) -> AdmissionReservation:
+        """Hold a session slot for an admitted handshake"""
+        self.reserved += 1
+        return AdmissionReservation(self)
+
+    def _evaluate(self) -> Optional[Rejection]:
+        if self.manager.draining:
+            # Reconnect right away; other workers are still accepting
+            return Rejection(REASON_DRAINING, 1)
+        if not settings.ADMISSION_CONTROL_ENABLED:
+            return None
+
+        retry_after = settings.ADMISSION_RETRY_AFTER_SECONDS
+        if len(self.manager.connections) + self.reserved >= settings.ADMISSION_MAX_SESSIONS:
+            return Rejection(REASON_SESSIONS, retry_after)
+        if self.executor.saturation >= settings.ADMISSION_MAX_EXECUTOR_SATURATION:
+            return Rejection(REASON_EXECUTOR, retry_after)
+        if self.lag_monitor.lag >= settings.ADMISSION_MAX_LOOP_LAG_SECONDS:
+            return Rejection(REASON_LOOP_LAG, retry_after)
+        return None
+
+
+admission_controller = AdmissionController()
+
+
+def release_admission(websocket) -> None:
+    """Release the slot reserved by AdmissionMiddleware once the socket is registered"""
+    reservation = websocket.scope.get("state", {}).get(RESERVATION_STATE_KEY)
+    if reservation is not None:
+        reservation.release()
+
+
+class AdmissionMiddleware:
+    """Refuses interpretation handshakes the worker should not take.
+
+    Runs before routing, so a refused client costs no accept() and no
+    Supabase calls. Servers supporting the WebSocket denial response send
+    503 with Retry-After; others close the handshake with 1013. An admitted
+    handshake holds a reserved slot until the handler registers the socket
+    or returns, so a burst cannot overshoot the session limit.
+    """
+
+    def __init__(self, app, paths=("/ws/interpret",), controller: AdmissionController = admission_controller):
+        self.app = app
+        self.paths = set(paths)
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "websocket" and scope["path"] in self.paths:
+            rejection = self.controller.check()
+            if rejection is not None:
+                await self._reject(scope, receive, send, rejection)
+                return
+            reservation = self.controller.reserve()
+            scope.setdefault("state", {})[RESERVATION_STATE_KEY] = reservation
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                reservation.release()
+            return
+        await self.app(scope, receive, send)
+
+    async def _reject(self, scope, receive, send, rejection: Rejection) -> None:
+        logger.info("WebSocket refused", extra={"reason": rejection.reason, "retry_after": rejection.retry_after})
+        await receive()  # websocket.connect
+        if "websocket.http.response" not in scope.get("extensions", {}):
+            await send({"type": "websocket.close", "code": CLOSE_TRY_AGAIN_LATER})
+            return
+
+        body = json.dumps({
+            "detail": "Server busy, retry later",
+            "reason": rejection.reason,
+            "retry_after": rejection.retry_after,
+        }).encode()
+        await send({
+            "type": "websocket.http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(rejection.retry_after).encode()),
+            ],
+        })
+        await send({"type": "websocket.http.response.body", "body": body})
@@ -0,0 +1,147 @@
+from fastapi import WebSocket
+from app.core.metrics import WS_ACTIVE_CONNECTIONS
+from app.services.sessions.writer import session_writer
+from typing import Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Application close codes (4000-4999 are reserved for applications)
+CLOSE_QUOTA_EXCEEDED = 4003
+CLOSE_IDLE_TIMEOUT = 4008
+CLOSE_SESSION_TIMEOUT = 4009
+CLOSE_RATE_LIMITED = 4029
+# Standard close code telling clients to reconnect (to another worker)
+CLOSE_SERVICE_RESTART = 1012
+
+
+class ConnectionState:
+    """Bookkeeping of one interpretation socket for reaping and draining"""
+
+    __slots__ = (
+        "websocket", "user_id", "session_id",
+        "connected_at", "last_activity",
+        "busy", "closing",
+    )
+
+    def __init__(self, websocket: WebSocket, user_id: str):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.session_id: Optional[int] = None
+        self.connected_at = time.monotonic()
+        self.last_activity = self.connected_at
+        self.busy = False  # A frame is being processed
+        self.closing = False  # A close frame has been sent from outside the handler
+
+
+class ConnectionManager:
+    def __init__(self):
+        self.active_connections: dict[str, WebSocket] = {}  # Latest connection of each user
+        # Every open connection, keyed by id() of its socket (WebSocket is not hashable)
+        self.connections: dict[int, ConnectionState] = {}
+        self.draining = False
+        self._close_tasks: set[asyncio.Task] = set()
+
+    async def connect(self, websocket: WebSocket, user_id: str) -> ConnectionState:
+        # Don't accept here - already accepted
+        self.active_connections[user_id] = websocket
+        connection = self.connections[id(websocket)] = ConnectionState(websocket, user_id)
+        return connection
+
+    def disconnect(self, websocket: WebSocket) -> Optional[int]:
+        """Forget a connection; returns its session id if that still needs ending.
+
+        None when the connection was never registered or has already been
+        released by the reaper or shutdown, which end sessions themselves.
+        """
+        connection = self.connections.pop(id(websocket), None)
+        if connection is None:
+            return None
+        if self.active_connections.get(connection.user_id) is websocket:
+            del self.active_connections[connection.user_id]
+        return connection.session_id
+
+    def release(self, connections: list[ConnectionState]) -> list[int]:
+        """Forget connections whose sessions the caller ends in bulk"""
+        session_ids = []
+        for connection in connections:
+            session_id = self.disconnect(connection.websocket)
+            if session_id is not None:
+                session_ids.append(session_id)
+        return session_ids
+
+    def begin_frame(self, connection: ConnectionState) -> bool:
+        """Mark a frame as in flight; False if the connection is already being closed"""
+        if connection.closing:
+            return False
+        connection.busy = True
+        connection.last_activity = time.monotonic()
+        return True
+
+    def end_frame(self, connection: ConnectionState) -> bool:
+        """Mark the frame as done; True if the connection should now close for shutdown"""
+        connection.busy = False
+        if self.draining:
+            connection.closing = True
+            return True
+        return False
+
+    def close_in_background(self, connection: ConnectionState, code: int, reason: str) -> None:
+        """Send a close frame without waiting for the client's reply.
+
+        Closing waits for the peer's close frame (or a timeout on half-open
+        connections), so slow peers must not hold up the caller.
+        """
+        connection.closing = True
+        task = asyncio.create_task(self._close(connection.websocket, code, reason))
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
+
+    async def _close(self, websocket: WebSocket, code: int, reason: str):
+        try:
+            await websocket.close(code=code, reason=reason)
+        except Exception as close_error:
+            logger.debug("Error closing WebSocket: %s", close_error)
+
+    async def drain(self, timeout: float) -> list[int]:
+        """Close connections as their in-flight frames finish.
+
+        Idle connections are closed right away, busy ones by their handler
+        once the current frame's result is sent. Returns the sessions still
+        open when the timeout expires; their connections are released.
+        """
+        self.draining = True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.connections and loop.time() < deadline:
+            for connection in list(self.connections.values()):
+                if not connection.busy and not connection.closing:
+                    self.close_in_background(connection, CLOSE_SERVICE_RESTART, "Server shutting down")
+            await asyncio.sleep(0.05)
+        return self.release(list(self.connections.values()))
+
+    async def send_personal_message(self, message: dict, user_id: str):
+        if user_id in self.active_connections:
+            await self.active_connections[user_id].send_json(message)
+
+
+manager = ConnectionManager()
+WS_ACTIVE_CONNECTIONS.set_function(lambda: len(manager.connections))
+
+
+async def drain_connections(timeout: float) -> int:
+    """Let open sessions finish their current frame, then close them.
+
+    Sessions whose handler has not finished by the deadline are ended here.
+    Returns how many that were.
+    """
+    remaining = await manager.drain(timeout)
+    if remaining:
+        logger.warning("Ending sessions left open after drain", extra={"sessions": len(remaining)})
+        try:
+            await session_writer.end_sessions(remaining)
+        except Exception:
+            logger.exception("Error ending sessions on shutdown")
+    return len(remaining)
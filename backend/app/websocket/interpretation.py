@@ -2,32 +2,99 @@ from fastapi import WebSocket, WebSocketDisconnect, Query
 from datetime import datetime
 from typing import Optional
 from app.core.database import get_supabase_client, Client
-from app.services.stt import DeepgramSTTService
-from app.services.translation import TranslationService
+from app.services.providers import providers
+from app.services.sessions import SessionHistoryService
+from app.services.sessions.writer import session_writer
+from app.services.recording import SessionAudioRecorder
 from app.services.auth.supabase_auth_service import SupabaseAuthService
+from app.services.vocabulary import VocabularyIndex
+from app.services.translation_memory import TranslationMemory
+from app.services.usage import usage_meter, get_cached_user_plan
+from app.core.ratelimit import get_rate_limiter, WS_FRAME_RATE_LIMITS
+from app.models.subscription import SubscriptionPlan
+from app.core.config import settings
+from app.core.logging import start_trace, span
+from app.core.metrics import (
+    WS_CONNECT_SETUP_SECONDS,
+    AUDIO_TO_RESULT_SECONDS,
+)
+from .pacing import ChunkPacer
+from .overlap import OverlapTrimmer
+from .admission import release_admission
+from .connections import (
+    manager,
+    CLOSE_QUOTA_EXCEEDED,
+    CLOSE_RATE_LIMITED,
+    CLOSE_SERVICE_RESTART,
+)
+import asyncio
 import json
+import logging
+import math
+import time
 
+logger = logging.getLogger(__name__)
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: dict[str, WebSocket] = {}  # Changed to string for UUID
-    
-    async def connect(self, websocket: WebSocket, user_id: str):
-        # Don't accept here - already accepted
-        self.active_connections[user_id] = websocket
-    
-    def disconnect(self, user_id: str):
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
+
+def segment_bounds(transcription_result: Optional[dict], audio_offset: float,
+                   received_seconds: float) -> tuple[float, float, float]:
+    """Return (start, end, chunk_duration) in seconds from the start of the session.
+
+    Word timings are relative to the chunk, so they are shifted by the running
+    audio offset. Chunks without a reported duration, including those whose
+    transcription failed, last ``received_seconds`` (estimated from their size).
+    """
+    transcription_result = transcription_result or {}
+    words = transcription_result.get("words")
+    duration = transcription_result.get("duration") or received_seconds
     
-    async def send_personal_message(self, message: dict, user_id: str):
-        if user_id in self.active_connections:
-            await self.active_connections[user_id].send_json(message)
+    if words:
+        start = audio_offset + words.start
+        end = audio_offset + words.end
+    else:
+        start = audio_offset
+        end = audio_offset + duration
+    return start, end, duration
+
+
+def last_segment_end(supabase: Client, session_id: int) -> float:
+    """End of a session's last stored segment, 0.0 if it has none"""
+    last = (
+        supabase.table("transcripts")
+        .select("timestamp, end_timestamp")
+        .eq("session_id", session_id)
+        .order("id", desc=True)
+        .limit(1)
+        .execute()
+    )
+    if not last.data:
+        return 0.0
+    return last.data[0].get("end_timestamp") or last.data[0].get("timestamp") or 0.0
+
+
+async def close_for_quota(websocket: WebSocket, quota: str):
+    """Tell the client which quota was hit and close the socket cleanly"""
+    await websocket.send_json({
+        "type": "quota_exceeded",
+        "quota": quota,
+        "message": "Usage limit reached for your plan",
+    })
+    await websocket.close(code=CLOSE_QUOTA_EXCEEDED, reason=f"Quota exceeded: {quota}")
+    # Reuse the disconnect path to release the connection and end the session
+    raise WebSocketDisconnect(code=CLOSE_QUOTA_EXCEEDED)
+
+
+async def close_for_rate_limit(websocket: WebSocket, retry_after: float):
+    """Close a client that sends frames faster than its plan allows"""
+    retry_after = max(1, math.ceil(retry_after))
+    await websocket.close(code=CLOSE_RATE_LIMITED, reason=f"Rate limit exceeded; retry after {retry_after}s")
+    raise WebSocketDisconnect(code=CLOSE_RATE_LIMITED)
 
 
-manager = ConnectionManager()
-stt_service = DeepgramSTTService()
-translation_service = TranslationService()
+async def close_for_shutdown(websocket: WebSocket):
+    """Close after the last result so the client reconnects to another worker"""
+    await websocket.close(code=CLOSE_SERVICE_RESTART, reason="Server shutting down")
+    raise WebSocketDisconnect(code=CLOSE_SERVICE_RESTART)
 
 
 async def websocket_interpretation(
@@ -38,13 +105,23 @@ async def websocket_interpretation(
     session_id: Optional[int] = Query(None)
 ):
     """WebSocket endpoint for real-time interpretation"""
+    # Overload and shutdown are refused earlier, by AdmissionMiddleware
     # Accept connection first (required before any operations)
     await websocket.accept()
+    connect_started = time.perf_counter()
+    start_trace()
     
-    print(f"WebSocket connected: source={source_language}, target={target_language}, has_token={bool(token)}")
+    logger.info(
+        "WebSocket connected",
+        extra={"source_language": source_language, "target_language": target_language, "has_token": bool(token)}
+    )
     
     supabase = get_supabase_client()
     auth_service = SupabaseAuthService(supabase)
+    stt_service = providers.stt
+    translation_service = providers.translation
+    metered = False
+    recorder = None
     
     try:
         # Verify token with Supabase Auth
@@ -55,21 +132,19 @@ async def websocket_interpretation(
                 
             auth_user = supabase.auth.get_user(token)
             if not auth_user or not auth_user.user:
-                print("Auth user not found or invalid")
+                logger.warning("Auth user not found or invalid")
                 await websocket.close(code=1008, reason="Invalid token")
                 return
                 
-            print(f"Auth user verified: {auth_user.user.id}")
-        except Exception as auth_error:
-            print(f"Auth verification error: {auth_error}")
-            import traceback
-            traceback.print_exc()
+            logger.debug("Auth user verified", extra={"user_id": str(auth_user.user.id)})
+        except Exception:
+            logger.exception("Auth verification error")
             await websocket.close(code=1008, reason="Incorrect auth token")
             return
         
         user = await auth_service.get_user_by_id(str(auth_user.user.id))
         if not user:
-            print(f"User not found in database: {auth_user.user.id}")
+            logger.info("User not found in database", extra={"user_id": str(auth_user.user.id)})
             # Try to create user record if it doesn't exist
             try:
                 user_data = {
@@ -83,12 +158,12 @@ async def websocket_interpretation(
                 result = supabase.table("users").insert(user_data).execute()
                 if result.data:
                     user = result.data[0]
-                    print(f"Created user record: {user['id']}")
+                    logger.info("Created user record", extra={"user_id": user["id"]})
                 else:
                     await websocket.close(code=1008, reason="Failed to create user record")
                     return
-            except Exception as create_error:
-                print(f"Error creating user record: {create_error}")
+            except Exception:
+                logger.exception("Error creating user record")
                 await websocket.close(code=1008, reason="User record creation failed")
                 return
         
@@ -96,11 +171,10 @@ async def websocket_interpretation(
             await websocket.close(code=1008, reason="User account is inactive")
             return
         
-        print(f"User verified: {user['id']}")
-        
         # Add to connection manager (connection already accepted)
-        await manager.connect(websocket, user["id"])
-        print("Added to connection manager")
+        connection = await manager.connect(websocket, user["id"])
+        # Now counted by the manager instead of by its admission reservation
+        release_admission(websocket)
         
         # Create or get session
         session = None
@@ -108,34 +182,77 @@ async def websocket_interpretation(
             result = supabase.table("sessions").select("*").eq("id", session_id).execute()
             if result.data:
                 session = result.data[0]
-                print(f"Using existing session: {session_id}")
+                logger.info("Using existing session", extra={"session_id": session_id})
+        
+        # Running position in the session's audio, resumed after the last stored segment
+        audio_offset = 0.0
+        if session:
+            # Rows of an archived session are no longer in the hot table
+            manifest = SessionHistoryService.archive_manifest(session)
+            if manifest:
+                audio_offset = manifest.get("last_end") or 0.0
+            # Rows this worker has not written yet are ahead of the table
+            last_end = session_writer.latest_end(session["id"])
+            if last_end is None:
+                last_end = await asyncio.to_thread(last_segment_end, supabase, session["id"])
+            audio_offset = max(audio_offset, last_end)
         
         if not session:
             # Create new session
-            session_data = {
-                "user_id": user["id"],
-                "source_language": source_language,
-                "target_language": target_language,
-                "started_at": datetime.utcnow().isoformat(),
-                "created_at": datetime.utcnow().isoformat()
-            }
             try:
-                result = supabase.table("sessions").insert(session_data).execute()
-                if result.data:
-                    session = result.data[0]
-                    print(f"Created new session: {session['id']}")
+                session = await session_writer.create_session(user["id"], source_language, target_language)
+                if session:
+                    logger.info("Created new session", extra={"session_id": session["id"]})
                 else:
-                    print("Failed to create session - no data returned")
-            except Exception as session_error:
-                print(f"Error creating session: {session_error}")
-                import traceback
-                traceback.print_exc()
+                    logger.error("Failed to create session - no data returned")
+            except Exception:
+                logger.exception("Error creating session")
         
         if not session:
             await websocket.close(code=1008, reason="Failed to create session")
             return
+        connection.session_id = session["id"]
+        
+        if settings.AUDIO_RECORDING_ENABLED:
+            recorder = SessionAudioRecorder(session["id"])
+        
+        # Build the user's vocabulary index once for this session
+        vocabulary = None
+        if settings.VOCABULARY_HIGHLIGHT_ENABLED:
+            vocabulary = VocabularyIndex(supabase, user["id"], [source_language, target_language])
+            try:
+                await vocabulary.load()
+            except Exception as vocabulary_error:
+                logger.warning("Error loading vocabulary: %s", vocabulary_error)
+        
+        # Earlier translations of this user, reused for near-identical sentences
+        memory = None
+        if settings.TRANSLATION_MEMORY_ENABLED:
+            memory = TranslationMemory(supabase, user["id"], source_language, target_language)
+            try:
+                await memory.load()
+            except Exception as memory_error:
+                logger.warning("Error loading translation memory: %s", memory_error)
+        
+        # Load the user's usage for the current period; checks are in-memory from here on
+        if settings.USAGE_METERING_ENABLED:
+            try:
+                await usage_meter.open_account(supabase, user["id"])
+                metered = True
+            except Exception as usage_error:
+                logger.warning("Error loading usage: %s", usage_error)
+        session_audio_seconds = 0.0
         
-        print("WebSocket ready to receive audio data")
+        frame_limit = None
+        if settings.RATE_LIMIT_ENABLED:
+            try:
+                plan = await get_cached_user_plan(supabase, user["id"])
+            except Exception as plan_error:
+                logger.warning("Error loading plan: %s", plan_error)
+                plan = SubscriptionPlan.FREE
+            frame_limit = WS_FRAME_RATE_LIMITS[plan]
+            rate_limiter = get_rate_limiter()
+            rate_limit_key = f"ws:{user['id']}"
         
         # Send ready message to client
         await websocket.send_json({
@@ -143,24 +260,99 @@ async def websocket_interpretation(
             "message": "WebSocket connected and ready for audio",
             "session_id": session["id"]
         })
+        WS_CONNECT_SETUP_SECONDS.observe(time.perf_counter() - connect_started)
+        logger.info("WebSocket ready", extra={"user_id": user["id"], "session_id": session["id"]})
+        
+        if metered:
+            exceeded = usage_meter.check(user["id"])
+            if exceeded:
+                await close_for_quota(websocket, exceeded)
         
+        # Recommends chunk durations from this session's latencies
+        pacer = ChunkPacer() if settings.CHUNK_HINT_ENABLED else None
+        # Drops words a chunk repeats from the previous one
+        overlap = OverlapTrimmer() if settings.OVERLAP_DEDUP_ENABLED else None
+        
+        # Frames are numbered so clients can match results to the audio they sent
+        frame_sequence = 0
         while True:
             # Receive audio data
+            receive_started = time.perf_counter()
             data = await websocket.receive_bytes()
+            if not manager.begin_frame(connection):
+                # Shutdown or the reaper sent the close frame while this chunk was on its way
+                raise WebSocketDisconnect(code=CLOSE_SERVICE_RESTART)
+            frame_sequence += 1
+            frame_received = time.perf_counter()
+            # Each chunk is its own trace through STT, translation, persistence and send
+            start_trace()
+            
+            if frame_limit is not None:
+                retry_after = await rate_limiter.hit(rate_limit_key, frame_limit)
+                if retry_after > 0:
+                    await close_for_rate_limit(websocket, retry_after)
+            
+            exceeded = usage_meter.check(user["id"]) if metered else None
+            if exceeded:
+                await close_for_quota(websocket, exceeded)
             
             # Transcribe audio
-            transcription_result = await stt_service.transcribe_audio(data, source_language)
+            stt_started = time.perf_counter()
+            with span("stt", bytes=len(data)):
+                transcription_result = await stt_service.transcribe_audio(data, source_language)
+            stt_seconds = time.perf_counter() - stt_started
+            translation_seconds = 0.0
+            
+            # Seconds of audio this chunk repeats from the end of the previous one
+            overlap_seconds = 0.0
+            if overlap is not None:
+                if transcription_result:
+                    transcription_result, overlap_seconds = overlap.trim(transcription_result)
+                else:
+                    # The next chunk is not adjacent to the last transcribed one
+                    overlap.reset()
+            
+            # The session clock advances by the received audio, transcribed or not
+            chunk_offset = audio_offset - overlap_seconds
+            if recorder is not None:
+                # Stamped by the session clock, so recordings line up with transcript segments
+                recorder.append(data, chunk_offset)
+            segment_start, segment_end, chunk_duration = segment_bounds(
+                transcription_result, chunk_offset, len(data) / settings.AUDIO_STREAM_BYTES_PER_SECOND
+            )
+            audio_offset = chunk_offset + chunk_duration
+            session_audio_seconds += chunk_duration - overlap_seconds
+            if metered:
+                exceeded = usage_meter.record_audio(user["id"], chunk_duration - overlap_seconds)
+            if session_audio_seconds >= settings.MAX_AUDIO_DURATION_SECONDS:
+                exceeded = exceeded or "session_audio_seconds"
             
             if transcription_result and transcription_result.get("text"):
                 original_text = transcription_result["text"]
                 confidence = transcription_result.get("confidence", 0.0)
+                words = transcription_result.get("words")
                 
                 # Translate text
-                translated_text = await translation_service.translate(
-                    original_text,
-                    source_language,
-                    target_language
-                )
+                if metered:
+                    exceeded = usage_meter.record_characters(user["id"], len(original_text)) or exceeded
+                translated_text = None
+                if memory is not None:
+                    try:
+                        await memory.refresh_if_stale()
+                    except Exception as memory_error:
+                        logger.warning("Error refreshing translation memory: %s", memory_error)
+                    translated_text = memory.lookup(original_text)
+                if translated_text is None:
+                    translation_started = time.perf_counter()
+                    with span("translation", characters=len(original_text)):
+                        translated_text = await translation_service.translate(
+                            original_text,
+                            source_language,
+                            target_language
+                        )
+                    translation_seconds = time.perf_counter() - translation_started
+                    if memory is not None and translated_text:
+                        memory.add(original_text, translated_text)
                 
                 # Save transcript
                 transcript_data = {
@@ -169,32 +361,74 @@ async def websocket_interpretation(
                     "translated_text": translated_text,
                     "source_language": source_language,
                     "target_language": target_language,
-                    "timestamp": 0.0,  # Will be calculated from audio
+                    "timestamp": segment_start,
+                    "end_timestamp": segment_end,
                     "confidence": confidence,
+                    "word_timings": words.shifted(chunk_offset).to_bytes() if words else None,
                     "created_at": datetime.utcnow().isoformat()
                 }
-                supabase.table("transcripts").insert(transcript_data).execute()
+                # On disk in the transcript log before the client gets the result; written to the database in batches
+                with span("persist"):
+                    await session_writer.add_transcript(transcript_data)
                 
-                # Send results to client
-                await websocket.send_json({
+                event = {
                     "type": "transcription",
+                    "sequence": frame_sequence,
                     "original_text": original_text,
                     "translated_text": translated_text,
                     "confidence": confidence,
+                    "start": segment_start,
+                    "end": segment_end,
                     "timestamp": datetime.utcnow().isoformat(),
-                })
+                }
+                
+                # Highlight the user's vocabulary words
+                if vocabulary is not None:
+                    try:
+                        await vocabulary.refresh_if_stale()
+                    except Exception as vocabulary_error:
+                        logger.warning("Error refreshing vocabulary: %s", vocabulary_error)
+                    event["vocabulary_matches"] = {
+                        "original": vocabulary.find_matches(original_text, source_language),
+                        "translated": vocabulary.find_matches(translated_text, target_language),
+                    }
+                
+                # Send results to client
+                with span("send"):
+                    await websocket.send_json(event)
+                AUDIO_TO_RESULT_SECONDS.observe(time.perf_counter() - frame_received)
+            
+            if pacer is not None and transcription_result:
+                pacer.record(
+                    chunk_duration,
+                    frame_received - receive_started,
+                    stt_seconds,
+                    translation_seconds,
+                    time.perf_counter() - frame_received,
+                )
+                chunk_hint = pacer.recommend()
+                if chunk_hint is not None:
+                    await websocket.send_json(pacer.hint_message(chunk_hint))
+            
+            # Deliver the last result first, then stop once a limit is reached
+            if exceeded:
+                await close_for_quota(websocket, exceeded)
+            if manager.end_frame(connection):
+                await close_for_shutdown(websocket)
         
     except WebSocketDisconnect:
-        if "user" in locals():
-            manager.disconnect(user["id"])
-        # End session
-        if "session" in locals() and session:
-            supabase.table("sessions").update({
-                "ended_at": datetime.utcnow().isoformat()
-            }).eq("id", session["id"]).execute()
-    except Exception as e:
-        print(f"WebSocket error: {e}")
-        import traceback
-        traceback.print_exc()
-        if "user" in locals():
-            manager.disconnect(user["id"])
+        logger.info("WebSocket disconnected")
+    except Exception:
+        logger.exception("WebSocket error")
+    finally:
+        # End session, unless the reaper or shutdown already did
+        open_session_id = manager.disconnect(websocket)
+        if open_session_id is not None:
+            try:
+                await session_writer.end_sessions([open_session_id])
+            except Exception:
+                logger.exception("Error ending session")
+        if recorder is not None:
+            recorder.close()
+        if metered:
+            usage_meter.close_account(user["id"])
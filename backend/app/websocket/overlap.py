@@ -0,0 +1,97 @@
+from app.core.config import settings
+from app.core.metrics import OVERLAP_DEDUP_CHARACTERS
+from app.services.sessions.word_timings import WordTimings
+from typing import Dict, List, Optional, Tuple
+import re
+
+# A word cut by a chunk boundary ends and starts this close to it
+EDGE_SECONDS = 0.3
+# Matched word pairs must agree on the chunk overlap within this
+SHIFT_TOLERANCE_SECONDS = 0.25
+
+_EDGE_PUNCTUATION_RE = re.compile(r"^\W+|\W+$")
+
+
+def _normalize(word: str) -> str:
+    return _EDGE_PUNCTUATION_RE.sub("", word.lower())
+
+
+def _drop_words(text: str, count: int, total: int, kept: WordTimings) -> str:
+    tokens = text.split()
+    if len(tokens) == total:
+        # The transcript has one token per word: keep its punctuation and casing
+        return " ".join(tokens[count:])
+    return " ".join(kept.words())
+
+
+class OverlapTrimmer:
+    """Removes words a chunk repeats from the end of the previous chunk.
+
+    Clients that cut audio with an overlap, or a word that straddles a chunk
+    boundary, make the provider transcribe the same words twice. The
+    longest run of words at the end of the previous chunk that equals a run
+    at the start of the new one (ignoring case and punctuation) is trimmed
+    from the new result, before it is translated, stored and sent.
+
+    A run of several words must be timed consistently: every pair implies
+    the same overlap between the chunks, of at most half the previous
+    chunk. That overlap is returned with the result, so the session clock
+    and metered audio count the repeated audio once. A single word is only
+    trimmed when it touches the boundary in both chunks, since speakers do
+    repeat words; it implies no overlap.
+    """
+
+    def __init__(self, window: Optional[float] = None):
+        self.window = window or settings.OVERLAP_DEDUP_WINDOW_SECONDS
+        self._previous: Optional[WordTimings] = None
+        self._previous_duration = 0.0
+
+    def reset(self) -> None:
+        """Forget the previous chunk, e.g. when it could not be transcribed"""
+        self._previous = None
+        self._previous_duration = 0.0
+
+    def _overlap_length(self, previous: WordTimings, duration: float, words: WordTimings) -> Tuple[int, float]:
+        """Repeated word count and the chunk overlap in seconds they imply"""
+        tail = range(previous.in_range(duration - self.window, duration).start, len(previous))
+        head = range(words.in_range(0.0, self.window).stop)
+        tail_words = [_normalize(word) for word in previous.words(tail)]
+        head_words = [_normalize(word) for word in words.words(head)]
+
+        # Clients overlap chunks by a fraction of their length, never most of it
+        limit = min(self.window, duration / 2)
+        for count in range(min(len(tail_words), len(head_words)), 0, -1):
+            if tail_words[-count:] != head_words[:count]:
+                continue
+            first = len(previous) - count
+            if count == 1:
+                if previous.ends[first] >= duration - EDGE_SECONDS and words.starts[0] <= EDGE_SECONDS:
+                    return 1, 0.0
+                continue
+            # New-chunk time + duration - overlap = previous-chunk time, for every matched pair
+            overlaps: List[float] = [
+                words.starts[index] + duration - previous.starts[first + index] for index in range(count)
+            ]
+            if (max(overlaps) - min(overlaps) <= SHIFT_TOLERANCE_SECONDS
+                    and -SHIFT_TOLERANCE_SECONDS <= min(overlaps) <= max(overlaps) <= limit):
+                return count, max(0.0, sum(overlaps) / count)
+        return 0, 0.0
+
+    def trim(self, transcription: Dict) -> Tuple[Dict, float]:
+        """The transcription without the words repeated from the previous one,
+        and the seconds of audio the chunk repeats"""
+        words = transcription.get("words")
+        previous, previous_duration = self._previous, self._previous_duration
+        # The next chunk is compared with all of this one's words: it overlaps this one's end
+        duration = transcription.get("duration") or (words.end if words else 0.0)
+        self._previous, self._previous_duration = words or None, duration
+        if not words or not previous or not transcription.get("text"):
+            return transcription, 0.0
+
+        count, overlap = self._overlap_length(previous, previous_duration, words)
+        if not count:
+            return transcription, 0.0
+        kept = words.sliced(count)
+        text = _drop_words(transcription["text"], count, len(words), kept)
+        OVERLAP_DEDUP_CHARACTERS.inc(max(0, len(transcription["text"]) - len(text)))
+        return {**transcription, "text": text, "words": kept}, min(overlap, duration)
@@ -0,0 +1,113 @@
+from app.core.config import settings
+from app.core.metrics import WS_CHUNK_HINTS
+from typing import Dict, Optional
+import time
+
+# Chunks are sized so processing takes at most this share of their duration,
+# leaving headroom for latency spikes before a backlog builds
+TARGET_UTILIZATION = 0.7
+# A receive that waited at least this long found no queued frame
+IDLE_RECEIVE_SECONDS = 0.01
+# Frames observed before the first hint
+WARMUP_FRAMES = 3
+# Hints closer than this to the previous one are not sent, unless the client cannot keep up
+MIN_HINT_CHANGE = 0.1
+
+
+def _smooth(previous: Optional[float], value: float, alpha: float) -> float:
+    return value if previous is None else previous + alpha * (value - previous)
+
+
+class ChunkPacer:
+    """Recommends a chunk duration to one interpretation client.
+
+    Each chunk costs a roughly fixed STT and translation round trip. Chunks
+    much shorter than that round trip arrive faster than they are processed
+    and queue up; much longer chunks make the listener wait for audio to
+    accumulate. End-to-end latency is estimated as chunk duration + queued
+    work + processing time. Whenever it leaves the target band, the pacer
+    recommends the chunk that puts it at the middle of the band. The
+    recommendation is never shorter than processing can keep up with, since
+    a backlog would grow without bound.
+
+    The queued work is a Lindley recursion. Clients stream in real time, so
+    a chunk of ``d`` seconds arrives ``d`` seconds after the previous one,
+    and work that takes longer carries over to the next chunk. A receive
+    that had to wait means the queue was empty.
+    """
+
+    def __init__(self, low: Optional[float] = None, high: Optional[float] = None,
+                 min_chunk: Optional[float] = None, max_chunk: Optional[float] = None,
+                 interval: Optional[float] = None, alpha: float = 0.3):
+        self.low = low or settings.CHUNK_HINT_TARGET_LATENCY_LOW_SECONDS
+        self.high = high or settings.CHUNK_HINT_TARGET_LATENCY_HIGH_SECONDS
+        self.min_chunk = min_chunk or settings.CHUNK_HINT_MIN_SECONDS
+        self.max_chunk = max_chunk or settings.CHUNK_HINT_MAX_SECONDS
+        self.interval = settings.CHUNK_HINT_INTERVAL_SECONDS if interval is None else interval
+        self.alpha = alpha
+        self.frames = 0
+        self.chunk_seconds: Optional[float] = None
+        self.stt_seconds: Optional[float] = None
+        self.translation_seconds: Optional[float] = None
+        self.processing_seconds: Optional[float] = None
+        self.backlog_seconds = 0.0
+        self.hint: Optional[float] = None
+        self._hinted_at = float("-inf")
+
+    @property
+    def queue_depth(self) -> float:
+        """Chunks waiting behind the current one"""
+        return self.backlog_seconds / self.chunk_seconds if self.chunk_seconds else 0.0
+
+    @property
+    def latency(self) -> float:
+        """Estimated seconds from speech to its result on the client"""
+        return (self.chunk_seconds or 0.0) + self.backlog_seconds + (self.processing_seconds or 0.0)
+
+    def record(self, chunk_seconds: float, receive_wait: float, stt_seconds: float,
+               translation_seconds: float, processing_seconds: float) -> None:
+        """Add one processed chunk; ``receive_wait`` is how long the receive for it blocked"""
+        if chunk_seconds <= 0:
+            return
+        if receive_wait >= IDLE_RECEIVE_SECONDS:
+            self.backlog_seconds = 0.0
+        self.backlog_seconds = max(0.0, self.backlog_seconds + processing_seconds - chunk_seconds)
+
+        self.frames += 1
+        self.chunk_seconds = _smooth(self.chunk_seconds, chunk_seconds, self.alpha)
+        self.stt_seconds = _smooth(self.stt_seconds, stt_seconds, self.alpha)
+        self.processing_seconds = _smooth(self.processing_seconds, processing_seconds, self.alpha)
+        if translation_seconds:
+            self.translation_seconds = _smooth(self.translation_seconds, translation_seconds, self.alpha)
+
+    def recommend(self, now: Optional[float] = None) -> Optional[float]:
+        """A new chunk duration for the client, or None to keep the current one"""
+        now = time.monotonic() if now is None else now
+        if self.frames < WARMUP_FRAMES or now - self._hinted_at < self.interval:
+            return None
+        if self.low <= self.latency <= self.high:
+            return None
+
+        keeps_up = self.processing_seconds / TARGET_UTILIZATION
+        centred = (self.low + self.high) / 2 - self.processing_seconds
+        hint = round(min(self.max_chunk, max(self.min_chunk, keeps_up, centred)), 2)
+
+        current = self.hint or self.chunk_seconds
+        if hint == self.hint or (abs(hint - current) < MIN_HINT_CHANGE * current and current >= keeps_up):
+            return None
+        WS_CHUNK_HINTS.labels("longer" if hint > current else "shorter").inc()
+        self.hint = hint
+        self._hinted_at = now
+        return hint
+
+    def hint_message(self, chunk_seconds: float) -> Dict:
+        return {
+            "type": "chunk_hint",
+            "chunk_seconds": chunk_seconds,
+            "latency_seconds": {
+                "stt": round(self.stt_seconds or 0.0, 3),
+                "translation": round(self.translation_seconds or 0.0, 3),
+                "end_to_end": round(self.latency, 3),
+            },
+            "queue_depth": round(self.queue_depth, 2),
+        }
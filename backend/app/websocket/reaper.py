@@ -0,0 +1,95 @@
+from app.core.config import settings
+from app.core.metrics import WS_REAPED_CONNECTIONS
+from app.services.sessions.writer import session_writer
+from .connections import (
+    manager,
+    ConnectionManager,
+    CLOSE_IDLE_TIMEOUT,
+    CLOSE_SESSION_TIMEOUT,
+)
+from typing import Optional
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+REASON_IDLE = "idle"
+REASON_SESSION_TIMEOUT = "session_timeout"
+
+
+class ConnectionReaper:
+    """Closes interpretation sockets that stopped sending audio or ran too long.
+
+    Dead connections (the ping/pong heartbeat failed) are closed by the server
+    itself; this covers clients that still answer pings but send nothing, and
+    sessions past their wall-clock limit. Sessions found in one pass are
+    ended with a single update.
+    """
+
+    def __init__(self, connection_manager: ConnectionManager = manager,
+                 interval: Optional[float] = None):
+        self.manager = connection_manager
+        self.interval = interval or settings.WS_REAPER_INTERVAL_SECONDS
+        self._task: Optional[asyncio.Task] = None
+
+    def expired(self, now: Optional[float] = None) -> dict:
+        """Connections to reap, mapped to the reason"""
+        now = time.monotonic() if now is None else now
+        idle_timeout = settings.WS_IDLE_TIMEOUT_SECONDS
+        session_timeout = settings.ws_session_timeout_seconds
+        expired = {}
+        for connection in list(self.manager.connections.values()):
+            # A frame in progress is activity; check again on the next pass
+            if connection.busy or connection.closing:
+                continue
+            if now - connection.connected_at >= session_timeout:
+                expired[id(connection.websocket)] = (connection, REASON_SESSION_TIMEOUT)
+            elif now - connection.last_activity >= idle_timeout:
+                expired[id(connection.websocket)] = (connection, REASON_IDLE)
+        return expired
+
+    async def reap(self) -> int:
+        """Close expired connections and end their sessions; returns how many"""
+        expired = self.expired()
+        if not expired:
+            return 0
+
+        for connection, reason in expired.values():
+            if reason == REASON_IDLE:
+                self.manager.close_in_background(connection, CLOSE_IDLE_TIMEOUT, "Idle timeout")
+            else:
+                self.manager.close_in_background(connection, CLOSE_SESSION_TIMEOUT, "Session time limit reached")
+            WS_REAPED_CONNECTIONS.labels(reason).inc()
+
+        session_ids = self.manager.release([connection for connection, _ in expired.values()])
+        if session_ids:
+            await session_writer.end_sessions(session_ids)
+        logger.info("Reaped connections", extra={"connections": len(expired), "sessions": len(session_ids)})
+        return len(expired)
+
+    async def _reap_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reap()
+            except Exception:
+                logger.exception("Connection reaper error")
+
+    def start(self) -> None:
+        """Start the periodic reaping task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._reap_loop())
+
+    async def stop(self) -> None:
+        """Stop the reaping task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+connection_reaper = ConnectionReaper()
@@ -0,0 +1,5 @@
+"""Performance benchmarks for the backend.
+
+Each module is runnable on its own, e.g. ``python -m benchmarks.transcript_search``,
+from the ``backend/`` directory.
+"""
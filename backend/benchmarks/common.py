@@ -0,0 +1,43 @@
+from typing import Sequence, List, Dict
+import math
+import os
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100); 0.0 for an empty sample"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """p50/p95/p99/max summary of a latency sample"""
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
+
+
+def format_table(headers: List[str], rows: List[List]) -> str:
+    """Render rows as a fixed-width text table"""
+    cells = [[str(cell) for cell in row] for row in rows]
+    widths = [
+        max(len(header), *(len(row[index]) for row in cells)) if cells else len(header)
+        for index, header in enumerate(headers)
+    ]
+    lines = [
+        "  ".join(header.ljust(width) for header, width in zip(headers, widths)),
+        "  ".join("-" * width for width in widths),
+    ]
+    lines.extend("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in cells)
+    return "\n".join(lines)
+
+
+def default_dsn() -> str:
+    """Postgres DSN for benchmarks that need a database"""
+    return os.environ.get("BENCHMARK_DATABASE_URL") or os.environ.get("DATABASE_URL", "")
@@ -0,0 +1,296 @@
+"""Component micro-benchmarks with stored baselines and regression checks.
+
+Covers the per-request and per-chunk building blocks: TranslationService
+fallback logic, Deepgram response parsing, word timing packing, get_current_user resolution, JWT
+encode/decode and transcription event serialization. Providers and Supabase
+are replaced with in-memory fakes, so only our own code is timed.
+
+Usage (from backend/):
+    python -m benchmarks.micro                       # run and print
+    python -m benchmarks.micro --filter jwt          # subset
+    python -m benchmarks.micro --save-baseline       # record benchmarks/baselines/micro.json
+    python -m benchmarks.micro --check --threshold 25
+
+``--check`` exits with status 1 when a benchmark is slower than its baseline
+by more than the threshold percentage (default BENCHMARK_REGRESSION_THRESHOLD
+or 20). Baselines are machine-specific; record them on the machine that runs
+the check.
+"""
+from benchmarks.common import format_table
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+from fastapi.security import HTTPAuthorizationCredentials
+from deepgram import PrerecordedResponse
+
+from app.api.dependencies import get_current_user
+from app.core.security.jwt import create_access_token, decode_token
+from app.services.stt import DeepgramSTTService
+from app.services.translation import TranslationService
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "micro.json"
+DEFAULT_THRESHOLD = float(os.environ.get("BENCHMARK_REGRESSION_THRESHOLD", "20"))
+
+
+# ---------------------------------------------------------------------------
+# Fakes
+# ---------------------------------------------------------------------------
+
+class _FakeTranslator:
+    def __init__(self, result: Optional[str]):
+        self.result = result
+        self.client = object()
+
+    async def translate(self, text: str, source_language: str, target_language: str) -> Optional[str]:
+        return self.result
+
+
+def _translation_service(deepl_result: Optional[str]) -> TranslationService:
+    service = TranslationService.__new__(TranslationService)
+    service.deepl = _FakeTranslator(deepl_result)
+    service.azure = _FakeTranslator("hello world from azure")
+    return service
+
+
+def _deepgram_response(word_count: int = 20) -> PrerecordedResponse:
+    words = [
+        {
+            "word": f"word{index}",
+            "start": index * 0.3,
+            "end": index * 0.3 + 0.25,
+            "confidence": 0.98,
+            "punctuated_word": f"word{index}",
+        }
+        for index in range(word_count)
+    ]
+    payload = {
+        "metadata": {
+            "transaction_key": "", "request_id": "bench", "sha256": "", "created": "",
+            "duration": word_count * 0.3, "channels": 1, "models": [], "model_info": {},
+        },
+        "results": {
+            "channels": [{
+                "alternatives": [{
+                    "transcript": " ".join(word["word"] for word in words),
+                    "confidence": 0.98,
+                    "words": words,
+                }]
+            }]
+        },
+    }
+    return PrerecordedResponse.from_json(json.dumps(payload))
+
+
+class _UsersQuery:
+    def __init__(self, users: Dict[str, Dict]):
+        self.users = users
+        self.user_id = None
+
+    def select(self, *args, **kwargs) -> "_UsersQuery":
+        return self
+
+    def eq(self, column: str, value) -> "_UsersQuery":
+        self.user_id = str(value)
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        user = self.users.get(self.user_id)
+        return SimpleNamespace(data=[dict(user)] if user else [])
+
+
+class _AuthSupabase:
+    """Just the calls get_current_user makes. The simulated Supabase client adds
+    its lock and simulator metrics, which would be timed as ours."""
+
+    def __init__(self):
+        self.users = {"bench-user": {
+            "id": "bench-user", "email": "token@bench.local", "full_name": "Bench", "is_active": True,
+        }}
+        self.auth = SimpleNamespace(get_user=lambda token: SimpleNamespace(user=SimpleNamespace(id="bench-user")))
+
+    def table(self, name: str) -> _UsersQuery:
+        return _UsersQuery(self.users)
+
+
+TRANSCRIPTION_EVENT = {
+    "type": "transcription",
+    "original_text": "Necesitamos confirmar la reunión del contrato mañana por la mañana.",
+    "translated_text": "We need to confirm the contract meeting tomorrow morning.",
+    "confidence": 0.97,
+    "start": 12.48,
+    "end": 16.02,
+    "timestamp": "2026-01-01T12:00:00.000000",
+    "vocabulary_matches": {
+        "original": [{"start": 37, "end": 45, "word": "contrato", "entry_id": 12}],
+        "translated": [{"start": 23, "end": 31, "word": "contract", "entry_id": 13}],
+    },
+}
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def build_benchmarks() -> Dict[str, Callable]:
+    """Name -> zero-argument callable (sync) or coroutine function (async)"""
+    deepl_hit = _translation_service("hello world")
+    azure_fallback = _translation_service(None)
+    deepgram_response = _deepgram_response()
+    word_timings = DeepgramSTTService.parse_response(deepgram_response)["words"]
+    supabase = _AuthSupabase()
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+    token = create_access_token({"sub": "bench-user", "email": "user@bench.local"})
+
+    return {
+        "translation.deepl_hit": lambda: deepl_hit.translate("hola mundo", "es", "en"),
+        "translation.azure_fallback": lambda: azure_fallback.translate("hola mundo", "es", "en"),
+        # The SDK call itself runs in the provider thread pool; only parsing is ours
+        "deepgram.parse_response": lambda: DeepgramSTTService.parse_response(deepgram_response),
+        # Per stored transcript: move word times to the session clock and pack them for the column
+        "word_timings.pack": lambda: word_timings.shifted(12.0).to_bytes(),
+        "auth.get_current_user": lambda: get_current_user(credentials=credentials, supabase=supabase),
+        "jwt.encode_access": lambda: create_access_token({"sub": "bench-user", "email": "user@bench.local"}),
+        "jwt.decode": lambda: decode_token(token),
+        "events.serialize_transcription": lambda: json.dumps(
+            TRANSCRIPTION_EVENT, separators=(",", ":"), ensure_ascii=False
+        ),
+    }
+
+
+def _time_batch(loop: asyncio.AbstractEventLoop, function: Callable, number: int, is_async: bool) -> float:
+    """Seconds taken by ``number`` calls; coroutines are awaited in one task"""
+    if is_async:
+        async def batch():
+            for _ in range(number):
+                await function()
+        started = time.perf_counter()
+        loop.run_until_complete(batch())
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(number):
+        function()
+    return time.perf_counter() - started
+
+
+def measure(loop: asyncio.AbstractEventLoop, function: Callable,
+            rounds: int = 9, min_round_seconds: float = 0.2) -> Dict[str, float]:
+    """Best and median ns/op over several rounds of an auto-sized batch.
+
+    The best round is what gets compared: noise from other processes only
+    ever makes a round slower, so the minimum is the most repeatable figure.
+    """
+    probe = function()
+    is_async = asyncio.iscoroutine(probe)
+    if is_async:
+        loop.run_until_complete(probe)
+
+    number = 1
+    while _time_batch(loop, function, number, is_async) < min_round_seconds:
+        number *= 10
+    samples = [_time_batch(loop, function, number, is_async) / number * 1e9 for _ in range(rounds)]
+    return {
+        "ns_per_op": round(min(samples), 1),
+        "median_ns_per_op": round(statistics.median(samples), 1),
+        "iterations": number,
+    }
+
+
+def run_benchmarks(name_filter: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    loop = asyncio.new_event_loop()
+    try:
+        results = {}
+        for name, function in build_benchmarks().items():
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = measure(loop, function)
+        return results
+    finally:
+        loop.close()
+
+
+# ---------------------------------------------------------------------------
+# Baselines
+# ---------------------------------------------------------------------------
+
+def load_baseline(path: Path) -> Dict:
+    if not path.exists():
+        return {"benchmarks": {}}
+    with open(path) as source:
+        return json.load(source)
+
+
+def save_baseline(path: Path, results: Dict[str, Dict[str, float]]) -> None:
+    baseline = load_baseline(path)
+    baseline["meta"] = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(terse=True),
+        "recorded_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+    }
+    for name, result in results.items():
+        baseline["benchmarks"][name] = {"ns_per_op": result["ns_per_op"]}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as target:
+        json.dump(baseline, target, indent=2, sort_keys=True)
+        target.write("\n")
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict, threshold: float) -> List[List]:
+    """Table rows of (name, baseline, current, change %, status)"""
+    rows = []
+    for name, result in results.items():
+        reference = baseline["benchmarks"].get(name)
+        current = result["ns_per_op"]
+        if reference is None:
+            rows.append([name, "-", f"{current:,.0f}", "-", "new"])
+            continue
+        change = (current / reference["ns_per_op"] - 1) * 100
+        status = "REGRESSION" if change > threshold else "ok"
+        rows.append([name, f"{reference['ns_per_op']:,.0f}", f"{current:,.0f}", f"{change:+.1f}%", status])
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown in percent")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.filter)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        rows = compare(results, load_baseline(args.baseline), args.threshold)
+        print(format_table(["benchmark", "baseline ns/op", "ns/op", "change", "status"], rows))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+
+    if args.check:
+        regressions = [row[0] for row in compare(results, load_baseline(args.baseline), args.threshold)
+                       if row[4] == "REGRESSION"]
+        if regressions:
+            print(f"Regressed beyond {args.threshold:g}%: {', '.join(regressions)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Benchmark transcript ingestion: per-row INSERT vs. prepared executemany vs. COPY.
+
+Writes synthetic transcript rows into a scratch ``bench_ingest`` schema three
+ways and reports rows/s for each:
+
+* ``insert``      - one INSERT per row, as the WebSocket handler used to do
+* ``executemany`` - one prepared INSERT executed for a whole batch
+* ``copy``        - ``copy_transcripts`` from the session writer (COPY FROM STDIN)
+
+Usage (from backend/):
+    python -m benchmarks.transcript_ingest --dsn postgresql://localhost/bench
+    python -m benchmarks.transcript_ingest --rows 50000 --batch-size 500 --drop
+"""
+from benchmarks.common import summarize, format_table, default_dsn
+from app.services.sessions.writer import copy_transcripts, TRANSCRIPT_COLUMNS
+from app.services.sessions.word_timings import WordTimings
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+import asyncpg
+
+SCHEMA = "bench_ingest"
+
+TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id SERIAL PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    source_language VARCHAR NOT NULL,
+    target_language VARCHAR NOT NULL,
+    started_at TIMESTAMPTZ DEFAULT NOW(),
+    ended_at TIMESTAMPTZ,
+    metadata JSONB,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS transcripts (
+    id SERIAL PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    original_text TEXT NOT NULL,
+    translated_text TEXT,
+    source_language VARCHAR NOT NULL,
+    target_language VARCHAR NOT NULL,
+    timestamp DOUBLE PRECISION NOT NULL,
+    end_timestamp DOUBLE PRECISION,
+    confidence DOUBLE PRECISION,
+    word_timings BYTEA,
+    write_id UUID,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS ix_transcripts_session_id ON transcripts(session_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_transcripts_write_id ON transcripts(write_id);
+"""
+
+INSERT_SQL = """
+INSERT INTO transcripts (
+    session_id, original_text, translated_text, source_language, target_language,
+    timestamp, end_timestamp, confidence, word_timings, write_id, created_at
+) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+"""
+
+WORDS = [
+    "meeting", "contract", "doctor", "appointment", "schedule", "quarterly", "report",
+    "budget", "flight", "delayed", "hotel", "reservation", "invoice", "payment",
+    "the", "a", "we", "need", "to", "is", "will", "be", "for", "our", "with", "about",
+]
+
+
+def make_rows(count: int, sessions: int, seed: int = 7) -> list:
+    """Transcript rows shaped like the ones the WebSocket handler produces"""
+    rng = random.Random(seed)
+    started = datetime(2024, 1, 1)
+    rows = []
+    for index in range(count):
+        tokens = [rng.choice(WORDS) for _ in range(rng.randint(6, 16))]
+        text = " ".join(tokens)
+        offset = float(index % 3600)
+        words = WordTimings.from_words(
+            SimpleNamespace(word=token, start=offset + position * 0.3, end=offset + position * 0.3 + 0.25,
+                            confidence=0.9)
+            for position, token in enumerate(tokens)
+        )
+        rows.append({
+            "session_id": 1 + index % sessions,
+            "original_text": text,
+            "translated_text": text.upper(),
+            "source_language": "en",
+            "target_language": "es",
+            "timestamp": offset,
+            "end_timestamp": offset + 2.5,
+            "confidence": 0.9,
+            "word_timings": words.to_bytes(),
+            "write_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "created_at": (started + timedelta(seconds=index)).isoformat(),
+        })
+    return rows
+
+
+def as_record(row: dict) -> tuple:
+    return tuple(
+        datetime.fromisoformat(row[column]) if column == "created_at" else row[column]
+        for column in TRANSCRIPT_COLUMNS
+    )
+
+
+async def write_insert(conn, batch: list) -> None:
+    for row in batch:
+        await conn.execute(INSERT_SQL, *as_record(row))
+
+
+async def write_executemany(conn, batch: list) -> None:
+    await conn.executemany(INSERT_SQL, [as_record(row) for row in batch])
+
+
+async def write_copy(conn, batch: list) -> None:
+    await copy_transcripts(conn, batch)
+
+
+METHODS = {
+    "insert": write_insert,
+    "executemany": write_executemany,
+    "copy": write_copy,
+}
+
+
+async def time_method(conn, write, rows: list, batch_size: int) -> tuple:
+    """Total seconds and per-batch latencies (ms) for writing all rows"""
+    await conn.execute("TRUNCATE transcripts RESTART IDENTITY")
+    latencies = []
+    started = time.perf_counter()
+    for first in range(0, len(rows), batch_size):
+        batch_started = time.perf_counter()
+        async with conn.transaction():
+            await write(conn, rows[first:first + batch_size])
+        latencies.append((time.perf_counter() - batch_started) * 1000)
+    return time.perf_counter() - started, latencies
+
+
+async def run(args) -> None:
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+        await conn.execute(f"SET search_path TO {SCHEMA}, public")
+        await conn.execute(TABLES_SQL)
+        await conn.execute(
+            "INSERT INTO sessions (user_id, source_language, target_language) "
+            "SELECT 'user-' || g, 'en', 'es' FROM generate_series(1, $1) AS g",
+            args.sessions,
+        )
+
+        rows = make_rows(args.rows, args.sessions)
+        results = []
+        for name in args.methods:
+            elapsed, latencies = await time_method(conn, METHODS[name], rows, args.batch_size)
+            written = await conn.fetchval("SELECT count(*) FROM transcripts")
+            batch = summarize(latencies)
+            results.append([
+                name,
+                written,
+                f"{elapsed:.2f}",
+                f"{written / elapsed:,.0f}",
+                f"{batch['p50']:.1f}",
+                f"{batch['p95']:.1f}",
+            ])
+
+        print(f"\n{args.rows:,} transcript rows in batches of {args.batch_size}\n")
+        print(format_table(["method", "rows", "seconds", "rows/s", "batch p50 ms", "batch p95 ms"], results))
+
+        if args.drop:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=default_dsn(), help="Postgres DSN (default: $DATABASE_URL)")
+    parser.add_argument("--rows", type=int, default=20_000, help="Transcript rows to write per method")
+    parser.add_argument("--sessions", type=int, default=100, help="Sessions the rows are spread over")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per transaction")
+    parser.add_argument("--methods", nargs="+", choices=list(METHODS), default=list(METHODS),
+                        help="Write methods to compare")
+    parser.add_argument("--drop", action="store_true", help="Drop the scratch schema when done")
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or DATABASE_URL is required")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
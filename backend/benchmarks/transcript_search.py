@@ -0,0 +1,266 @@
+"""Benchmark transcript search: ILIKE scan vs. tsvector/GIN full-text search.
+
+Builds a synthetic corpus (1,000,000 transcript rows by default) in a scratch
+``bench_search`` schema using the exact DDL from alembic revision
+``002_transcript_search``, then times the same user-scoped searches both ways.
+
+Usage (from backend/):
+    python -m benchmarks.transcript_search --dsn postgresql://localhost/bench
+    python -m benchmarks.transcript_search --rows 1000000 --repeat 20 --drop
+
+The corpus is reused between runs unless ``--rebuild`` is given.
+"""
+from benchmarks.common import summarize, format_table, default_dsn
+from pathlib import Path
+import argparse
+import asyncio
+import ast
+import json
+import time
+
+import asyncpg
+
+SCHEMA = "bench_search"
+
+MIGRATION_PATH = (
+    Path(__file__).resolve().parent.parent / "alembic" / "versions" / "002_transcript_search.py"
+)
+
+ENGLISH_WORDS = [
+    "meeting", "contract", "doctor", "appointment", "schedule", "quarterly", "report",
+    "budget", "flight", "delayed", "hotel", "reservation", "invoice", "payment",
+    "customer", "support", "weather", "tomorrow", "morning", "please", "confirm",
+    "price", "delivery", "address", "medicine", "pharmacy", "insurance", "policy",
+    "interview", "candidate", "training", "project", "deadline", "review", "the",
+    "a", "we", "need", "to", "is", "will", "be", "for", "our", "with", "about",
+]
+
+SPANISH_WORDS = [
+    "reunión", "contrato", "médico", "cita", "horario", "trimestral", "informe",
+    "presupuesto", "vuelo", "retrasado", "hotel", "reserva", "factura", "pago",
+    "cliente", "soporte", "clima", "mañana", "temprano", "por", "favor", "confirmar",
+    "precio", "entrega", "dirección", "medicina", "farmacia", "seguro", "póliza",
+    "entrevista", "candidato", "capacitación", "proyecto", "plazo", "revisión", "el",
+    "la", "necesitamos", "es", "será", "para", "nuestro", "con", "sobre",
+]
+
+QUERIES = [
+    ("en", "contract"),
+    ("en", "quarterly report"),
+    ("en", '"flight delayed"'),
+    ("es", "factura"),
+    ("es", "médico -farmacia"),
+]
+
+TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id SERIAL PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    source_language VARCHAR NOT NULL,
+    target_language VARCHAR NOT NULL,
+    started_at TIMESTAMPTZ DEFAULT NOW(),
+    ended_at TIMESTAMPTZ,
+    metadata JSONB,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS ix_sessions_user_id ON sessions(user_id);
+
+CREATE TABLE IF NOT EXISTS transcripts (
+    id SERIAL PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    original_text TEXT NOT NULL,
+    translated_text TEXT,
+    source_language VARCHAR NOT NULL,
+    target_language VARCHAR NOT NULL,
+    timestamp DOUBLE PRECISION NOT NULL,
+    confidence DOUBLE PRECISION,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS ix_transcripts_session_id ON transcripts(session_id);
+"""
+
+# Sentences are drawn per row from the word arrays; the inner generate_series
+# references g so Postgres re-evaluates the subquery for every row.
+INSERT_TRANSCRIPTS_SQL = """
+INSERT INTO transcripts (
+    session_id, original_text, translated_text, source_language, target_language,
+    timestamp, confidence
+)
+SELECT
+    1 + (g % $3),
+    (SELECT string_agg(src[1 + floor(random() * array_length(src, 1))::int], ' ')
+       FROM generate_series(1, 6 + (g % 10))),
+    (SELECT string_agg(dst[1 + floor(random() * array_length(dst, 1))::int], ' ')
+       FROM generate_series(1, 6 + (g % 10))),
+    CASE WHEN g % 2 = 0 THEN 'en' ELSE 'es' END,
+    CASE WHEN g % 2 = 0 THEN 'es' ELSE 'en' END,
+    (g % 3600)::double precision,
+    0.9
+FROM generate_series($1::int, $2::int) AS g,
+     LATERAL (SELECT
+         CASE WHEN g % 2 = 0 THEN $4::text[] ELSE $5::text[] END AS src,
+         CASE WHEN g % 2 = 0 THEN $5::text[] ELSE $4::text[] END AS dst
+     ) AS words
+"""
+
+ILIKE_SQL = """
+SELECT t.id
+FROM transcripts t
+JOIN sessions s ON s.id = t.session_id
+WHERE s.user_id = $1
+  AND (t.original_text ILIKE $2 OR t.translated_text ILIKE $2)
+ORDER BY t.id DESC
+LIMIT $3
+"""
+
+FTS_SQL = "SELECT * FROM search_transcripts($1, $2, $3, $4)"
+
+
+def load_migration_sql() -> dict:
+    """Read the *_SQL string constants from the search migration without importing alembic"""
+    tree = ast.parse(MIGRATION_PATH.read_text())
+    statements = {}
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id.endswith("_SQL")
+            and isinstance(node.value, ast.Constant)
+        ):
+            statements[node.targets[0].id] = node.value.value
+    return statements
+
+
+async def build_corpus(conn, rows: int, users: int, batch_size: int) -> None:
+    migration = load_migration_sql()
+    await conn.execute(TABLES_SQL)
+
+    existing = await conn.fetchval("SELECT count(*) FROM transcripts")
+    if existing >= rows:
+        print(f"Reusing existing corpus of {existing:,} rows")
+        return
+
+    sessions = max(1, rows // 200)
+    await conn.execute("TRUNCATE transcripts, sessions RESTART IDENTITY")
+    await conn.execute(
+        "INSERT INTO sessions (user_id, source_language, target_language, ended_at) "
+        "SELECT 'user-' || (g % $1), 'en', 'es', NOW() FROM generate_series(1, $2) AS g",
+        users, sessions,
+    )
+
+    # Load without indexes, then build them once, like a real backfill would
+    await conn.execute("DROP INDEX IF EXISTS ix_transcripts_original_tsv")
+    await conn.execute("DROP INDEX IF EXISTS ix_transcripts_translated_tsv")
+    await conn.execute(migration["SEARCH_CONFIG_FUNCTION_SQL"])
+    await conn.execute(migration["ADD_SEARCH_COLUMNS_SQL"])
+
+    started = time.perf_counter()
+    for first in range(1, rows + 1, batch_size):
+        last = min(rows, first + batch_size - 1)
+        await conn.execute(INSERT_TRANSCRIPTS_SQL, first, last, sessions, ENGLISH_WORDS, SPANISH_WORDS)
+        print(f"  loaded {last:,}/{rows:,} rows ({time.perf_counter() - started:.1f}s)")
+
+    index_started = time.perf_counter()
+    await conn.execute(migration["CREATE_SEARCH_INDEXES_SQL"])
+    print(f"Built GIN indexes in {time.perf_counter() - index_started:.1f}s")
+    await conn.execute("ANALYZE sessions")
+    await conn.execute("ANALYZE transcripts")
+
+
+async def time_query(conn, sql: str, args: tuple, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await conn.fetch(sql, *args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def plan_summary(conn, sql: str, args: tuple) -> str:
+    """Node types of the executed plan, outermost first"""
+    plan = await conn.fetchval(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", *args)
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    nodes = []
+    pending = [plan[0]["Plan"]]
+    while pending:
+        node = pending.pop(0)
+        name = node["Node Type"]
+        if node.get("Index Name"):
+            name += f" ({node['Index Name']})"
+        nodes.append(name)
+        pending.extend(node.get("Plans", []))
+    return " > ".join(nodes)
+
+
+async def run(args) -> None:
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        if args.rebuild:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}")
+        await conn.execute(f"SET search_path TO {SCHEMA}, public")
+
+        await build_corpus(conn, args.rows, args.users, args.batch_size)
+        await conn.execute(load_migration_sql()["SEARCH_FUNCTION_SQL"])
+
+        user_id = "user-1"
+        rows = []
+        for language, query in QUERIES:
+            like_term = "%" + query.strip('"').split()[0] + "%"
+            ilike = summarize(await time_query(conn, ILIKE_SQL, (user_id, like_term, args.limit), args.repeat))
+            fts = summarize(await time_query(conn, FTS_SQL, (user_id, query, language, args.limit), args.repeat))
+            matches = await conn.fetchval(
+                "SELECT count(*) FROM search_transcripts($1, $2, $3, 1000000)", user_id, query, language
+            )
+            rows.append([
+                f"{language}:{query}",
+                matches,
+                f"{ilike['p50']:.1f}",
+                f"{ilike['p95']:.1f}",
+                f"{fts['p50']:.1f}",
+                f"{fts['p95']:.1f}",
+                f"{ilike['p50'] / fts['p50']:.1f}x" if fts["p50"] else "-",
+            ])
+
+        total = await conn.fetchval("SELECT count(*) FROM transcripts")
+        print(f"\nCorpus: {total:,} transcripts, searching as {user_id}, limit {args.limit}, "
+              f"{args.repeat} runs per query (ms)\n")
+        print(format_table(
+            ["query", "matches", "ilike p50", "ilike p95", "fts p50", "fts p95", "speedup"],
+            rows,
+        ))
+
+        language, query = QUERIES[0]
+        print("\nPlan (ILIKE):", await plan_summary(conn, ILIKE_SQL, (user_id, f"%{query}%", args.limit)))
+        print("Plan (FTS): ", await plan_summary(
+            conn,
+            "SELECT id FROM transcripts WHERE original_tsv @@ websearch_to_tsquery(transcript_search_config($1), $2)",
+            (language, query),
+        ))
+
+        if args.drop:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", default=default_dsn(), help="Postgres DSN (default: $DATABASE_URL)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Transcript rows to generate")
+    parser.add_argument("--users", type=int, default=1000, help="Distinct users owning the sessions")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Rows per INSERT batch")
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per query")
+    parser.add_argument("--limit", type=int, default=20, help="Result limit per search")
+    parser.add_argument("--rebuild", action="store_true", help="Drop and regenerate the corpus")
+    parser.add_argument("--drop", action="store_true", help="Drop the scratch schema when done")
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("--dsn or DATABASE_URL is required")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""Load test /ws/interpret with many concurrent simulated clients.
+
+Each client connects with its own token, waits for the ``ready`` message and
+streams PCM audio at real-time pace (or following recorded frame timings),
+timing every frame from send to its ``transcription`` event.
+
+``serve`` runs the real app with PROVIDER_SIMULATION enabled, so Deepgram,
+DeepL, Azure and Supabase are local fakes with the latency and error profile
+given by ``--profile`` and a fixed seed: a run needs no network access and is
+repeatable. ``run --local`` starts that server in a subprocess first.
+
+Usage (from backend/):
+    python -m benchmarks.ws_load run --local --clients 50 --ramp-up 10 --duration 30
+    python -m benchmarks.ws_load run --local --profile slow_providers.json
+    python -m benchmarks.ws_load run --url ws://localhost:8000/ws/interpret --audio sample.wav
+    python -m benchmarks.ws_load run --local --record-timings timings.jsonl
+    python -m benchmarks.ws_load run --local --replay timings.jsonl
+"""
+from benchmarks.common import summarize, format_table
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import array
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+import wave
+
+import websockets
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # 16-bit mono PCM
+
+
+# ---------------------------------------------------------------------------
+# Audio and frame schedules
+# ---------------------------------------------------------------------------
+
+def synthetic_pcm(seconds: float, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Speech-like 16-bit mono PCM: a modulated tone with syllable-rate bursts"""
+    samples = array.array("h")
+    for index in range(int(seconds * sample_rate)):
+        t = index / sample_rate
+        envelope = 0.5 + 0.5 * math.sin(2 * math.pi * 4 * t)
+        samples.append(int(8000 * envelope * math.sin(2 * math.pi * 220 * t)))
+    return samples.tobytes()
+
+
+def load_wav(path: str) -> Tuple[bytes, int]:
+    """Raw PCM frames of a WAV file and its byte rate"""
+    with wave.open(path, "rb") as source:
+        byte_rate = source.getframerate() * source.getnchannels() * source.getsampwidth()
+        return source.readframes(source.getnframes()), byte_rate
+
+
+def build_schedule(audio: bytes, byte_rate: int, frame_ms: int, duration: float) -> List[Tuple[float, int]]:
+    """Real-time schedule of (send offset in seconds, frame size in bytes)"""
+    frame_bytes = max(SAMPLE_WIDTH, int(byte_rate * frame_ms / 1000) // SAMPLE_WIDTH * SAMPLE_WIDTH)
+    frame_count = max(1, int(duration * 1000 / frame_ms))
+    return [(index * frame_ms / 1000, frame_bytes) for index in range(frame_count)]
+
+
+def load_schedule(path: str) -> List[Tuple[float, int]]:
+    """Recorded frame timings, one ``{"offset": s, "bytes": n}`` object per line"""
+    schedule = []
+    with open(path) as source:
+        for line in source:
+            if line.strip():
+                entry = json.loads(line)
+                schedule.append((float(entry["offset"]), int(entry["bytes"])))
+    schedule.sort()
+    return schedule
+
+
+def save_schedule(path: str, schedule: List[Tuple[float, int]]) -> None:
+    with open(path, "w") as target:
+        for offset, size in schedule:
+            target.write(json.dumps({"offset": round(offset, 6), "bytes": size}) + "\n")
+
+
+def iter_frames(audio: bytes, schedule: List[Tuple[float, int]]):
+    """Yield (offset, payload) pairs, cutting payloads from the audio in a loop"""
+    position = 0
+    for offset, size in schedule:
+        if position + size > len(audio):
+            position = 0
+        yield offset, audio[position:position + size]
+        position += size
+
+
+# ---------------------------------------------------------------------------
+# Clients
+# ---------------------------------------------------------------------------
+
+class LoadStats:
+    """Samples and counters shared by all clients of a run"""
+
+    def __init__(self):
+        self.connect_seconds: List[float] = []
+        self.latencies: List[float] = []
+        self.frames_sent = 0
+        self.late_frames = 0
+        self.results = 0
+        self.frames_without_result = 0
+        self.audio_seconds = 0.0
+        self.sessions_completed = 0
+        self.errors: Counter = Counter()
+
+
+async def _receive_results(ws, pending: Dict[int, float], stats: LoadStats) -> None:
+    async for message in ws:
+        event = json.loads(message)
+        if event.get("type") == "transcription":
+            sent = pending.pop(event.get("sequence"), None)
+            if sent is None:
+                continue
+            stats.latencies.append(time.perf_counter() - sent)
+            stats.results += 1
+            # Earlier frames without a result (silence or a failed provider call) never get one
+            for sequence in [sequence for sequence in pending if sequence < event["sequence"]]:
+                del pending[sequence]
+                stats.frames_without_result += 1
+        elif event.get("type") == "quota_exceeded":
+            stats.errors["quota_exceeded"] += 1
+
+
+async def run_client(index: int, args, audio: bytes, byte_rate: int,
+                     schedule: List[Tuple[float, int]], stats: LoadStats) -> None:
+    await asyncio.sleep(index * args.ramp_up / max(1, args.clients))
+
+    url = (
+        f"{args.url}?source_language={args.source_language}"
+        f"&target_language={args.target_language}&token={args.token_prefix}{index}"
+    )
+    connect_started = time.perf_counter()
+    try:
+        async with websockets.connect(url, max_size=None, open_timeout=args.timeout) as ws:
+            ready = json.loads(await asyncio.wait_for(ws.recv(), args.timeout))
+            if ready.get("type") != "ready":
+                stats.errors["not_ready"] += 1
+                return
+            stats.connect_seconds.append(time.perf_counter() - connect_started)
+
+            pending: Dict[int, float] = {}  # frame sequence -> send time
+            sequence = 0
+            receiver = asyncio.create_task(_receive_results(ws, pending, stats))
+            frame_period = args.frame_ms / 1000
+            started = time.perf_counter()
+            for offset, payload in iter_frames(audio, schedule):
+                delay = started + offset - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                elif delay < -frame_period:
+                    # The client fell more than a frame behind real time
+                    stats.late_frames += 1
+                if receiver.done():
+                    break
+                sequence += 1
+                pending[sequence] = time.perf_counter()
+                await ws.send(payload)
+                stats.frames_sent += 1
+                stats.audio_seconds += len(payload) / byte_rate
+
+            # Give in-flight frames time to come back before closing
+            deadline = time.perf_counter() + args.timeout
+            while pending and not receiver.done() and time.perf_counter() < deadline:
+                await asyncio.sleep(0.01)
+            stats.frames_without_result += len(pending)
+            receiver.cancel()
+            try:
+                await receiver
+            except (asyncio.CancelledError, websockets.ConnectionClosed):
+                pass
+            stats.sessions_completed += 1
+    except websockets.ConnectionClosed as e:
+        code = e.rcvd.code if e.rcvd else "abnormal"
+        stats.errors[f"closed_{code}"] += 1
+    except asyncio.TimeoutError:
+        stats.errors["timeout"] += 1
+    except (OSError, websockets.WebSocketException) as e:
+        stats.errors[type(e).__name__] += 1
+
+
+async def run_load(args, audio: bytes, byte_rate: int, schedule: List[Tuple[float, int]]) -> Dict:
+    stats = LoadStats()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(index, args, audio, byte_rate, schedule, stats)
+        for index in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latency = summarize(stats.latencies)
+    connect = summarize(stats.connect_seconds)
+    return {
+        "clients": args.clients,
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions_completed": stats.sessions_completed,
+        "frames_sent": stats.frames_sent,
+        "results": stats.results,
+        "frames_without_result": stats.frames_without_result,
+        "late_frames": stats.late_frames,
+        "results_per_second": round(stats.results / elapsed, 2) if elapsed else 0.0,
+        "audio_seconds_per_second": round(stats.audio_seconds / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {key: _ms(value) for key, value in latency.items() if key != "count"},
+        "connect_ms": {key: _ms(value) for key, value in connect.items() if key != "count"},
+        "errors": dict(stats.errors),
+        "session_error_rate": round(1 - stats.sessions_completed / args.clients, 4) if args.clients else 0.0,
+        "frame_loss_rate": round(1 - stats.results / stats.frames_sent, 4) if stats.frames_sent else 0.0,
+    }
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def print_report(report: Dict) -> None:
+    rows = [
+        ["audio -> transcription", *(report["latency_ms"][key] for key in ("p50", "p95", "p99", "max"))],
+        ["connect -> ready", *(report["connect_ms"][key] for key in ("p50", "p95", "p99", "max"))],
+    ]
+    print(format_table(["latency (ms)", "p50", "p95", "p99", "max"], rows))
+    print()
+    print(format_table(["metric", "value"], [
+        ["clients", report["clients"]],
+        ["sessions completed", report["sessions_completed"]],
+        ["frames sent", report["frames_sent"]],
+        ["results", report["results"]],
+        ["frames without result", report["frames_without_result"]],
+        ["results/s", report["results_per_second"]],
+        ["audio s/s", report["audio_seconds_per_second"]],
+        ["late frames (client behind)", report["late_frames"]],
+        ["session error rate", report["session_error_rate"]],
+        ["frame loss rate", report["frame_loss_rate"]],
+        ["errors", json.dumps(report["errors"]) if report["errors"] else "-"],
+    ]))
+
+
+# ---------------------------------------------------------------------------
+# Simulated server
+# ---------------------------------------------------------------------------
+
+def serve(args) -> None:
+    """Run the app on uvicorn in provider simulation mode"""
+    os.environ["PROVIDER_SIMULATION"] = "true"
+    if args.profile:
+        os.environ["SIMULATION_PROFILE"] = str(Path(args.profile).resolve())
+    if args.seed is not None:
+        os.environ["SIMULATION_SEED"] = str(args.seed)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if not args.enforce_limits:
+        os.environ["RATE_LIMIT_ENABLED"] = "false"
+        os.environ["USAGE_METERING_ENABLED"] = "false"
+
+    import uvicorn
+    uvicorn.run("app.main:app", host=args.host, port=args.port, log_level="warning")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_local_server(args) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "benchmarks.ws_load", "serve",
+        "--port", str(port),
+    ]
+    if args.profile:
+        command += ["--profile", args.profile]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    if args.enforce_limits:
+        command.append("--enforce-limits")
+    process = subprocess.Popen(command, cwd=BACKEND_DIR)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Simulated server exited during startup")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+            return process, f"ws://127.0.0.1:{port}/ws/interpret"
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Simulated server did not become ready")
+
+
+def run(args) -> None:
+    if args.audio:
+        audio, byte_rate = load_wav(args.audio)
+    else:
+        audio, byte_rate = synthetic_pcm(min(args.duration, 30.0)), SAMPLE_RATE * SAMPLE_WIDTH
+
+    if args.replay:
+        schedule = load_schedule(args.replay)
+    else:
+        schedule = build_schedule(audio, byte_rate, args.frame_ms, args.duration)
+    if args.record_timings:
+        save_schedule(args.record_timings, schedule)
+
+    server: Optional[subprocess.Popen] = None
+    if args.local:
+        server, args.url = start_local_server(args)
+    try:
+        report = asyncio.run(run_load(args, audio, byte_rate, schedule))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+def _add_provider_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--profile", help="JSON provider profile (SIMULATION_PROFILE)")
+    parser.add_argument("--seed", type=int, default=1, help="simulation seed for repeatable runs")
+    parser.add_argument("--enforce-limits", action="store_true",
+                        help="keep rate limiting and usage quotas enabled")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the app in provider simulation mode")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    _add_provider_arguments(serve_parser)
+
+    run_parser = commands.add_parser("run", help="start simulated clients")
+    run_parser.add_argument("--url", default="ws://127.0.0.1:8000/ws/interpret")
+    run_parser.add_argument("--local", action="store_true", help="spawn a simulated server for the run")
+    run_parser.add_argument("--clients", type=int, default=10)
+    run_parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds to start all clients")
+    run_parser.add_argument("--duration", type=float, default=20.0, help="audio seconds per client")
+    run_parser.add_argument("--frame-ms", type=int, default=250)
+    run_parser.add_argument("--audio", help="16-bit PCM WAV file (synthetic audio otherwise)")
+    run_parser.add_argument("--replay", help="JSONL frame timings to replay")
+    run_parser.add_argument("--record-timings", help="write the frame timings used to this file")
+    run_parser.add_argument("--source-language", default="es")
+    run_parser.add_argument("--target-language", default="en")
+    run_parser.add_argument("--token-prefix", default="client")
+    run_parser.add_argument("--timeout", type=float, default=10.0)
+    run_parser.add_argument("--json", action="store_true")
+    _add_provider_arguments(run_parser)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        serve(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Archive transcripts of sessions that ended more than N days ago.
+
+Run from the backend/ directory, e.g. from cron:
+    python scripts/archive_sessions.py --older-than-days 30 --limit 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add the app directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.database import get_supabase_client
+from app.services.archive import SessionArchiver, get_archive_store
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Move ended sessions' transcripts to cold storage")
+    parser.add_argument("--older-than-days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--limit", type=int, default=settings.ARCHIVE_BATCH_SIZE, help="Sessions per run")
+    parser.add_argument("--dry-run", action="store_true", help="List sessions without archiving them")
+    args = parser.parse_args()
+
+    archiver = SessionArchiver(get_supabase_client(), get_archive_store())
+    archived = await archiver.archive_ended_sessions(
+        older_than_days=args.older_than_days,
+        limit=args.limit,
+        dry_run=args.dry_run,
+    )
+    for entry in archived:
+        print(json.dumps(entry))
+    print(f"Archived {len(archived)} session(s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
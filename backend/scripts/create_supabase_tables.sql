@@ -76,7 +76,10 @@ CREATE TABLE IF NOT EXISTS sessions (
 );
 
 CREATE INDEX IF NOT EXISTS ix_sessions_id ON sessions(id);
-CREATE INDEX IF NOT EXISTS ix_sessions_user_id ON sessions(user_id);
+-- Keyset pagination of a user's sessions (mirrors alembic revision 008_keyset_pagination_indexes);
+-- it replaces the single-column index on user_id
+CREATE INDEX IF NOT EXISTS ix_sessions_user_id_id ON sessions(user_id, id);
+DROP INDEX IF EXISTS ix_sessions_user_id;
 
 -- Transcripts table
 CREATE TABLE IF NOT EXISTS transcripts (
@@ -92,7 +95,123 @@ CREATE TABLE IF NOT EXISTS transcripts (
 );
 
 CREATE INDEX IF NOT EXISTS ix_transcripts_id ON transcripts(id);
-CREATE INDEX IF NOT EXISTS ix_transcripts_session_id ON transcripts(session_id);
+-- Keyset pagination of a session's transcripts (mirrors alembic revision 008_keyset_pagination_indexes);
+-- it replaces the single-column index on session_id
+CREATE INDEX IF NOT EXISTS ix_transcripts_session_id_id ON transcripts(session_id, id);
+DROP INDEX IF EXISTS ix_transcripts_session_id;
+
+-- Segment end time in seconds from session start (timestamp holds the start)
+ALTER TABLE transcripts ADD COLUMN IF NOT EXISTS end_timestamp DOUBLE PRECISION;
+
+-- Per-word timings of a segment, packed by WordTimings.to_bytes
+ALTER TABLE transcripts ADD COLUMN IF NOT EXISTS word_timings BYTEA;
+
+-- Assigned when a row enters the transcript write-ahead log; replays skip rows already stored
+ALTER TABLE transcripts ADD COLUMN IF NOT EXISTS write_id UUID;
+CREATE UNIQUE INDEX IF NOT EXISTS ix_transcripts_write_id ON transcripts(write_id);
+
+-- Full-text search on transcripts (mirrors alembic revisions 002_transcript_search
+-- and 007_escape_search_headlines: highlights are HTML-escaped text with <mark> tags)
+CREATE OR REPLACE FUNCTION transcript_search_config(lang TEXT)
+RETURNS regconfig
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT CASE lower(split_part(coalesce(lang, ''), '-', 1))
+        WHEN 'en' THEN 'english'
+        WHEN 'es' THEN 'spanish'
+        WHEN 'pt' THEN 'portuguese'
+        WHEN 'fr' THEN 'french'
+        WHEN 'de' THEN 'german'
+        WHEN 'it' THEN 'italian'
+        WHEN 'ru' THEN 'russian'
+        WHEN 'ar' THEN 'arabic'
+        ELSE 'simple'
+    END::regconfig
+$$;
+
+ALTER TABLE transcripts
+    ADD COLUMN IF NOT EXISTS original_tsv tsvector GENERATED ALWAYS AS (
+        to_tsvector(transcript_search_config(source_language), coalesce(original_text, ''))
+    ) STORED,
+    ADD COLUMN IF NOT EXISTS translated_tsv tsvector GENERATED ALWAYS AS (
+        to_tsvector(transcript_search_config(target_language), coalesce(translated_text, ''))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_transcripts_original_tsv ON transcripts USING GIN (original_tsv);
+CREATE INDEX IF NOT EXISTS ix_transcripts_translated_tsv ON transcripts USING GIN (translated_tsv);
+
+CREATE OR REPLACE FUNCTION search_transcripts(
+    p_user_id TEXT,
+    p_query TEXT,
+    p_language TEXT,
+    p_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE (
+    id INTEGER,
+    session_id INTEGER,
+    original_text TEXT,
+    translated_text TEXT,
+    source_language VARCHAR,
+    target_language VARCHAR,
+    "timestamp" DOUBLE PRECISION,
+    confidence DOUBLE PRECISION,
+    created_at TIMESTAMPTZ,
+    rank REAL,
+    original_highlight TEXT,
+    translated_highlight TEXT
+)
+LANGUAGE sql STABLE AS $$
+    WITH query AS (
+        SELECT
+            transcript_search_config(p_language) AS config,
+            websearch_to_tsquery(transcript_search_config(p_language), p_query) AS tsq
+    ),
+    ranked AS (
+        SELECT
+            t.*,
+            greatest(
+                CASE WHEN t.source_language = p_language
+                    THEN ts_rank_cd(t.original_tsv, query.tsq) ELSE 0 END,
+                CASE WHEN t.target_language = p_language
+                    THEN ts_rank_cd(t.translated_tsv, query.tsq) ELSE 0 END
+            ) AS rank
+        FROM transcripts t
+        JOIN sessions s ON s.id = t.session_id
+        CROSS JOIN query
+        WHERE s.user_id::text = p_user_id
+          AND (
+              (t.source_language = p_language AND t.original_tsv @@ query.tsq)
+              OR (t.target_language = p_language AND t.translated_tsv @@ query.tsq)
+          )
+        ORDER BY rank DESC, t.id DESC
+        LIMIT p_limit
+    )
+    SELECT
+        r.id,
+        r.session_id,
+        r.original_text,
+        r.translated_text,
+        r.source_language,
+        r.target_language,
+        r."timestamp",
+        r.confidence,
+        r.created_at::timestamptz,
+        r.rank,
+        CASE WHEN r.source_language = p_language
+            THEN ts_headline(query.config,
+                             replace(replace(replace(r.original_text, '&', '&amp;'), '<', '&lt;'), '>', '&gt;'),
+                             query.tsq,
+                             'StartSel=<mark>, StopSel=</mark>, MaxFragments=2')
+        END,
+        CASE WHEN r.target_language = p_language AND r.translated_text IS NOT NULL
+            THEN ts_headline(query.config,
+                             replace(replace(replace(r.translated_text, '&', '&amp;'), '<', '&lt;'), '>', '&gt;'),
+                             query.tsq,
+                             'StartSel=<mark>, StopSel=</mark>, MaxFragments=2')
+        END
+    FROM ranked r
+    CROSS JOIN query
+    ORDER BY r.rank DESC, r.id DESC
+$$;
 
 -- Glossary entries table
 CREATE TABLE IF NOT EXISTS glossary_entries (
@@ -128,6 +247,33 @@ CREATE TABLE IF NOT EXISTS vocabulary_entries (
 CREATE INDEX IF NOT EXISTS ix_vocabulary_entries_id ON vocabulary_entries(id);
 CREATE INDEX IF NOT EXISTS ix_vocabulary_entries_user_id ON vocabulary_entries(user_id);
 
+-- Usage records (one row per user per month, updated by the usage meter)
+CREATE TABLE IF NOT EXISTS usage_records (
+    id SERIAL PRIMARY KEY,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    period_start DATE NOT NULL,
+    audio_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+    characters BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_usage_records_user_period UNIQUE (user_id, period_start)
+);
+
+CREATE OR REPLACE FUNCTION increment_usage(
+    p_user_id TEXT,
+    p_period_start DATE,
+    p_audio_seconds DOUBLE PRECISION,
+    p_characters BIGINT
+)
+RETURNS VOID
+LANGUAGE sql AS $$
+    INSERT INTO usage_records (user_id, period_start, audio_seconds, characters, updated_at)
+    VALUES (p_user_id::uuid, p_period_start, p_audio_seconds, p_characters, NOW())
+    ON CONFLICT (user_id, period_start) DO UPDATE SET
+        audio_seconds = usage_records.audio_seconds + EXCLUDED.audio_seconds,
+        characters = usage_records.characters + EXCLUDED.characters,
+        updated_at = NOW();
+$$;
+
 -- Enable Row Level Security (RLS) for Supabase Auth
 ALTER TABLE users ENABLE ROW LEVEL SECURITY;
 ALTER TABLE subscriptions ENABLE ROW LEVEL SECURITY;
@@ -135,6 +281,7 @@ ALTER TABLE sessions ENABLE ROW LEVEL SECURITY;
 ALTER TABLE transcripts ENABLE ROW LEVEL SECURITY;
 ALTER TABLE glossary_entries ENABLE ROW LEVEL SECURITY;
 ALTER TABLE vocabulary_entries ENABLE ROW LEVEL SECURITY;
+ALTER TABLE usage_records ENABLE ROW LEVEL SECURITY;
 
 -- Create RLS policies for Supabase Auth
 -- Users can view and update their own data
@@ -164,6 +311,10 @@ CREATE POLICY "Users can manage own glossary" ON glossary_entries
 CREATE POLICY "Users can manage own vocabulary" ON vocabulary_entries
     FOR ALL USING (auth.uid() = user_id);
 
+-- Usage policies (read-only for clients; the backend writes with the service role)
+CREATE POLICY "Users can view own usage" ON usage_records
+    FOR SELECT USING (auth.uid() = user_id);
+
 -- Subscriptions policies
 CREATE POLICY "Users can manage own subscriptions" ON subscriptions
     FOR ALL USING (auth.uid() = user_id);
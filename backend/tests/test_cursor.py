@@ -0,0 +1,19 @@
+from app.services.sessions import decode_cursor, encode_cursor
+import pytest
+
+
+def test_round_trip():
+    assert decode_cursor(encode_cursor(1700000000, 42), 2) == (1700000000, 42)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(123456789)
+
+    assert "=" not in cursor
+    assert cursor.replace("-", "").replace("_", "").isalnum()
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "!!!", encode_cursor(1, 2)])
+def test_malformed_or_wrong_size_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 3)
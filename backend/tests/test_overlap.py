@@ -0,0 +1,71 @@
+from app.services.sessions.word_timings import WordTimings
+from app.websocket.overlap import OverlapTrimmer
+from types import SimpleNamespace
+import pytest
+
+
+@pytest.fixture
+def chunk():
+    """Build a transcription result from its text, one (start, end) per word and the chunk duration"""
+    def build(text, times, duration):
+        words = WordTimings.from_words(
+            SimpleNamespace(word=token.strip(",.?").lower(), start=start, end=end, confidence=0.9)
+            for token, (start, end) in zip(text.split(), times)
+        )
+        return {"text": text, "words": words, "duration": duration}
+    return build
+
+
+def test_overlapping_chunks_are_trimmed_and_overlap_measured(chunk):
+    # Two 4 s chunks, the second starting 1 s before the first ended
+    trimmer = OverlapTrimmer(window=3.0)
+    trimmer.trim(chunk("See you tomorrow, meet at noon",
+                       [(0.2, 0.4), (0.5, 0.7), (0.8, 1.4), (3.1, 3.3), (3.4, 3.5), (3.6, 3.9)], 4.0))
+
+    result, overlap = trimmer.trim(chunk("meet at noon tomorrow", [(0.1, 0.3), (0.4, 0.5), (0.6, 0.9), (1.1, 1.6)], 4.0))
+
+    assert result["text"] == "tomorrow"
+    assert result["words"].words() == ["tomorrow"]
+    assert overlap == pytest.approx(1.0)
+    # Placed on the session clock at 4.0 - overlap, "tomorrow" starts at 4.1 s
+    assert 4.0 - overlap + result["words"].start == pytest.approx(4.1)
+
+
+def test_word_straddling_the_boundary_is_trimmed_without_overlap(chunk):
+    trimmer = OverlapTrimmer(window=3.0)
+    trimmer.trim(chunk("I want coffee", [(0.1, 0.3), (0.4, 0.8), (2.8, 3.0)], 3.0))
+
+    result, overlap = trimmer.trim(chunk("Coffee please", [(0.0, 0.3), (0.4, 0.9)], 3.0))
+
+    assert result["text"] == "please"
+    assert overlap == 0.0
+
+
+def test_repeat_away_from_the_boundary_is_kept(chunk):
+    trimmer = OverlapTrimmer(window=3.0)
+    trimmer.trim(chunk("no", [(1.0, 1.2)], 3.0))
+
+    result, overlap = trimmer.trim(chunk("No, I said", [(0.9, 1.1), (1.3, 1.5), (1.6, 1.9)], 3.0))
+
+    assert result["text"] == "No, I said"
+    assert overlap == 0.0
+
+
+def test_inconsistently_timed_repeat_is_kept(chunk):
+    trimmer = OverlapTrimmer(window=3.0)
+    trimmer.trim(chunk("yes we can", [(1.0, 1.2), (2.3, 2.5), (2.6, 2.9)], 3.0))
+
+    result, _ = trimmer.trim(chunk("yes we can do it", [(0.1, 0.3), (1.9, 2.1), (2.2, 2.4), (2.5, 2.6), (2.7, 2.9)], 3.0))
+
+    assert result["text"] == "yes we can do it"
+
+
+def test_reset_forgets_the_previous_chunk(chunk):
+    trimmer = OverlapTrimmer(window=3.0)
+    trimmer.trim(chunk("I want coffee", [(0.1, 0.3), (0.4, 0.8), (2.8, 3.0)], 3.0))
+    trimmer.reset()
+
+    result, overlap = trimmer.trim(chunk("Coffee please", [(0.0, 0.3), (0.4, 0.9)], 3.0))
+
+    assert result["text"] == "Coffee please"
+    assert overlap == 0.0
@@ -0,0 +1,51 @@
+from app.core.ratelimit import RateLimit, TokenBucketLimiter
+import pytest
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.ratelimit.limiter.time.monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_then_retry_after(clock):
+    limiter = TokenBucketLimiter()
+    limit = RateLimit(rate=2.0, burst=3.0)
+
+    assert [limiter.hit_nowait("ip", limit) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.hit_nowait("ip", limit) == pytest.approx(0.5)
+
+
+def test_tokens_refill_at_the_rate(clock):
+    limiter = TokenBucketLimiter()
+    limit = RateLimit(rate=2.0, burst=3.0)
+    for _ in range(3):
+        limiter.hit_nowait("ip", limit)
+
+    clock[0] += 0.5
+    assert limiter.hit_nowait("ip", limit) == 0.0
+    assert limiter.hit_nowait("ip", limit) > 0.0
+
+
+def test_keys_have_separate_buckets(clock):
+    limiter = TokenBucketLimiter()
+    limit = RateLimit(rate=1.0, burst=1.0)
+
+    assert limiter.hit_nowait("a", limit) == 0.0
+    assert limiter.hit_nowait("b", limit) == 0.0
+    assert limiter.hit_nowait("a", limit) > 0.0
+
+
+def test_least_recently_used_bucket_is_evicted(clock):
+    limiter = TokenBucketLimiter(max_keys=2)
+    limit = RateLimit(rate=1.0, burst=1.0)
+    limiter.hit_nowait("a", limit)
+    limiter.hit_nowait("b", limit)
+    limiter.hit_nowait("a", limit)
+
+    limiter.hit_nowait("c", limit)
+
+    assert len(limiter._buckets) == 2
+    assert "b" not in limiter._buckets
+    assert limiter.hit_nowait("a", limit) > 0.0
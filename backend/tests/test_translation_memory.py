@@ -0,0 +1,68 @@
+from app.services.translation_memory import MinHashIndex, TranslationMemory, shingles, source_key
+
+
+def test_source_key_drops_fillers_case_and_numbers():
+    assert source_key("Uh, room 12, please.") == ("room # please", ["12"])
+    assert source_key("room 14 please")[0] == source_key("Uh, room 12, please.")[0]
+
+
+def test_minhash_index_finds_near_duplicates():
+    index = MinHashIndex()
+    index.add("first", shingles("please turn to page # of the contract"))
+    index.add("second", shingles("what time is the flight tomorrow"))
+
+    match = index.best_match(shingles("please turn to page # of the contracts"), threshold=0.8)
+
+    assert match is not None and match[0] == "first"
+    assert index.best_match(shingles("an entirely unrelated sentence here"), threshold=0.8) is None
+
+
+def test_minhash_index_remove():
+    index = MinHashIndex()
+    index.add("first", shingles("please turn to page # of the contract"))
+
+    assert index.remove("first")
+    assert not index.remove("first")
+    assert len(index) == 0
+    assert index.best_match(shingles("please turn to page # of the contract")) is None
+
+
+def _memory():
+    memory = TranslationMemory(None, "user", "en", "es", similarity=0.8, max_entries=100)
+    memory.add("Take one tablet every morning before breakfast.", "Tome una tableta cada mañana antes del desayuno.")
+    memory.add("Please turn to page 12 of the contract.", "Por favor, vaya a la página 12 del contrato.")
+    return memory
+
+
+def test_numbers_are_substituted():
+    assert _memory().lookup("Um, please turn to page 7 of the contract") == "Por favor, vaya a la página 7 del contrato."
+
+
+def test_fuzzy_match_absorbs_repeated_words():
+    translation = _memory().lookup("Take one tablet every morning, every morning before breakfast.")
+
+    assert translation == "Tome una tableta cada mañana antes del desayuno."
+
+
+def test_fuzzy_match_refuses_extra_or_missing_words():
+    memory = _memory()
+
+    assert memory.lookup("Take one tablet every morning not before breakfast.") is None
+    assert memory.lookup("Take one tablet every morning before breakfast please.") is None
+    assert memory.lookup("Please turn to page 12 of this contract.") is None
+
+
+def test_fuzzy_match_refuses_swapped_words():
+    memory = TranslationMemory(None, "user", "en", "es", similarity=0.5, max_entries=100)
+    memory.add("Transfer the money from savings to checking.", "Transfiera el dinero de ahorros a corriente.")
+    memory.add("Take the blue pill or the red pill.", "Tome la píldora azul o la píldora roja.")
+
+    assert memory.lookup("Transfer the money from checking to savings.") is None
+    assert memory.lookup("Take the red pill or the blue pill.") is None
+
+
+def test_question_does_not_reuse_statement():
+    memory = _memory()
+
+    assert source_key("Is the flight tomorrow?")[0] == "is the flight tomorrow ?"
+    assert memory.lookup("Take one tablet every morning before breakfast?") is None
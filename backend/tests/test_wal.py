@@ -0,0 +1,130 @@
+from app.core.config import settings
+from app.services.sessions.wal import TranscriptLog, _lock, _segment_path, open_transcript_logs
+from app.services.sessions.writer import SessionWriter
+import pytest
+
+
+def _row(number):
+    return {"write_id": f"00000000-0000-4000-8000-{number:012d}", "original_text": f"row {number}",
+            "word_timings": bytes([number, 0, 255])}
+
+
+async def _open_log(directory, segment_bytes=None):
+    log = TranscriptLog(directory, _lock(directory), segment_bytes)
+    log.open_for_append()
+    log.start()
+    return log
+
+
+@pytest.mark.asyncio
+async def test_appended_rows_are_read_back(tmp_path):
+    log = await _open_log(tmp_path)
+    for number in range(3):
+        await log.append(_row(number))
+
+    rows, position = log.read(10)
+
+    assert rows == [_row(number) for number in range(3)]
+    assert position == log.synced
+    await log.close()
+
+
+@pytest.mark.asyncio
+async def test_torn_tail_is_skipped(tmp_path):
+    log = await _open_log(tmp_path)
+    for number in range(3):
+        await log.append(_row(number))
+    segment = _segment_path(tmp_path, log.synced[0])
+    await log.close()
+    # A crash in the middle of the third append
+    with open(segment, "r+b") as file:
+        file.truncate(segment.stat().st_size - 5)
+
+    log = await _open_log(tmp_path)
+    await log.append(_row(3))
+    rows, _ = log.read(10)
+
+    assert [row["original_text"] for row in rows] == ["row 0", "row 1", "row 3"]
+    await log.close()
+
+
+@pytest.mark.asyncio
+async def test_commit_moves_the_checkpoint_and_deletes_replayed_segments(tmp_path):
+    # Small segments: every row goes to its own file
+    log = await _open_log(tmp_path, segment_bytes=64)
+    for number in range(4):
+        await log.append(_row(number))
+    assert len(log.segments()) == 4
+
+    rows, position = log.read(3)
+    log.commit(position)
+
+    assert len(rows) == 3
+    # The segment of the checkpoint and the one with the fourth row are kept
+    assert log.segments() == [position[0], position[0] + 1]
+    assert log.read(10)[0] == [_row(3)]
+    await log.close()
+
+    # The checkpoint survives a restart
+    log = await _open_log(tmp_path)
+    assert log.cursor == position
+    assert log.read(10)[0] == [_row(3)]
+    await log.close()
+
+
+@pytest.mark.asyncio
+async def test_logs_of_stopped_workers_are_taken_over(tmp_path):
+    first, adopted = open_transcript_logs(str(tmp_path))
+    second, _ = open_transcript_logs(str(tmp_path))
+    assert adopted == [] and second.directory != first.directory
+    for number, log in enumerate([first, second]):
+        log.start()
+        await log.append(_row(number))
+        await log.close()
+
+    # A new worker continues the first free directory and replays the others
+    own, adopted = open_transcript_logs(str(tmp_path))
+
+    assert own.directory == first.directory
+    assert [log.directory for log in adopted] == [second.directory]
+    assert own.read(10)[0] == [_row(0)]
+    assert adopted[0].read(10)[0] == [_row(1)]
+    for log in [own, *adopted]:
+        await log.close()
+
+
+@pytest.mark.asyncio
+async def test_replay_after_a_crash_stores_each_row_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "TRANSCRIPT_WAL_ENABLED", True)
+    monkeypatch.setattr(settings, "TRANSCRIPT_WAL_PATH", str(tmp_path))
+    stored = {}
+
+    async def write_batch(batch):
+        # The unique write_id index: rows already stored are skipped
+        for row in batch:
+            stored.setdefault(row["write_id"], row)
+
+    writer = SessionWriter(flush_interval=3600, batch_size=100)
+    writer._write_batch = write_batch
+    writer.start()
+    for number in range(5):
+        await writer.add_transcript({"original_text": f"row {number}"})
+    assert await writer.flush() == 5
+
+    # A crash between the write and the checkpoint: the rows are replayed
+    writer.log.commit((writer.log.synced[0], 0))
+    assert await writer.flush() == 5
+    await writer.stop()
+
+    assert sorted(row["original_text"] for row in stored.values()) == [f"row {number}" for number in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_latest_end_covers_rows_not_yet_written():
+    writer = SessionWriter()
+    await writer.add_transcript({"session_id": 7, "timestamp": 0.1, "end_timestamp": 0.9})
+    await writer.add_transcript({"session_id": 7, "timestamp": 1.1, "end_timestamp": None})
+
+    assert writer.latest_end(7) == 1.1
+    assert writer.latest_end(8) is None
+    assert len(writer.pending) == 2
@@ -0,0 +1,70 @@
+from app.services.sessions.word_timings import WordTimings, HEADER
+from types import SimpleNamespace
+from typing import List, Tuple
+import pytest
+
+
+@pytest.fixture
+def make_timings():
+    """Build WordTimings from (word, start, end) tuples, as a provider response would"""
+    def build(words: List[Tuple[str, float, float]]) -> WordTimings:
+        return WordTimings.from_words(
+            SimpleNamespace(word=word, start=start, end=end, confidence=0.9) for word, start, end in words
+        )
+    return build
+
+
+def test_bytes_round_trip(make_timings):
+    timings = make_timings([("hola", 0.1, 0.4), ("señor", 0.5, 1.0), ("García", 1.1, 1.6)])
+
+    decoded = WordTimings.from_bytes(timings.to_bytes())
+
+    assert decoded.words() == ["hola", "señor", "García"]
+    assert list(decoded.starts) == [0.1, 0.5, 1.1]
+    assert list(decoded.ends) == [0.4, 1.0, 1.6]
+    assert list(decoded.confidences) == pytest.approx([0.9, 0.9, 0.9])
+
+
+def test_serialized_size_is_platform_independent(make_timings):
+    timings = make_timings([("uno", 0.0, 0.5), ("dos", 0.6, 1.0)])
+
+    # Two doubles and a float per word, four-byte offsets with one extra, then the text
+    assert len(timings.to_bytes()) == HEADER.size + 2 * (8 + 8 + 4) + 3 * 4 + len("unodos")
+
+
+def test_from_bytes_accepts_postgrest_hex(make_timings):
+    timings = make_timings([("hello", 0.0, 0.5), ("there", 0.6, 0.9)])
+
+    decoded = WordTimings.from_bytes("\\x" + timings.to_bytes().hex())
+
+    assert decoded.words() == ["hello", "there"]
+    assert list(decoded.starts) == [0.0, 0.6]
+
+
+def test_empty_round_trip(make_timings):
+    assert len(WordTimings.from_bytes(make_timings([]).to_bytes())) == 0
+
+
+def test_unknown_format_version_is_rejected(make_timings):
+    data = bytearray(make_timings([("a", 0.0, 0.1)]).to_bytes())
+    data[0] = 99
+
+    with pytest.raises(ValueError):
+        WordTimings.from_bytes(bytes(data))
+
+
+def test_shifted_and_in_range(make_timings):
+    timings = make_timings([("one", 0.0, 0.5), ("two", 1.0, 1.5), ("three", 2.0, 2.5)]).shifted(10.0)
+
+    assert timings.start == 10.0
+    assert timings.end == 12.5
+    assert timings.words(timings.in_range(10.9, 12.0)) == ["two"]
+
+
+def test_below_confidence():
+    timings = WordTimings.from_words(
+        SimpleNamespace(word=word, start=index, end=index + 0.5, confidence=confidence)
+        for index, (word, confidence) in enumerate([("sure", 0.95), ("maybe", 0.4), ("unsure", 0.2)])
+    )
+
+    assert timings.words(timings.below_confidence(0.5)) == ["maybe", "unsure"]